@@ -23,6 +23,12 @@ setup(name='Fileseq',
 
       test_suite="test.run",
 
+      entry_points={
+          'console_scripts': [
+              'fileseq = fileseq.cli:main',
+          ],
+      },
+
       author='Matt Chambers',
       author_email='yougotrooted@gmail.com',
 
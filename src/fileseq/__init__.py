@@ -27,7 +27,10 @@ THE SOFTWARE.
 
 from fileseq.exceptions import ParseException, FileSeqException
 from fileseq.frameset import FrameSet
-from fileseq.filesequence import FileSequence
+from fileseq.filesequence import FileSequence, FrameStat, Checksums, Removal
+from fileseq.shared import SharedFrameSet
+from fileseq.bitmap import BitmapFrameSet
+from fileseq.utils import memoryUsage, maxFrameSize
 
 padFrameRange = FrameSet.padFrameRange
 framesToFrameRange = FrameSet.framesToFrameRange
@@ -37,3 +40,4 @@ getPaddingNum = FileSequence.getPaddingNum
 findSequencesInList = FileSequence.findSequencesInList
 findSequenceOnDisk = FileSequence.findSequenceOnDisk
 findSequencesOnDisk = FileSequence.findSequencesOnDisk
+compilePattern = FileSequence.compilePattern
@@ -0,0 +1,10 @@
+"""
+Run the ``fileseq`` command line tool with ``python -m fileseq``.
+"""
+
+import sys
+
+from fileseq.cli import main
+
+
+sys.exit(main())
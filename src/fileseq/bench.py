@@ -0,0 +1,347 @@
+#! /usr/bin/env python
+"""
+bench - Benchmarks of the hot paths of fileseq operations.
+
+Run with::
+
+    python -m fileseq.bench
+    python -m fileseq.bench --json --output fileseq-1.7.0.json
+    python -m fileseq.bench --compare fileseq-1.7.0.json
+
+Each benchmark reports the best time of a few repeats. The ``--json``
+output records the fileseq and python versions with the results, so that
+the results of two versions can be compared with ``--compare``. With
+``--json``, the comparison is recorded in the report under ``"compare"``.
+"""
+
+import os
+import sys
+import json
+import shutil
+import timeit
+import argparse
+import platform
+import tempfile
+
+from fileseq.__version__ import __version__
+from fileseq.constants import DISK_RE
+from fileseq.frameset import FrameSet
+from fileseq.bitmap import BitmapFrameSet
+from fileseq.filesequence import FileSequence
+from fileseq.utils import splitDiskPath
+
+
+def renderPaths(count=1000):
+    """
+    Return a list of realistic render output paths, mixing long and
+    short names, single and multi-part extensions, and padding styles.
+
+    :type count: int
+    :param count: the number of frames of each sequence
+    :rtype: list
+    """
+    patterns = [
+        '/show/sq010/sh010/lighting/renders/v012/beauty_denoise/'
+        'sh010_lgt_v012_beauty_denoise.{0:04d}.exr',
+        '/show/sq010/sh010/comp/renders/sh010_comp_v003.{0:d}.tif',
+        '/show/sq010/sh010/fx/cache/sh010_fx_sim_v07_{0:06d}.bgeo.sc',
+        'C:\\show\\sh010\\plates\\sh010_bg01_v001.{0:07d}.dpx',
+        'relative/crypto_00.{0:04d}.exr',
+    ]
+    return [pattern.format(frame) for pattern in patterns for frame in xrange(1, count + 1)]
+
+def manyPaths(count):
+    """
+    Return a list of about ``count`` paths of many short sequences spread
+    across many directories, with a few missing frames and stray files.
+
+    :type count: int
+    :rtype: list
+    """
+    paths = []
+    shot = 0
+    while len(paths) < count:
+        shot += 1
+        dirname = '/show/sq{0:03d}/sh{1:04d}/renders/'.format(shot % 50, shot)
+        for layer in ('beauty', 'depth', 'normal', 'crypto'):
+            for frame in xrange(1001, 1101):
+                if frame % 37:
+                    paths.append('{0}{1}_v{2:03d}.{3:04d}.exr'.format(dirname, layer, shot % 7, frame))
+        paths.append(dirname + 'notes.txt')
+    return paths[:count]
+
+def _scaled(value, scale):
+    return max(1, int(value * scale))
+
+def _timeit(func, number, repeat=3):
+    """
+    Return the best time in seconds of calling func ``number`` times.
+    """
+    return min(timeit.repeat(func, number=number, repeat=repeat))
+
+def _result(name, func, number, repeat):
+    """
+    Time a benchmark, and return its result record.
+
+    :rtype: dict
+    """
+    seconds = _timeit(func, number, repeat)
+    return {
+        'name': name,
+        'number': number,
+        'seconds': seconds,
+        'usec': seconds / number * 1e6,
+    }
+
+
+def benchFrameSet(scale=1.0, repeat=3):
+    """
+    Benchmark parsing each kind of frame range, and the set operations,
+    range formatting and padding of :class:`fileseq.frameset.FrameSet`.
+
+    :rtype: generator of result records
+    """
+    size = _scaled(10000, scale)
+    number = 20
+
+    franges = [
+        ('single', '{0}'.format(size)),
+        ('range', '1-{0}'.format(size)),
+        ('negative', '-{0}--1'.format(size)),
+        ('step', '1-{0}x3'.format(size)),
+        ('stagger', '1-{0}:4'.format(size)),
+        ('fill', '1-{0}y3'.format(size)),
+        ('list', ','.join('{0}-{1}'.format(i, i + 5) for i in xrange(1, size, 10))),
+    ]
+    for name, frange in franges:
+        yield _result('FrameSet.parse.' + name, lambda: FrameSet(frange), number, repeat)
+
+    left = FrameSet('1-{0}x2'.format(size))
+    right = FrameSet('{0}-{1}x3'.format(size // 2, size + size // 2))
+    ops = [
+        ('union', lambda: left | right),
+        ('intersection', lambda: left & right),
+        ('difference', lambda: left - right),
+        ('symmetric_difference', lambda: left ^ right),
+        ('issubset', lambda: left.issubset(right)),
+        ('contains', lambda: [f in left for f in xrange(0, size, 7)]),
+    ]
+    for name, func in ops:
+        yield _result('FrameSet.' + name, func, number, repeat)
+
+    span = size * 100
+    expected = BitmapFrameSet('1-{0}'.format(span))
+    failed = BitmapFrameSet([f for f in xrange(1, span, 13) if f % 3])
+    ops = [
+        ('difference', lambda: expected - failed),
+        ('intersection', lambda: expected & failed),
+        ('issubset', lambda: failed.issubset(expected)),
+        ('contains', lambda: [f in failed for f in xrange(0, span, 701)]),
+    ]
+    for name, func in ops:
+        yield _result('BitmapFrameSet.' + name, func, number, repeat)
+
+    frames = [f for f in xrange(1, size * 3) if f % 11 and f % 13]
+    shuffled = frames[1::2] + frames[::2]
+    yield _result('framesToFrameRange.sorted',
+                  lambda: FrameSet.framesToFrameRange(frames, sort=False), number, repeat)
+    yield _result('framesToFrameRange.unsorted',
+                  lambda: FrameSet.framesToFrameRange(shuffled), number, repeat)
+
+    frange = FrameSet.framesToFrameRange(frames, sort=False)
+    yield _result('padFrameRange', lambda: FrameSet.padFrameRange(frange, 4), number, repeat)
+
+
+def benchFileSequence(scale=1.0, repeat=3):
+    """
+    Benchmark parsing, formatting and iterating a
+    :class:`fileseq.filesequence.FileSequence`.
+
+    :rtype: generator of result records
+    """
+    number = _scaled(2000, scale)
+    pattern = '/show/sq010/sh010/renders/beauty_v012.1001-1240,1250-1300x2#.exr'
+    seq = FileSequence(pattern)
+
+    yield _result('FileSequence.parse', lambda: FileSequence(pattern), number, repeat)
+    yield _result('FileSequence.parse.frame',
+                  lambda: FileSequence('/show/sh010/beauty_v012.1001.exr'), number, repeat)
+    yield _result('FileSequence.format', lambda: seq.format(), number, repeat)
+    yield _result('FileSequence.format.inverted',
+                  lambda: seq.format('{basename}{inverted}{padding}{extension}'), number, repeat)
+
+    frames = FileSequence('/show/sh010/beauty_v012.1-{0}#.exr'.format(_scaled(10000, scale)))
+    yield _result('FileSequence.iter', lambda: list(frames), 10, repeat)
+    yield _result('FileSequence.iterBatches',
+                  lambda: list(frames.iterBatches(256)), 10, repeat)
+
+
+def benchSplitDiskPath(scale=1.0, repeat=3):
+    """
+    Compare the per-path cost of :func:`fileseq.utils.splitDiskPath`
+    against matching :obj:`fileseq.constants.DISK_RE`.
+
+    :rtype: generator of result records
+    """
+    paths = renderPaths(_scaled(1000, scale))
+    _match = DISK_RE.match
+    yield _result('DISK_RE.match', lambda: [_match(p).groups() for p in paths], 10, repeat)
+    yield _result('splitDiskPath', lambda: [splitDiskPath(p) for p in paths], 10, repeat)
+
+
+def benchGrouping(scale=1.0, repeat=3):
+    """
+    Benchmark grouping a list of a million synthetic paths into sequences.
+
+    :rtype: generator of result records
+    """
+    paths = manyPaths(_scaled(1000000, scale))
+    presorted = sorted(paths)
+    _yield = FileSequence.yield_sequences_in_list
+
+    yield _result('yield_sequences_in_list', lambda: list(_yield(paths)), 1, repeat)
+    yield _result('yield_sequences_in_list.presorted',
+                  lambda: list(_yield(presorted, presorted=True)), 1, repeat)
+    yield _result('yield_sequences_in_list.splitPadding',
+                  lambda: list(_yield(paths, splitPadding=True)), 1, repeat)
+
+
+def benchDiskScan(scale=1.0, repeat=3):
+    """
+    Benchmark scanning a generated temporary directory of sequences.
+
+    :rtype: generator of result records
+    """
+    count = _scaled(20000, scale)
+    tmpdir = tempfile.mkdtemp(prefix='fileseq_bench_')
+    try:
+        for i in xrange(count):
+            name = 'layer{0:02d}_v001.{1:04d}.exr'.format(i % 20, 1001 + i // 20)
+            open(os.path.join(tmpdir, name), 'wb').close()
+
+        _find = FileSequence.findSequencesOnDisk
+        yield _result('findSequencesOnDisk', lambda: _find(tmpdir), 5, repeat)
+        yield _result('findSequencesOnDisk.pattern',
+                      lambda: _find(os.path.join(tmpdir, 'layer0?_v001.#.exr')), 5, repeat)
+        yield _result('findSequencesOnDisk.stats',
+                      lambda: _find(tmpdir, stats=True, workers=8), 5, repeat)
+        yield _result('findSequenceOnDisk',
+                      lambda: FileSequence.findSequenceOnDisk(
+                          os.path.join(tmpdir, 'layer00_v001.#.exr')), 5, repeat)
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+# The benchmark suites, in the order they run
+BENCHMARKS = [
+    ('frameset', benchFrameSet),
+    ('filesequence', benchFileSequence),
+    ('split', benchSplitDiskPath),
+    ('grouping', benchGrouping),
+    ('disk', benchDiskScan),
+]
+
+def runBenchmarks(suites=None, scale=1.0, repeat=3):
+    """
+    Run the benchmark suites, returning a report of the results along with
+    the versions of fileseq and python that produced them.
+
+    :type suites: list
+    :param suites: the names of the suites to run, defaulting to all of them
+    :type scale: float
+    :param scale: a factor applied to the size of the benchmarks
+    :type repeat: int
+    :param repeat: the number of times each benchmark is repeated
+    :rtype: dict
+    """
+    results = []
+    for name, suite in BENCHMARKS:
+        if suites and name not in suites:
+            continue
+        results.extend(suite(scale, repeat))
+
+    return {
+        'fileseq': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scale': scale,
+        'results': results,
+    }
+
+def compareReports(old, new):
+    """
+    Yield ``(name, old usec, new usec, ratio)`` for the benchmarks found
+    in both reports, where a ratio above 1 is a slowdown.
+
+    :type old: dict
+    :type new: dict
+    :rtype: generator
+    """
+    before = dict((r['name'], r['usec']) for r in old['results'])
+    for result in new['results']:
+        name = result['name']
+        if name in before:
+            yield name, before[name], result['usec'], result['usec'] / before[name]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m fileseq.bench',
+        description='Benchmark the hot paths of fileseq.')
+    parser.add_argument('suites', nargs='*', metavar='suite',
+                        help='the suites to run: {0} (default: all)'.format(
+                            ', '.join(name for name, _ in BENCHMARKS)))
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='a factor applied to the size of the benchmarks (default: 1.0)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='the number of times each benchmark is repeated (default: 3)')
+    parser.add_argument('--json', action='store_true',
+                        help='write the report as JSON')
+    parser.add_argument('--output', help='write the report to a file instead of stdout')
+    parser.add_argument('--compare', metavar='REPORT',
+                        help='compare the results with a previous JSON report, '
+                             'recorded under "compare" in a JSON report')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.suites).difference(name for name, _ in BENCHMARKS)
+    if unknown:
+        parser.error('unknown suite: {0}'.format(', '.join(sorted(unknown))))
+
+    report = runBenchmarks(args.suites, args.scale, args.repeat)
+
+    compared = None
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        compared = list(compareReports(old, report))
+        if args.json:
+            # keep the output a single JSON document
+            report['compare'] = {
+                'fileseq': old.get('fileseq'),
+                'results': [{'name': name, 'before': before, 'after': after, 'ratio': ratio}
+                            for name, before, after, ratio in compared],
+            }
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        if args.json:
+            json.dump(report, out, indent=2, sort_keys=True)
+            out.write('\n')
+        else:
+            out.write('fileseq {fileseq}, python {python}, scale {scale}\n'.format(**report))
+            for result in report['results']:
+                out.write('{name:<40} {usec:14.3f} usec\n'.format(**result))
+            if compared is not None:
+                out.write('\ncompared with fileseq {0}:\n'.format(old.get('fileseq')))
+                for name, before, after, ratio in compared:
+                    out.write('{0:<40} {1:14.3f} {2:14.3f} {3:8.2f}x\n'.format(
+                        name, before, after, ratio))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,672 @@
+#! /usr/bin/env python
+"""
+bitmap - A compressed bitmap backend for large FrameSets.
+
+A :class:`BitmapFrameSet` splits its frames into chunks of 65536 frames,
+in the manner of a roaring bitmap. Each chunk holds either a sorted array
+of its frames, while it has at most 4096 of them, or a bitmap of the whole
+chunk in a bytearray. The chunks stay compact for contiguous as well as for
+sparse and scattered frames, and set operations between them work a chunk
+at a time, without building a set of the frames.
+
+Large, dense frame sets use this backend automatically, both when they are
+built from a frame range or frames in ascending order and as the results of
+set operations. See :obj:`fileseq.constants.BITMAP_MIN_FRAMES` and
+:obj:`fileseq.constants.BITMAP_MIN_DENSITY`::
+
+    expected = FrameSet('1-1000000')       # a BitmapFrameSet
+    failed = expected - FrameSet(passed)   # a BitmapFrameSet
+    print len(failed), failed.start()
+"""
+
+import re
+import sys
+import bisect
+import numbers
+import operator
+from array import array
+from binascii import hexlify, unhexlify
+from itertools import chain, imap
+
+from fileseq import constants
+from fileseq.constants import PAD_MAP, OPEN_FRANGE_RE
+from fileseq.exceptions import MaxSizeException
+from fileseq.frameset import FrameSet, _LazyFrames
+from fileseq.utils import xrange
+
+# Frames are grouped in chunks of 2 ** _CHUNK_BITS frames
+_CHUNK_BITS = 16
+
+# The offset of a frame within its chunk
+_LOW_MASK = (1 << _CHUNK_BITS) - 1
+
+# The bytes of the bitmap of a chunk
+_CHUNK_BYTES = 1 << (_CHUNK_BITS - 3)
+
+# A chunk with more frames than this is held as a bitmap instead of an
+# array. An array of this many 16 bit frames is the size of the bitmap
+_ARRAY_MAX = 4096
+
+# Parts of a frame range with at most this many frames are added to the
+# chunks frame by frame, rather than as a bitmap
+_SMALL_PART = 64
+
+# Runs of set bits, in a binary string with the lowest bit first
+_RUNS_RE = re.compile('1+')
+
+
+def _runs(bits):
+    """
+    Yield the ``(first, stop)`` bit positions of each run of set bits.
+
+    :type bits: long
+    :rtype: generator of tuple
+    """
+    for match in _RUNS_RE.finditer(bin(bits)[:1:-1]):
+        yield match.span()
+
+
+def _bitsToArray(bits):
+    """
+    Return the positions of the set bits as a sorted array.
+
+    :type bits: long
+    :rtype: array.array
+    """
+    lows = array('H')
+    for first, stop in _runs(bits):
+        lows.extend(xrange(first, stop))
+    return lows
+
+
+def _arrayToBytes(lows):
+    """
+    Return the bitmap of an iterable of bit positions, with bit ``low`` in
+    bit ``low & 7`` of byte ``low >> 3``.
+
+    :type lows: iterable
+    :rtype: bytearray
+    """
+    buf = bytearray(_CHUNK_BYTES)
+    for low in lows:
+        buf[low >> 3] |= 1 << (low & 7)
+    return buf
+
+
+def _bytesToBits(buf):
+    """
+    Return the bitmap of a bytearray as a long, for operations on the
+    whole chunk.
+
+    :type buf: bytearray
+    :rtype: long
+    """
+    buf = bytearray(buf)
+    buf.reverse()
+    return long(hexlify(buf), 16)
+
+
+def _bitsToBytes(bits):
+    """
+    Return the bitmap of a long as a bytearray, as per :func:`_arrayToBytes`.
+
+    :type bits: long
+    :rtype: bytearray
+    """
+    buf = bytearray(unhexlify('{0:x}'.format(bits).zfill(_CHUNK_BYTES * 2)))
+    buf.reverse()
+    return buf
+
+
+def _stride(step, n):
+    """
+    Return the bitmap of ``n`` bits set every ``step`` bits from bit 0.
+
+    :type step: int
+    :type n: int
+    :rtype: long
+    """
+    return long(('0' * (step - 1) + '1') * n, 2)
+
+
+def _toBits(container):
+    if isinstance(container, array):
+        container = _arrayToBytes(container)
+    return _bytesToBits(container)
+
+
+def _pack(bits):
+    """
+    Return the ``(count, container)`` of a chunk bitmap, holding the frames
+    in an array unless there are too many of them, or None if it is empty.
+
+    :type bits: long
+    :rtype: tuple
+    """
+    n = bin(bits).count('1')
+    if not n:
+        return None
+    return n, (_bitsToArray(bits) if n <= _ARRAY_MAX else _bitsToBytes(bits))
+
+
+def _andNot(a, b):
+    return a & ~b
+
+
+def _chunkOp(op, a, b):
+    """
+    Apply a set operation to the ``(count, container)`` of two chunks.
+
+    :rtype: tuple or None
+    """
+    x, y = a[1], b[1]
+    if isinstance(x, array) and isinstance(y, array):
+        setOp = operator.sub if op is _andNot else op
+        lows = sorted(setOp(frozenset(x), frozenset(y)))
+        if not lows:
+            return None
+        if len(lows) <= _ARRAY_MAX:
+            return len(lows), array('H', lows)
+        return len(lows), _arrayToBytes(lows)
+    return _pack(op(_toBits(x), _toBits(y)))
+
+
+class BitmapFrameSet(_LazyFrames, FrameSet):
+    """
+    A :class:`fileseq.frameset.FrameSet` of frames held in compressed
+    chunks, always in ascending order.
+
+    Membership, iteration, ``len()``, indexing, :meth:`start`, :meth:`end`,
+    :meth:`index` and the set operations between bitmaps work directly on the
+    chunks. The frame range string is built on demand, and anything else
+    first builds the frames of the set, once.
+
+    A frame range string keeps its parts as given when they are in ascending
+    order and do not overlap. Any other frame range is rebuilt from the
+    sorted frames, as with :meth:`fileseq.frameset.FrameSet.normalize`.
+
+    The bitmap is a storage backend: its ``repr`` is that of a
+    :class:`fileseq.frameset.FrameSet`, which is what ``FrameSet()`` returns
+    it for.
+
+    :type frange: str
+    :param frange: the frame range as a string (ie "1-100x5"), or an
+                   iterable of frames
+    :param maxSize: optional max number of frames, see
+                    :class:`fileseq.frameset.FrameSet`
+    :raises: :class:`fileseq.exceptions.ParseException` if the frame range
+             (or a portion of it) could not be parsed
+             :class:`fileseq.exceptions.MaxSizeException` if the frame range
+             is open-ended, or exceeds the max number of frames
+    """
+
+    __slots__ = ('_chunks', '_count', '_cache')
+
+    def __init__(self, frange, maxSize=None):
+        self._cache = {}
+        if isinstance(frange, basestring):
+            self._setRange(frange, maxSize)
+            return
+        if isinstance(frange, FrameSet) and frange.is_open:
+            frange._unbounded('bitmap')
+        frames = sorted(frozenset(map(int, frange)))
+        FrameSet._maxSizeCheck(frames, maxSize)
+        self._setSorted(frames)
+
+    @classmethod
+    def from_iterable(cls, frames, sort=False, maxSize=None):
+        """
+        Build a :class:`BitmapFrameSet` from an iterable of frames, which
+        are always sorted.
+
+        :param frames: an iterable object containing frames as integers
+        :param sort: ignored, the frames of a bitmap are always sorted
+        :param maxSize: optional max number of frames, see
+                        :class:`fileseq.frameset.FrameSet`
+        :rtype: :class:`BitmapFrameSet`
+        """
+        return cls(frames, maxSize)
+
+    @classmethod
+    def _from_sorted(cls, frames, tail=None):
+        """
+        Build a :class:`BitmapFrameSet` directly from unique integer frames
+        that are already sorted.
+
+        :param frames: a sorted sequence of unique integer frames
+        :param tail: must be None, bitmaps are always bounded
+        :rtype: :class:`BitmapFrameSet`
+        :raises: :class:`fileseq.exceptions.MaxSizeException` if the frames
+                 exceed `fileseq.constants.MAX_FRAME_SIZE`
+        """
+        FrameSet._maxSizeCheck(frames)
+        self = cls.__new__(cls)
+        self._cache = {}
+        self._setSorted(frames)
+        return self
+
+    @classmethod
+    def _fromChunks(cls, chunks):
+        """
+        Return the result of a set operation on the chunks. Unless bitmaps
+        are disabled, a result that is too small or too sparse for the
+        bitmap, as per :meth:`fileseq.frameset.FrameSet._useBitmap`, is a
+        plain :class:`fileseq.frameset.FrameSet`.
+
+        :type chunks: dict
+        :rtype: :class:`fileseq.frameset.FrameSet`
+        """
+        self = cls.__new__(cls)
+        self._cache = {}
+        self._chunks = chunks
+        self._count = sum(n for n, _ in chunks.itervalues())
+        if constants.BITMAP_MIN_FRAMES is not None and not (chunks and FrameSet._useBitmap(
+                self._count, min(chunks) << _CHUNK_BITS, max(chunks) << _CHUNK_BITS)):
+            return FrameSet._from_sorted(list(self))
+        return self
+
+    def _setSorted(self, frames):
+        """
+        Fill the chunks from a sorted sequence of unique frames.
+        """
+        chunks = {}
+        total = len(frames)
+        i = 0
+        while i < total:
+            high = frames[i] >> _CHUNK_BITS
+            base = high << _CHUNK_BITS
+            j = bisect.bisect_left(frames, base + (1 << _CHUNK_BITS), i)
+            lows = array('H', imap((-base).__add__, frames[i:j]))
+            chunks[high] = (j - i, lows if j - i <= _ARRAY_MAX else _arrayToBytes(lows))
+            i = j
+        self._chunks = chunks
+        self._count = total
+
+    def _setRange(self, frange, maxSize=None):
+        """
+        Fill the chunks from a frame range string, adding large parts of the
+        range a chunk at a time as bitmaps.
+        """
+        frange = str(frange).translate(None, ''.join(PAD_MAP.keys()))
+        parts = [part for part in frange.split(',') if part]
+        if parts and OPEN_FRANGE_RE.match(parts[-1]):
+            msg = 'Cannot take the bitmap of the open-ended frame range "{0}"'
+            raise MaxSizeException(msg.format(frange))
+
+        parts = [FrameSet._parse_frange_part(part) for part in parts]
+        FrameSet._maxSizeCheck(
+            sum(FrameSet._partSize(*part) for part in parts), maxSize)
+
+        masks = {}
+        lows = {}
+        ascending = True
+        last = None
+        for start, end, modifier, chunk in parts:
+            step = 1 if modifier == ':' else chunk
+            lo, hi = min(start, end), max(start, end)
+
+            first, final = self._partBounds(start, end, modifier, chunk)
+            if first is None:
+                continue
+            if start > end or (modifier == ':' and chunk > 1) or (
+                    last is not None and first <= last):
+                ascending = False
+            last = final
+
+            if FrameSet._partSize(start, end, modifier, chunk) <= _SMALL_PART:
+                if modifier == 'y':
+                    frames = (f for f in xrange(lo, hi + 1) if (f - start) % chunk)
+                else:
+                    frames = (f for f in xrange(lo, hi + 1) if not (f - start) % step)
+                for f in frames:
+                    lows.setdefault(f >> _CHUNK_BITS, []).append(f & _LOW_MASK)
+                continue
+
+            for high in xrange(lo >> _CHUNK_BITS, (hi >> _CHUNK_BITS) + 1):
+                base = high << _CHUNK_BITS
+                clo = max(lo, base)
+                chi = min(hi, base + (1 << _CHUNK_BITS) - 1)
+                bits = ((1 << (chi - clo + 1)) - 1) << (clo - base)
+                if modifier in ('x', 'y') and chunk > 1:
+                    f0 = clo + (start - clo) % chunk
+                    stride = 0
+                    if f0 <= chi:
+                        stride = _stride(chunk, (chi - f0) // chunk + 1) << (f0 - base)
+                    bits = bits & ~stride if modifier == 'y' else stride
+                elif modifier == 'y':
+                    bits = 0
+                masks[high] = masks.get(high, 0) | bits
+
+        chunks = {}
+        for high in set(masks).union(lows):
+            packed = _pack(masks.get(high, 0) | _toBits(array('H', lows.get(high, ()))))
+            if packed is not None:
+                chunks[high] = packed
+        self._chunks = chunks
+        self._count = sum(n for n, _ in chunks.itervalues())
+        if ascending:
+            self._cache['frange'] = frange
+
+    @staticmethod
+    def _partBounds(start, end, modifier, chunk):
+        """
+        Return the first and last frame that a parsed part of a frame range
+        produces, or ``(None, None)`` if it has no frames.
+
+        :rtype: tuple
+        """
+        if start > end or modifier == ':':
+            return start, end
+        if modifier == 'x':
+            return start, start + (end - start) // chunk * chunk
+        if modifier == 'y':
+            if chunk == 1 or start == end:
+                return None, None
+            return start + 1, end - 1 if (end - start) % chunk == 0 else end
+        return start, end
+
+    def memoryUsage(self, detailed=False):
+        """
+        Return the bytes of memory used by the :class:`BitmapFrameSet`: the
+        object, its chunks, and any frames or frame range built on demand.
+
+        :type detailed: bool
+        :param detailed: if True, return the bytes of each part in a dict
+                         with the keys ``object``, ``chunks`` and ``cache``
+        :rtype: int or dict
+        """
+        sizeof = sys.getsizeof
+        chunks = self._chunks
+        usage = {
+            'object': sizeof(self),
+            'chunks': sizeof(chunks) + sum(sizeof(c) + sizeof(c[1])
+                                           for c in chunks.itervalues()),
+            'cache': sum(sizeof(v) for v in self._cache.itervalues()),
+        }
+        return usage if detailed else sum(usage.itervalues())
+
+    def _index(self):
+        """
+        Return the sorted chunk keys, and the index of the first frame of
+        each chunk.
+
+        :rtype: tuple (list, list)
+        """
+        if 'index' not in self._cache:
+            highs = sorted(self._chunks)
+            firsts = []
+            n = 0
+            for high in highs:
+                firsts.append(n)
+                n += self._chunks[high][0]
+            self._cache['index'] = highs, firsts
+        return self._cache['index']
+
+    def __contains__(self, item):
+        """
+        Check if item is a member of this :class:`BitmapFrameSet`, by
+        looking in the chunk of the frame.
+
+        :type item: int
+        :rtype: bool
+        """
+        if type(item) is not int and not isinstance(item, numbers.Integral):
+            return False
+        c = self._chunks.get(item >> _CHUNK_BITS)
+        if c is None:
+            return False
+        low = item & _LOW_MASK
+        container = c[1]
+        if type(container) is bytearray:
+            return container[low >> 3] >> (low & 7) & 1 == 1
+        i = bisect.bisect_left(container, low)
+        return i < len(container) and container[i] == low
+
+    def __iter__(self):
+        """
+        Iterate over the frames in ascending order, one chunk at a time.
+
+        :rtype: generator
+        """
+        return chain.from_iterable(imap(self._iterChunk, self._index()[0]))
+
+    def _iterChunk(self, high):
+        base = high << _CHUNK_BITS
+        container = self._chunks[high][1]
+        if isinstance(container, array):
+            return imap(base.__add__, container)
+        return chain.from_iterable(
+            xrange(base + first, base + stop) for first, stop in _runs(_toBits(container)))
+
+    def __getitem__(self, index):
+        """
+        Index into the ascending frames, reading only the chunk needed.
+        Slices build the frames of the set.
+
+        :type index: int or slice
+        :rtype: int or tuple
+        :raises: :class:`IndexError` if index is out of bounds
+        """
+        if isinstance(index, slice):
+            return self._order[index]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('FrameSet index out of range')
+        highs, firsts = self._index()
+        i = bisect.bisect_right(firsts, index) - 1
+        container = self._chunks[highs[i]][1]
+        if not isinstance(container, array):
+            container = _bitsToArray(_toBits(container))
+        return (highs[i] << _CHUNK_BITS) + container[index - firsts[i]]
+
+    def index(self, frame):
+        """
+        Return the index of the given frame number.
+
+        :type frame: int
+        :rtype: int
+        :raises: :class:`ValueError` if frame is not in self
+        """
+        if frame not in self:
+            raise ValueError('{0} is not in {1!r}'.format(frame, self))
+        highs, firsts = self._index()
+        high = frame >> _CHUNK_BITS
+        low = frame & _LOW_MASK
+        container = self._chunks[high][1]
+        if isinstance(container, array):
+            offset = bisect.bisect_left(container, low)
+        else:
+            offset = bin(_toBits(container) & ((1 << low) - 1)).count('1')
+        return firsts[bisect.bisect_left(highs, high)] + offset
+
+    def start(self):
+        """
+        The lowest frame.
+
+        :rtype: int
+        :raises: :class:`IndexError` if empty
+        """
+        if not self._count:
+            raise IndexError('FrameSet index out of range')
+        high = min(self._chunks)
+        container = self._chunks[high][1]
+        if isinstance(container, array):
+            low = container[0]
+        else:
+            bits = _toBits(container)
+            low = (bits & -bits).bit_length() - 1
+        return (high << _CHUNK_BITS) + low
+
+    def end(self):
+        """
+        The highest frame.
+
+        :rtype: int
+        :raises: :class:`IndexError` if empty
+        """
+        if not self._count:
+            raise IndexError('FrameSet index out of range')
+        high = max(self._chunks)
+        container = self._chunks[high][1]
+        if isinstance(container, array):
+            low = container[-1]
+        else:
+            low = _toBits(container).bit_length() - 1
+        return (high << _CHUNK_BITS) + low
+
+    def toArray(self, typecode='l'):
+        """
+        Return the frames as an ``array.array``, built a chunk at a time.
+        See :meth:`fileseq.frameset.FrameSet.toArray`.
+
+        :type typecode: str
+        :rtype: array.array
+        """
+        frames = array(typecode)
+        for high in self._index()[0]:
+            frames.extend(self._iterChunk(high))
+        return frames
+
+    # set operations between bitmaps work a chunk at a time
+
+    @staticmethod
+    def _asBitmap(other):
+        """
+        Cast the other operand of a set operation to a bitmap, or return
+        None if it is open-ended or can not be cast.
+
+        :rtype: :class:`BitmapFrameSet` or None
+        """
+        if isinstance(other, BitmapFrameSet):
+            return other
+        other = FrameSet._cast_to_frameset(other)
+        if other is NotImplemented or other.is_open:
+            return None
+        return BitmapFrameSet._from_sorted(sorted(other._items))
+
+    def _combine(self, other, op, left, right):
+        """
+        Apply a set operation to each chunk of two bitmaps.
+
+        :type other: :class:`BitmapFrameSet`
+        :param op: the operation on two chunk bitmaps
+        :type left: bool
+        :param left: keep the chunks that only `self` has
+        :type right: bool
+        :param right: keep the chunks that only `other` has
+        :rtype: :class:`fileseq.frameset.FrameSet`
+        """
+        a, b = self._chunks, other._chunks
+        keys = set(a)
+        if right:
+            keys.update(b)
+        if not left:
+            keys.intersection_update(b)
+
+        chunks = {}
+        for high in keys:
+            x, y = a.get(high), b.get(high)
+            c = x if y is None else y if x is None else _chunkOp(op, x, y)
+            if c is not None:
+                chunks[high] = c
+        return BitmapFrameSet._fromChunks(chunks)
+
+    def __and__(self, other):
+        bitmap = self._asBitmap(other)
+        if bitmap is None:
+            return super(BitmapFrameSet, self).__and__(other)
+        return self._combine(bitmap, operator.and_, False, False)
+
+    __rand__ = __and__
+
+    def __sub__(self, other):
+        bitmap = self._asBitmap(other)
+        if bitmap is None:
+            return super(BitmapFrameSet, self).__sub__(other)
+        return self._combine(bitmap, _andNot, True, False)
+
+    def __rsub__(self, other):
+        bitmap = self._asBitmap(other)
+        if bitmap is None:
+            return super(BitmapFrameSet, self).__rsub__(other)
+        return bitmap._combine(self, _andNot, True, False)
+
+    def __or__(self, other):
+        bitmap = self._asBitmap(other)
+        if bitmap is None:
+            return super(BitmapFrameSet, self).__or__(other)
+        return self._combine(bitmap, operator.or_, True, True)
+
+    __ror__ = __or__
+
+    def __xor__(self, other):
+        bitmap = self._asBitmap(other)
+        if bitmap is None:
+            return super(BitmapFrameSet, self).__xor__(other)
+        return self._combine(bitmap, operator.xor, True, True)
+
+    __rxor__ = __xor__
+
+    def __repr__(self):
+        return 'FrameSet("{0}")'.format(self.frange)
+
+    def __eq__(self, other):
+        if isinstance(other, BitmapFrameSet):
+            return self._chunks == other._chunks
+        return super(BitmapFrameSet, self).__eq__(other)
+
+    def isdisjoint(self, other):
+        """
+        Check if `self` has no frames in common with `other`.
+
+        :rtype: bool, or :class:`NotImplemented` if `other` fails to convert
+                to a :class:`FrameSet`
+        """
+        bitmap = self._asBitmap(other)
+        if bitmap is None:
+            return super(BitmapFrameSet, self).isdisjoint(other)
+        a, b = self._chunks, bitmap._chunks
+        return not any(_chunkOp(operator.and_, a[high], b[high])
+                       for high in set(a).intersection(b))
+
+    def issubset(self, other):
+        """
+        Check if the frames of `self` are all in `other`.
+
+        :rtype: bool, or :class:`NotImplemented` if `other` fails to convert
+                to a :class:`FrameSet`
+        """
+        bitmap = self._asBitmap(other)
+        if bitmap is None:
+            return super(BitmapFrameSet, self).issubset(other)
+        a, b = self._chunks, bitmap._chunks
+        return all(high in b and not _chunkOp(_andNot, c, b[high])
+                   for high, c in a.iteritems())
+
+    def issuperset(self, other):
+        """
+        Check if the frames of `other` are all in `self`.
+
+        :rtype: bool, or :class:`NotImplemented` if `other` fails to convert
+                to a :class:`FrameSet`
+        """
+        bitmap = self._asBitmap(other)
+        if bitmap is None:
+            return super(BitmapFrameSet, self).issuperset(other)
+        return bitmap.issubset(self)
+
+    def union(self, *other):
+        return reduce(operator.or_, other, self)
+
+    def intersection(self, *other):
+        return reduce(operator.and_, other, self)
+
+    def difference(self, *other):
+        return reduce(operator.sub, other, self)
+
+    def symmetric_difference(self, other):
+        return self ^ other
+
+    def __reduce__(self):
+        return BitmapFrameSet, (self.frange,)
@@ -0,0 +1,337 @@
+#! /usr/bin/env python
+"""
+cli - The ``fileseq`` command line tool.
+
+Lists the file sequences of directories, streaming one compact line per
+sequence as each directory is scanned::
+
+    fileseq ls /path/to/renders
+    fileseq ls -R --missing /path/to/renders
+    fileseq ls --json '/path/to/renders/beauty.#.exr'
+"""
+
+import os
+import sys
+import json
+import errno
+import argparse
+import Queue
+from multiprocessing.pool import ThreadPool
+
+from fileseq.exceptions import FileSeqException, MaxSizeException
+from fileseq.filesequence import FileSequence
+from fileseq import utils
+
+
+# How long the main thread blocks on a result before checking for
+# an interrupt, since a blocking Queue.get ignores KeyboardInterrupt
+_POLL_INTERVAL = 0.5
+
+
+def _parseRoot(path, strictPadding=False):
+    """
+    Split a directory, or a file pattern as accepted by
+    :meth:`fileseq.filesequence.FileSequence.findSequencesOnDisk`, into the
+    directory to scan, the compiled regular expression that the file names
+    must match, and the frame padding that the file names must match.
+
+    :type path: str
+    :type strictPadding: bool
+    :rtype: tuple (dirpath, regex or None, padding number or None), or None
+            if the directory does not exist
+    :raises: :class:`fileseq.exceptions.FileSeqException` if the pattern is invalid
+    """
+    if os.path.isdir(path):
+        return path, None, None
+
+    dirpath, filepat = os.path.split(path)
+    if not os.path.isdir(dirpath):
+        return None
+
+    regex = FileSequence.compilePattern(filepat)
+    padNum = None
+    if strictPadding:
+        padding = FileSequence(filepat).padding()
+        if padding:
+            padNum = FileSequence.getPaddingNum(padding)
+    return dirpath, regex, padNum
+
+
+def _scanDir(dirpath, regex=None, padNum=None, include_hidden=False,
+             recursive=False, splitPadding=False):
+    """
+    List a single directory and group its files into sequences.
+
+    :type dirpath: str
+    :type regex: re.RegexObject
+    :param regex: optional pattern that the file names must match
+    :type padNum: int
+    :param padNum: optional frame padding that the file names must match
+    :type include_hidden: bool
+    :type recursive: bool
+    :param recursive: if True, also return the subdirectories to descend into
+    :type splitPadding: bool
+    :rtype: tuple (subdirectory paths, sorted sequences)
+    """
+    def _match(name):
+        if not include_hidden and name.startswith('.'):
+            return False
+        if regex is not None and not regex.match(name):
+            return False
+        if padNum is not None:
+            # like strictPadding, names that are not sequence paths pass
+            parts = utils.splitDiskPath(name)
+            if parts and len(parts[2] or '') != padNum:
+                return False
+        return True
+
+    if recursive:
+        # subdirectories are needed as well, so filter the files afterwards
+        dirs, files, _ = utils.listDir(dirpath)
+        files = filter(_match, files)
+    else:
+        dirs, files, _ = utils.listDir(dirpath, match=_match)
+        dirs = []
+
+    subdirs = []
+    for name in sorted(dirs):
+        if not include_hidden and name.startswith('.'):
+            continue
+        path = os.path.join(dirpath, name)
+        # like os.walk, don't follow symlinks into possible cycles
+        if not os.path.islink(path):
+            subdirs.append(path)
+
+    paths = [os.path.join(dirpath, name) for name in files]
+    seqs = list(FileSequence.yield_sequences_in_list(paths, splitPadding=splitPadding))
+    seqs.sort(key=str)
+    return subdirs, seqs
+
+
+def walkSequences(roots, workers=8, **kwargs):
+    """
+    Scan directories in a pool of threads, yielding the sequences of each
+    directory as soon as it has been scanned. With ``recursive=True``, the
+    subdirectories are queued as they are discovered, so the directories
+    finish in no particular order.
+
+    Each root is a tuple of ``(dirpath, regex, padNum)``, as returned by
+    :func:`_parseRoot`. The keyword arguments are passed on
+    to the scan of each directory.
+
+    :type roots: list
+    :type workers: int
+    :param workers: the number of directories scanned in parallel
+    :rtype: generator of (dirpath, sequences or None, error or None)
+    """
+    results = Queue.Queue()
+    recursive = kwargs.get('recursive', False)
+
+    def _task(dirpath, regex, padNum):
+        try:
+            subdirs, seqs = _scanDir(dirpath, regex, padNum, **kwargs)
+        except Exception as err:
+            return dirpath, regex, padNum, [], None, err
+        return dirpath, regex, padNum, subdirs, seqs, None
+
+    pool = ThreadPool(max(1, workers))
+    try:
+        pending = 0
+        for root in roots:
+            pool.apply_async(_task, root, callback=results.put)
+            pending += 1
+
+        while pending:
+            try:
+                dirpath, regex, padNum, subdirs, seqs, err = results.get(True, _POLL_INTERVAL)
+            except Queue.Empty:
+                continue
+            pending -= 1
+
+            if recursive:
+                for subdir in subdirs:
+                    pool.apply_async(_task, (subdir, regex, padNum), callback=results.put)
+                    pending += 1
+
+            yield dirpath, seqs, err
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def _displayPath(seq):
+    """
+    Return the string of a sequence for display, without any
+    leading reference to the current directory.
+
+    :type seq: :class:`fileseq.filesequence.FileSequence`
+    :rtype: str
+    """
+    path = str(seq)
+    prefix = os.path.join(os.curdir, '')
+    if path.startswith(prefix):
+        path = path[len(prefix):]
+    return path
+
+
+def _missingRange(seq):
+    """
+    Return the frame range missing from a sequence, or None if it is
+    too large to compute.
+
+    :type seq: :class:`fileseq.filesequence.FileSequence`
+    :rtype: str or None
+    """
+    try:
+        return seq.invertedFrameRange() or ''
+    except MaxSizeException:
+        return None
+
+
+def _formatSequence(seq, asJson=False, missing=False):
+    """
+    Format a sequence as a single output line.
+
+    :type seq: :class:`fileseq.filesequence.FileSequence`
+    :type asJson: bool
+    :param asJson: if True, format a JSON object
+    :type missing: bool
+    :param missing: if True, include the missing frame range
+    :rtype: str
+    """
+    path = _displayPath(seq)
+    if not asJson:
+        if missing:
+            gaps = _missingRange(seq)
+            return '{0}\t{1}'.format(path, '?' if gaps is None else gaps)
+        return path
+
+    frameSet = seq.frameSet()
+    data = {
+        'path': path,
+        'dirname': seq.dirname(),
+        'basename': seq.basename(),
+        'extension': seq.extension(),
+        'padding': seq.padding(),
+        'range': seq.frameRange() if frameSet else None,
+        'start': seq.start() if frameSet else None,
+        'end': seq.end() if frameSet else None,
+        'length': len(frameSet) if frameSet else 1,
+    }
+    if missing:
+        data['missing'] = _missingRange(seq)
+    return json.dumps(data, sort_keys=True)
+
+
+def _ls(args, out, err):
+    """
+    Run the ``ls`` sub-command.
+
+    :rtype: int
+    :returns: the exit status
+    """
+    status = 0
+    roots = []
+
+    for path in args.paths:
+        # a bare file pattern is relative to the current directory
+        if not os.path.dirname(path) and not os.path.isdir(path):
+            path = os.path.join(os.curdir, path)
+        try:
+            parsed = _parseRoot(path, args.strict_padding)
+        except FileSeqException as e:
+            err.write('fileseq ls: {0}\n'.format(e))
+            status = 1
+            continue
+        if parsed is None:
+            err.write('fileseq ls: cannot access {0}: No such directory\n'.format(path))
+            status = 1
+            continue
+        roots.append(parsed)
+
+    walk = walkSequences(
+        roots,
+        workers=args.jobs,
+        include_hidden=args.all,
+        recursive=args.recursive,
+        splitPadding=args.split_padding)
+
+    for dirpath, seqs, e in walk:
+        if e is not None:
+            err.write('fileseq ls: cannot list {0}: {1}\n'.format(dirpath, e))
+            status = 1
+            continue
+        if not seqs:
+            continue
+        out.write(''.join(
+            _formatSequence(seq, args.json, args.missing) + '\n' for seq in seqs))
+        out.flush()
+
+    return status
+
+
+def _parser():
+    """
+    Build the argument parser of the command line tool.
+
+    :rtype: argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog='fileseq',
+        description='Work with file sequences from the command line.')
+    commands = parser.add_subparsers(dest='command')
+
+    ls = commands.add_parser(
+        'ls', help='list the file sequences in directories',
+        description='List the file sequences in directories, or the sequences '
+                    'matching file patterns such as "beauty.#.exr". One line is '
+                    'written per sequence, as soon as its directory is scanned.')
+    ls.add_argument('paths', nargs='*', default=[os.curdir],
+                    help='directories or file patterns to list (default: .)')
+    ls.add_argument('-R', '--recursive', action='store_true',
+                    help='list subdirectories recursively, applying any file pattern to each')
+    ls.add_argument('-a', '--all', action='store_true',
+                    help='include hidden files and directories')
+    ls.add_argument('--json', action='store_true',
+                    help='write one JSON object per sequence')
+    ls.add_argument('--missing', action='store_true',
+                    help='include the missing frames of each sequence')
+    ls.add_argument('--strict-padding', action='store_true',
+                    help='only match files with the padding of the file pattern')
+    ls.add_argument('--split-padding', action='store_true',
+                    help='list a sequence per frame padding, instead of merging them')
+    ls.add_argument('-j', '--jobs', type=int, default=8,
+                    help='the number of directories to scan in parallel (default: 8)')
+
+    return parser
+
+
+def main(argv=None, out=None, err=None):
+    """
+    Entry point of the ``fileseq`` command line tool.
+
+    :type argv: list
+    :param argv: the arguments, defaulting to ``sys.argv[1:]``
+    :param out: the stream for results, defaulting to stdout
+    :param err: the stream for errors, defaulting to stderr
+    :rtype: int
+    :returns: the exit status
+    """
+    out = sys.stdout if out is None else out
+    err = sys.stderr if err is None else err
+
+    args = _parser().parse_args(argv)
+
+    try:
+        return _ls(args, out, err)
+    except IOError as e:
+        # the reader went away, i.e. piped into `head`
+        if e.errno == errno.EPIPE:
+            return 0
+        raise
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == '__main__':
+    sys.exit(main())
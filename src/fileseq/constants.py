@@ -8,9 +8,35 @@ import re
 # The max frame count of a FrameSet before a MaxSizeException
 # exception is raised
 MAX_FRAME_SIZE = 10000000
+
+# The max estimated memory in bytes of the frames of a FrameSet before a
+# MaxSizeException exception is raised, or None for no memory budget.
+# See FrameSet.memoryUsage
+MAX_FRAME_MEMORY = None
+
+# Frame sets and set operation results with at least this many frames, in
+# ascending order, use the compressed bitmap backend of
+# fileseq.bitmap.BitmapFrameSet, or None to disable it
+BITMAP_MIN_FRAMES = 65536
+
+# ... as long as they hold at least this many frames per 65536 frame chunk
+# that they span. Sparser frames are faster to look up in a plain FrameSet
+BITMAP_MIN_DENSITY = 1024
     
 PAD_MAP = {"#": 4, "@": 1}
 
+# The max number of compiled file patterns to keep cached
+PATTERN_CACHE_SIZE = 256
+
+# The number of bytes transferred at a time when copying frames
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+
+# The number of bytes hashed at a time when checksumming frames
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Frames at least this large are memory-mapped when checksumming
+MMAP_MIN_SIZE = 4 * 1024 * 1024
+
 # Regular expression for matching a file sequence string.
 # Example: /film/shot/renders/bilbo_bty.1-100#.exr
 # Example: /film/shot/renders/bilbo_bty.1-100@.exr
@@ -33,6 +59,12 @@ DISK_RE = re.compile(DISK_PATTERN)
 FRANGE_PATTERN = r"^(-?\d+)(?:-(-?\d+)(?:([:xy]{1})(\d+))?)?$"
 FRANGE_RE = re.compile(FRANGE_PATTERN)
 
+# Regular expression pattern for matching an open-ended frame set string,
+# which can only be the last part of a frame range.
+# Examples: '1001-' (every frame from 1001), '1001-x2'
+OPEN_FRANGE_PATTERN = r"^(-?\d+)-(?:x(\d+))?$"
+OPEN_FRANGE_RE = re.compile(OPEN_FRANGE_PATTERN)
+
 # Regular expression for padding a frame range.
-PAD_PATTERN = r"(-?)(\d+)(?:(-)(-?)(\d+)(?:([:xy]{1})(\d+))?)?"
+PAD_PATTERN = r"(-?)(\d+)(?:(-)(-?)(\d+)(?:([:xy]{1})(\d+))?|(-(?:x\d+)?))?"
 PAD_RE = re.compile(PAD_PATTERN)
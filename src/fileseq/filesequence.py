@@ -5,13 +5,34 @@ filesequence - A parsing object representing sequential files for fileseq.
 
 import os
 import re
+import sys
+import time
+import errno
+import numbers
+import binascii
 import functools
-from glob import iglob
-from itertools import imap, ifilter
-from fileseq.exceptions import ParseException, FileSeqException
+from collections import namedtuple
+from glob import iglob, has_magic
+from itertools import imap, islice
+from fileseq.exceptions import ParseException, FileSeqException, MaxSizeException
 from fileseq.constants import PAD_MAP, DISK_RE, SPLIT_RE, PRINTF_SYNTAX_PADDING_RE
+from fileseq.constants import PATTERN_CACHE_SIZE
 from fileseq.frameset import FrameSet
-from fileseq import utils
+from fileseq import instrument, patterns, utils
+
+
+# The size and modification time of a single frame on disk
+FrameStat = namedtuple('FrameStat', ('size', 'mtime'))
+
+# The digests of the frames of a sequence, and of the whole sequence
+Checksums = namedtuple('Checksums', ('frames', 'digest'))
+
+# The frames deleted by FileSequence.remove, and its throughput in files per second
+Removal = namedtuple('Removal', ('removed', 'missing', 'elapsed', 'rate'))
+
+# Compiled file patterns, see FileSequence.compilePattern
+_PATTERN_CACHE = utils.LRUCache(PATTERN_CACHE_SIZE, name='pattern')
+
 
 class FileSequence(object):
     """:class:`FileSequence` represents an ordered sequence of files.
@@ -21,9 +42,18 @@ class FileSequence(object):
 
     :type sequence: str
     :param sequence: (ie: dir/path.1-100#.ext)
+    :type maxSize: int
+    :param maxSize: optional max number of frames, replacing the limit of
+                    :func:`fileseq.utils.maxFrameSize` or
+                    :obj:`fileseq.constants.MAX_FRAME_SIZE` for this call
     :raises: :class:`fileseq.exceptions.MaxSizeException`
     """
-    def __init__(self, sequence):
+
+    # Per-frame stats, only gathered when scanning the disk with stats enabled
+    _frameStats = None
+    _frameStatCollisions = None
+
+    def __init__(self, sequence, maxSize=None):
 
         sequence = utils.asString(sequence)
 
@@ -35,7 +65,10 @@ class FileSequence(object):
                 # the main case, padding characters in the path.1-100#.exr
                 path, frames, self._pad, self._ext = SPLIT_RE.split(sequence, 1)
                 self._dir, self._base = os.path.split(path)
-                self._frameSet = FrameSet(frames)
+                self._frameSet = FrameSet(frames, maxSize)
+            except MaxSizeException:
+                # a ValueError as well, but the sequence did parse
+                raise
             except ValueError:
                 # edge case 1; we've got an invalid pad
                 for placeholder in PAD_MAP.keys():
@@ -54,7 +87,7 @@ class FileSequence(object):
                         self._pad = ''
                         self._frameSet = None
                     else:
-                        self._frameSet = FrameSet(frames)
+                        self._frameSet = FrameSet(frames, maxSize)
                         if self._frameSet:
                             self._pad = FileSequence.getPaddingChars(len(frames))
                         else:
@@ -109,11 +142,14 @@ class FileSequence(object):
         # Potentially expensive if inverted range is large
         # and user never asked for it in template
         inverted = (self.invertedFrameRange() or "") if "{inverted}" in template else ""
+        # an open-ended frame range has no end or length to format
+        end = self.end() if "{end" in template else ""
+        length = len(self) if "{length" in template else ""
 
         return template.format(
             basename=self.basename(),
             extension=self.extension(), start=self.start(),
-            end=self.end(), length=len(self),
+            end=end, length=length,
             padding=self.padding(),
             range=self.frameRange() or "",
             inverted=inverted,
@@ -253,16 +289,17 @@ class FileSequence(object):
             return ''
         return self._frameSet.frameRange(self._zfill)
 
-    def setFrameRange(self, frange):
+    def setFrameRange(self, frange, maxSize=None):
         """
         Set a new frame range for the sequence.
 
         :param frange: a properly formatted frame range, as per :class:`fileseq.frameset.FrameSet`
+        :param maxSize: optional max number of frames, see :class:`FileSequence`
         :rtype: None
         """
-        self._frameSet = FrameSet(frange)
+        self._frameSet = FrameSet(frange, maxSize)
 
-    def invertedFrameRange(self):
+    def invertedFrameRange(self, maxSize=None):
         """
         Returns the inverse string formatted frame range of the sequence.
         Will return an empty string if the sequence has no frame pattern.
@@ -270,12 +307,61 @@ class FileSequence(object):
         If new inverted range exceeded :obj:`fileseq.constants.MAX_FRAME_SIZE`, 
         a ``MaxSizeException`` will be raised.
 
+        :param maxSize: optional max number of frames, see :class:`FileSequence`
         :rtype: str
         :raises: :class:`fileseq.exceptions.MaxSizeException`
         """
         if not self._frameSet:
             return ''
-        return self._frameSet.invertedFrameRange(self._zfill)
+        return self._frameSet.invertedFrameRange(self._zfill, maxSize)
+
+    def offset(self, n):
+        """
+        Return a copy of the sequence with every frame shifted by ``n``,
+        keeping its padding. See :meth:`fileseq.frameset.FrameSet.offset`.
+
+        :type n: int
+        :rtype: :class:`FileSequence`
+        """
+        return self._withFrameSet(lambda frameSet: frameSet.offset(n))
+
+    def scale(self, k):
+        """
+        Return a copy of the sequence with every frame multiplied by ``k``,
+        keeping its padding. See :meth:`fileseq.frameset.FrameSet.scale`.
+
+        :type k: int
+        :rtype: :class:`FileSequence`
+        """
+        return self._withFrameSet(lambda frameSet: frameSet.scale(k))
+
+    def clamp(self, start=None, end=None):
+        """
+        Return a copy of the sequence with only the frames between ``start``
+        and ``end``, inclusive. See :meth:`fileseq.frameset.FrameSet.clamp`.
+
+        :type start: int
+        :type end: int
+        :rtype: :class:`FileSequence`
+        """
+        return self._withFrameSet(lambda frameSet: frameSet.clamp(start, end))
+
+    def _withFrameSet(self, transform):
+        """
+        Return a copy of the sequence with a transformed frame set. Frame
+        stats are not copied, since they belong to the original frames.
+
+        :type transform: callable
+        :param transform: returns a new frame set, given the current one
+        :rtype: :class:`FileSequence`
+        """
+        seq = self.__class__.__new__(self.__class__)
+        seq.__dict__ = self.__dict__.copy()
+        seq.__dict__.pop('_frameStats', None)
+        seq.__dict__.pop('_frameStatCollisions', None)
+        if self._frameSet is not None:
+            seq._frameSet = transform(self._frameSet)
+        return seq
 
     def start(self):
         """
@@ -336,6 +422,553 @@ class FileSequence(object):
 
         return "".join((self._dir, self._base, zframe, self._ext))
 
+    def frameStats(self):
+        """
+        Return the per-frame stats gathered when this sequence was found
+        with ``findSequencesOnDisk(..., stats=True)``, otherwise None.
+
+        The result maps each frame number to a :class:`FrameStat` of
+        ``(size, mtime)``. A sequence with no frame pattern uses None as its
+        single key.
+
+        :rtype: dict or None
+        """
+        return self._frameStats
+
+    def frameStatCollisions(self):
+        """
+        Return the frames that were found on disk with several paddings
+        (ie 1, 01 and 001) when gathering stats, which map to the frame
+        strings of each file. The :meth:`frameStats` of such a frame are
+        those of the file named with the padding of this sequence, or else
+        of the first one found.
+
+        :rtype: dict or None
+        """
+        if self._frameStats is None:
+            return None
+        return self._frameStatCollisions or {}
+
+    def memoryUsage(self, detailed=False):
+        """
+        Return the bytes of memory used by the sequence: the object, its
+        path strings, its :class:`fileseq.frameset.FrameSet` and any
+        frame stats.
+
+        :type detailed: bool
+        :param detailed: if True, return the bytes of each part in a dict
+                         with the keys ``object``, ``strings``, ``frameSet``
+                         and ``frameStats``
+        :rtype: int or dict
+        """
+        sizeof = sys.getsizeof
+        # the same string object may be shared by several attributes
+        strings = dict((id(v), v) for v in self.__dict__.itervalues()
+                       if isinstance(v, basestring))
+        usage = {
+            'object': sizeof(self) + sizeof(self.__dict__),
+            'strings': sum(sizeof(v) for v in strings.itervalues()),
+            'frameSet': self._frameSet.memoryUsage() if self._frameSet is not None else 0,
+            'frameStats': 0,
+        }
+        if self._frameStats is not None:
+            total = sizeof(self._frameStats)
+            for frame, st in self._frameStats.iteritems():
+                total += sizeof(frame)
+                if st is not None:
+                    total += sizeof(st) + sizeof(st.size) + sizeof(st.mtime)
+            usage['frameStats'] = total
+        return usage if detailed else sum(usage.itervalues())
+
+    def _iterFrameStats(self):
+        """
+        Yield the (frame, :class:`FrameStat`) pairs of the frames in the
+        current frame set that have stats.
+
+        :raises: :class:`fileseq.exceptions.FileSeqException` if no stats
+                 were gathered for this sequence
+        """
+        if self._frameStats is None:
+            msg = "no frame stats for {0}: use findSequencesOnDisk(..., stats=True)"
+            raise FileSeqException(msg.format(self))
+
+        frameSet = self._frameSet
+        for frame, st in self._frameStats.iteritems():
+            if st is None:
+                continue
+            if frame is None or (frameSet is not None and frame in frameSet):
+                yield frame, st
+
+    def totalSize(self):
+        """
+        Return the total size in bytes of the frames in the sequence,
+        from the stats gathered on disk.
+
+        :rtype: int
+        :raises: :class:`fileseq.exceptions.FileSeqException` if no stats
+                 were gathered for this sequence
+        """
+        return sum(st.size for _, st in self._iterFrameStats())
+
+    def undersizedFrames(self, minSize=1):
+        """
+        Return the frames that are smaller than ``minSize`` bytes on disk.
+        The default returns the zero-byte frames.
+
+        :type minSize: int
+        :param minSize: the smallest acceptable size in bytes
+        :rtype: :class:`fileseq.frameset.FrameSet`
+        :raises: :class:`fileseq.exceptions.FileSeqException` if no stats
+                 were gathered for this sequence
+        """
+        frames = set(frame for frame, st in self._iterFrameStats()
+                     if frame is not None and st.size < minSize)
+        return FrameSet(frames)
+
+    def oldestFrame(self):
+        """
+        Return the frame with the oldest modification time on disk,
+        or None if no frame has stats.
+
+        :rtype: int or None
+        :raises: :class:`fileseq.exceptions.FileSeqException` if no stats
+                 were gathered for this sequence
+        """
+        items = list(self._iterFrameStats())
+        if not items:
+            return None
+        return min(items, key=lambda item: item[1].mtime)[0]
+
+    def newestFrame(self):
+        """
+        Return the frame with the newest modification time on disk,
+        or None if no frame has stats.
+
+        :rtype: int or None
+        :raises: :class:`fileseq.exceptions.FileSeqException` if no stats
+                 were gathered for this sequence
+        """
+        items = list(self._iterFrameStats())
+        if not items:
+            return None
+        return max(items, key=lambda item: item[1].mtime)[0]
+
+    def _checkBounded(self, action):
+        """
+        Raise a FileSeqException if the frame range of the sequence is
+        open-ended, for an action that needs every one of its frames.
+
+        :type action: str
+        :param action: the action, for the error message
+        :raises: :class:`fileseq.exceptions.FileSeqException`
+        """
+        if self._frameSet is not None and self._frameSet.is_open:
+            msg = 'cannot {0} {1}: its frame range is open-ended'
+            raise FileSeqException(msg.format(action, self))
+
+    def _frameMapping(self, renumber=None):
+        """
+        Return the (source, destination) frame pairs of the sequence, after
+        applying an optional renumbering. A sequence without frames has the
+        single pair ``(None, None)``.
+
+        :param renumber: an int offset added to every frame, or a mapping of
+                         source to destination frames. Frames missing from a
+                         mapping keep their number.
+        :rtype: list
+        :raises: :class:`fileseq.exceptions.FileSeqException` if several
+                 frames are renumbered to the same frame
+        """
+        if not self._frameSet or not self._zfill:
+            return [(None, None)]
+
+        if renumber is None:
+            renumber = 0
+        if isinstance(renumber, numbers.Integral):
+            pairs = [(f, f + renumber) for f in self._frameSet]
+        elif hasattr(renumber, 'get'):
+            pairs = [(f, int(renumber.get(f, f))) for f in self._frameSet]
+        else:
+            msg = 'renumber must be an int offset or a mapping of frames, not {0!r}'
+            raise ValueError(msg.format(renumber))
+
+        if len(set(dst for _, dst in pairs)) != len(pairs):
+            msg = 'renumbering {0} would map several frames to the same frame'
+            raise FileSeqException(msg.format(self))
+        return pairs
+
+    def _transferPlan(self, dest, renumber=None):
+        """
+        Resolve the destination of a copy or move of this sequence, and
+        pair up the paths of each of its frames.
+
+        See :meth:`copyTo`
+
+        :rtype: tuple (destination :class:`FileSequence`, list of (src, dst) paths)
+        :raises: :class:`fileseq.exceptions.FileSeqException` if the
+                 destination can't hold the frames of the sequence
+        """
+        if isinstance(dest, FileSequence):
+            target = dest.copy()
+        else:
+            dest = utils.asString(dest)
+            if os.path.isdir(dest) or dest.endswith(('/', '\\')):
+                dest = os.path.join(dest, self.format('{basename}{padding}{extension}'))
+            target = FileSequence(dest)
+
+        if self._frameSet and self._zfill and not target.zfill():
+            msg = 'destination {0} has no frame padding for the frames of {1}'
+            raise FileSeqException(msg.format(dest, self))
+
+        pairs = self._frameMapping(renumber)
+        if pairs == [(None, None)]:
+            return target, [(str(self), str(target))]
+
+        target.setFrameSet(FrameSet._from_sorted(sorted(dst for _, dst in pairs)))
+        return target, [(self.frame(src), target.frame(dst)) for src, dst in pairs]
+
+    def copyTo(self, dest, workers=1, renumber=None, resume=False, progress=None):
+        """
+        Copy the frames of the sequence to a new location, returning the
+        copied :class:`FileSequence`.
+
+        ``dest`` can be a directory, where the frames keep their names, or a
+        sequence pattern such as ``/delivery/shot_v001.#.exr``, whose frame
+        range is ignored. Missing destination directories are created.
+
+        The frames are copied concurrently by a pool of ``workers`` threads.
+        Each frame is transferred within the kernel where the platform allows
+        it, and is renamed into place once complete. With ``resume``, frames
+        whose destination already exists with the same size are skipped, so
+        that an interrupted copy can be run again.
+
+        If given, ``progress`` is called in the calling thread as each frame
+        completes, with the arguments ``(src, dst, nbytes)``. ``nbytes`` is 0
+        for a skipped frame.
+
+        Example::
+            seq.copyTo('/delivery/shot_v001.#.exr', workers=16, renumber=1000)
+
+        :param dest: the destination directory or sequence pattern
+        :type workers: int
+        :param workers: the number of frames to copy at once
+        :param renumber: an int offset added to every frame, or a mapping
+                         of source to destination frames
+        :type resume: bool
+        :param resume: if True, skip frames already copied
+        :type progress: callable
+        :param progress: optional callback for each completed frame
+        :rtype: :class:`FileSequence`
+        :raises: :class:`fileseq.exceptions.FileSeqException` if the frames
+                 can't be mapped to the destination, or the frame range is
+                 open-ended
+        """
+        self._checkBounded('copy')
+        target, pairs = self._transferPlan(dest, renumber)
+        utils.makeDirs(target.dirname())
+
+        def _copy(pair):
+            src, dst = pair
+            if resume:
+                srcStat, dstStat = utils._stat(src), utils._stat(dst)
+                if srcStat is not None and dstStat is not None \
+                        and srcStat.st_size == dstStat.st_size:
+                    return src, dst, 0
+            return src, dst, utils.copyFile(src, dst)
+
+        for src, dst, nbytes in utils.threadImap(_copy, pairs, workers):
+            if progress is not None:
+                progress(src, dst, nbytes)
+
+        return target
+
+    def moveTo(self, dest, workers=1, renumber=None, progress=None):
+        """
+        Move the frames of the sequence to a new location, returning the
+        moved :class:`FileSequence`.
+
+        The frames are renamed concurrently by a pool of ``workers`` threads,
+        falling back to a copy for moves across filesystems. See
+        :meth:`copyTo` for the ``dest``, ``renumber`` and ``progress``
+        arguments. ``nbytes`` is 0 for a frame that was renamed.
+
+        The destination may overlap the frames of the sequence itself, in
+        which case the overlapping frames are first moved aside, so that no
+        frame is overwritten before it has been moved.
+
+        :param dest: the destination directory or sequence pattern
+        :type workers: int
+        :param workers: the number of frames to move at once
+        :param renumber: an int offset added to every frame, or a mapping
+                         of source to destination frames
+        :type progress: callable
+        :param progress: optional callback for each completed frame
+        :rtype: :class:`FileSequence`
+        :raises: :class:`fileseq.exceptions.FileSeqException` if the frames
+                 can't be mapped to the destination, or the frame range is
+                 open-ended
+        """
+        self._checkBounded('move')
+        target, pairs = self._transferPlan(dest, renumber)
+        utils.makeDirs(target.dirname())
+        self._moveFrames(pairs, workers, progress)
+        return target
+
+    def renumber(self, renumber, workers=1, progress=None):
+        """
+        Renumber the frames of the sequence on disk, in place, returning the
+        renumbered :class:`FileSequence`.
+
+        Example::
+            seq = findSequenceOnDisk('/path/to/shot.1-240#.exr')
+            seq.renumber(1000)
+            # <FileSequence: '/path/to/shot.1001-1240#.exr'>
+            seq.renumber({1: 2, 2: 1})
+            # swaps the first two frames
+
+        The source and target frames can overlap (i.e. shifting 1-240 by 10):
+        the frames that would be overwritten are first renamed aside into a
+        hidden temporary name, and everything else is renamed directly.
+        The renames run concurrently in a pool of ``workers`` threads.
+
+        If given, ``progress`` is called as each frame is renamed, with the
+        arguments ``(src, dst, nbytes)``. See :meth:`moveTo`.
+
+        :param renumber: an int offset added to every frame, or a mapping
+                         of source to destination frames
+        :type workers: int
+        :param workers: the number of frames to rename at once
+        :type progress: callable
+        :param progress: optional callback for each renamed frame
+        :rtype: :class:`FileSequence`
+        :raises: :class:`fileseq.exceptions.FileSeqException` if several
+                 frames are renumbered to the same frame, if a target frame
+                 already exists on disk without being part of the sequence,
+                 or if the frame range is open-ended
+        """
+        self._checkBounded('renumber')
+        target, pairs = self._transferPlan(self, renumber)
+
+        # refuse to clobber files that aren't frames of this sequence,
+        # checked against a single listing of the directory
+        dirpath = self.dirname() or os.curdir
+        try:
+            names = set(os.listdir(dirpath))
+        except OSError:
+            names = set()
+        sources = set(os.path.normpath(src) for src, _ in pairs)
+        for _, dst in pairs:
+            if os.path.basename(dst) in names and os.path.normpath(dst) not in sources:
+                msg = 'renumbering {0} would overwrite {1}'
+                raise FileSeqException(msg.format(self, dst))
+
+        self._moveFrames(pairs, workers, progress)
+        return target
+
+    @staticmethod
+    def _moveFrames(pairs, workers=1, progress=None):
+        """
+        Move each (src, dst) pair of paths, without ever overwriting a
+        source that has yet to be moved.
+
+        The sources that are also the destination of another pair are first
+        moved to a temporary name beside them, while all other pairs are
+        moved directly. Once nothing remains at their destinations, the
+        temporary files are moved into place. Each stage runs concurrently.
+
+        :type pairs: list
+        :type workers: int
+        :type progress: callable
+        """
+        _norm = os.path.normpath
+        pairs = [(src, dst) for src, dst in pairs if _norm(src) != _norm(dst)]
+        sources = set(_norm(src) for src, _ in pairs)
+        token = binascii.hexlify(os.urandom(8))
+
+        direct, aside, into = [], [], []
+        for src, dst in pairs:
+            if _norm(dst) not in sources:
+                direct.append((src, dst, (src, dst)))
+                continue
+            head, tail = os.path.split(src)
+            tmp = os.path.join(head, '.{0}.{1}.tmp'.format(tail, token))
+            aside.append((src, tmp, None))
+            into.append((tmp, dst, (src, dst)))
+
+        def _move(item):
+            src, dst, report = item
+            return report, utils.moveFile(src, dst)
+
+        for stage in (direct + aside, into):
+            for report, nbytes in utils.threadImap(_move, stage, workers):
+                if report is not None and progress is not None:
+                    progress(report[0], report[1], nbytes)
+
+    def checksums(self, algorithm='sha1', workers=1, cache=None):
+        """
+        Hash the contents of every frame of the sequence, returning a
+        :class:`Checksums` of ``(frames, digest)``.
+
+        ``frames`` maps each frame number to the hex digest of its file
+        (a sequence with no frame pattern uses None as its single key), and
+        ``digest`` is the hex digest of the frame digests in frame order.
+        The sequence digest only depends on the contents of the frames, so a
+        copy of the sequence that was renumbered or renamed has the same one.
+
+        Frames are hashed concurrently by a pool of ``workers`` threads,
+        memory-mapping the large ones. See :func:`fileseq.utils.hashFile`.
+
+        If ``cache`` is given, frames whose path, size and modification time
+        are unchanged since they were last hashed are not read again. It can
+        be the filename of a ``shelve`` database, which is created if needed,
+        or an open mapping to share between calls.
+
+        Example::
+            sums = seq.checksums('md5', workers=8, cache='/var/cache/delivery.db')
+            sums.frames[1001]
+            # 'd41d8cd98f00b204e9800998ecf8427e'
+
+        :type algorithm: str
+        :param algorithm: the name of a ``hashlib`` algorithm
+        :type workers: int
+        :param workers: the number of frames to hash at once
+        :param cache: optional filename or mapping of previously hashed frames
+        :rtype: :class:`Checksums`
+        :raises: ValueError if the algorithm is not supported
+                 :class:`fileseq.exceptions.FileSeqException` if a frame is
+                 missing, or the frame range is open-ended
+        """
+        import hashlib
+        # fail early on an unknown algorithm
+        hashlib.new(algorithm)
+        self._checkBounded('checksum')
+
+        if not self._frameSet or not self._zfill:
+            paths = [(None, str(self))]
+        else:
+            paths = [(frame, self.frame(frame)) for frame in self._frameSet]
+
+        store = cache
+        if isinstance(cache, basestring):
+            import shelve
+            store = shelve.open(cache)
+
+        try:
+            frames = {}
+            todo = []
+            for frame, path in paths:
+                st = utils._stat(path)
+                if st is None:
+                    msg = 'cannot checksum {0}: no such file'
+                    raise FileSeqException(msg.format(path))
+                key = None
+                if store is not None:
+                    key = '{0}:{1}'.format(algorithm, os.path.abspath(path))
+                    if isinstance(key, unicode):
+                        key = key.encode('utf-8')
+                    cached = store.get(key)
+                    if cached and cached[:2] == (st.st_size, st.st_mtime):
+                        frames[frame] = cached[2]
+                        continue
+                todo.append((frame, path, key, (st.st_size, st.st_mtime)))
+
+            def _hash(item):
+                frame, path, key, stamp = item
+                return frame, key, stamp, utils.hashFile(path, algorithm)
+
+            for frame, key, stamp, digest in utils.threadImap(_hash, todo, workers):
+                frames[frame] = digest
+                if store is not None:
+                    store[key] = stamp + (digest,)
+        finally:
+            if store is not cache:
+                store.close()
+
+        total = hashlib.new(algorithm)
+        for frame, _ in paths:
+            total.update(frames[frame])
+
+        return Checksums(frames, total.hexdigest())
+
+    def remove(self, frames=None, workers=1, dry_run=False):
+        """
+        Delete the frames of the sequence from disk, returning a
+        :class:`Removal` of ``(removed, missing, elapsed, rate)``.
+
+        ``removed`` and ``missing`` are the :class:`fileseq.frameset.FrameSet`
+        of the frames that were deleted, and of those that didn't exist.
+        ``elapsed`` is the time taken in seconds, and ``rate`` the number of
+        frames handled per second.
+
+        The files are unlinked concurrently by a pool of ``workers`` threads,
+        which hides the latency of network filesystems. An error other than
+        a missing file stops the removal, and is raised.
+
+        With ``dry_run``, nothing is deleted: the directory is listed once to
+        report the frames that would be removed, and those that are missing.
+
+        Example::
+            result = seq.remove(workers=32)
+            print '{0} frames at {1:.0f}/s'.format(len(result.removed), result.rate)
+
+        :param frames: optional subset of the frames to delete, as a
+                       :class:`fileseq.frameset.FrameSet`, frame range or
+                       iterable. Frames outside of the sequence are ignored.
+                       It is required if the frame range of the sequence is
+                       open-ended.
+        :type workers: int
+        :param workers: the number of files to unlink at once
+        :type dry_run: bool
+        :param dry_run: if True, only report what would be removed
+        :rtype: :class:`Removal`
+        :raises: :class:`fileseq.exceptions.FileSeqException` if the
+                 sequence has no frame pattern, or if no frames are given
+                 for an open-ended frame range
+        """
+        if not self._frameSet or not self._zfill:
+            msg = 'cannot remove frames of {0}: it has no frame pattern'
+            raise FileSeqException(msg.format(self))
+
+        if frames is None:
+            self._checkBounded('remove every frame of')
+            targets = list(self._frameSet)
+        else:
+            if not isinstance(frames, FrameSet):
+                frames = FrameSet(frames)
+            if frames.is_open:
+                msg = 'cannot remove the open-ended frames {0} of {1}'
+                raise FileSeqException(msg.format(frames, self))
+            frameSet = self._frameSet
+            if not frameSet.is_open:
+                frameSet = frameSet.items
+            targets = [f for f in frames if f in frameSet]
+
+        start = time.time()
+
+        if dry_run:
+            existing = self.existingFrames().items
+            found = set(f for f in targets if f in existing)
+        else:
+            def _unlink(frame):
+                try:
+                    os.remove(self.frame(frame))
+                except OSError as err:
+                    if err.errno != errno.ENOENT:
+                        raise
+                    return frame, False
+                return frame, True
+
+            found = set(frame for frame, ok in utils.threadImap(_unlink, targets, workers) if ok)
+
+        elapsed = time.time() - start
+        rate = len(targets) / elapsed if elapsed > 0 else 0.0
+
+        return Removal(
+            FrameSet([f for f in targets if f in found]),
+            FrameSet([f for f in targets if f not in found]),
+            elapsed,
+            rate)
+
     def index(self, idx):
         """
         Return the path to the file at the given index.
@@ -362,6 +995,32 @@ class FileSequence(object):
         for f in self._frameSet:
             yield self.frame(f)
 
+    def iterBatches(self, size):
+        """
+        Iterate over the paths of the sequence in tuples of ``size`` paths,
+        the last of which may be shorter, in the same order as iterating
+        over the sequence. The paths of each batch are formatted together
+        from a batch of the frame set.
+
+        :type size: int
+        :param size: the number of paths in each batch
+        :rtype: generator of tuple
+        :raises: :class:`ValueError` if size is less than 1
+        """
+        size = int(size)
+        if size < 1:
+            raise ValueError('Batch size must be at least 1, got {0}'.format(size))
+        if not self._frameSet or not self._zfill:
+            # batches of the same paths as __iter__
+            paths = iter(self)
+            return iter(lambda: tuple(islice(paths, size)), ())
+        batches = self._frameSet.iterBatches(size)
+        # formats the same padded path as frame(), for a whole batch at once
+        fmt = '{0}%0{1}d{2}'.format(
+            (self._dir + self._base).replace('%', '%%'), self._zfill,
+            self._ext.replace('%', '%%'))
+        return (tuple(map(fmt.__mod__, batch)) for batch in batches)
+
     def __getitem__(self, idx):
         """
         Allows indexing and slicing into the underlying :class:`fileseq.FrameSet`.
@@ -429,56 +1088,194 @@ class FileSequence(object):
         return str(self) != str(other)
 
     @staticmethod
-    def yield_sequences_in_list(paths):
+    def yield_sequences_in_list(paths, presorted=False, splitPadding=False):
         """
         Yield the discrete sequences within paths.  This does not try to
         determine if the files actually exist on disk, it assumes you already
         know that.
 
+        If the paths are known to be sorted in plain string order (i.e. the
+        output of ``LC_ALL=C sort``, or a sorted database cursor), set
+        ``presorted`` to True to stream the results: each sequence is yielded
+        as soon as no later path can belong to it, so that memory use is
+        bounded by the largest sequence rather than the whole list.
+
+        By default, the files of a sequence that use different frame padding
+        (``foo.01.exr``, ``foo.0001.exr``) are merged into a single sequence
+        with the smallest padding. If ``splitPadding`` is True, one sequence
+        is yielded for each width of frame number instead, as if each width
+        had been found with ``strictPadding``.
+
         :param paths: a list of paths
+        :type presorted: bool
+        :param presorted: if True, the paths are sorted and results are streamed
+        :type splitPadding: bool
+        :param splitPadding: if True, yield a sequence for each frame padding
         :rtype: generator
+        :raises: :class:`fileseq.exceptions.FileSeqException` if presorted
+                 and the paths are not sorted
         """
         seqs = {}
-        _check = DISK_RE.match
+        _split = utils.splitDiskPath
+        _build = FileSequence._buildSequences
+
+        # with sorted paths, the paths of a sequence are all prefixed by
+        # its dirname and basename. Once a path no longer starts with a
+        # prefix, nothing that follows can belong to its sequences.
+        prefixes = {}
+        last = None
 
-        for match in ifilter(None, imap(_check, imap(utils.asString, paths))):
-            dirname, basename, frame, ext = match.groups()
+        if instrument.ENABLED:
+            paths = instrument.counted('grouping.paths', paths)
+
+        for path in imap(utils.asString, paths):
+            parts = _split(path)
+            if not parts:
+                continue
+            dirname, basename, frame, ext = parts
             if not basename and not ext:
                 continue
             key = (dirname, basename, ext)
-            seqs.setdefault(key, set())
+
+            if presorted:
+                if last is not None and path < last:
+                    msg = 'paths are not sorted: {0!r} follows {1!r}'
+                    raise FileSeqException(msg.format(path, last))
+                last = path
+
+                done = [p for p in prefixes if not path.startswith(p)]
+                for prefix in done:
+                    for doneKey in prefixes.pop(prefix):
+                        for seq in _build(*(doneKey + (seqs.pop(doneKey), splitPadding))):
+                            yield seq
+
+                if key not in seqs:
+                    prefixes.setdefault(dirname + basename, []).append(key)
+
+            # frames are bucketed by their padding width as they are found,
+            # so that each frame is only kept as an integer
+            widths = seqs.setdefault(key, {})
             if frame:
-                seqs[key].add(frame)
+                width = len(frame)
+                if width not in widths:
+                    widths[width] = set()
+                widths[width].add(int(frame))
 
         for (dirname, basename, ext), frames in seqs.iteritems():
-            # build the FileSequence behind the scenes, rather than dupe work
-            seq = FileSequence.__new__(FileSequence)
-            seq._dir = dirname or ''
-            seq._base = basename or ''
-            seq._ext = ext or ''
-            if frames:
-                seq._frameSet = FrameSet(set(imap(int, frames))) if frames else None
-                seq._pad = FileSequence.getPaddingChars(min(imap(len, frames)))
+            for seq in _build(dirname, basename, ext, frames, splitPadding):
+                yield seq
+
+    @staticmethod
+    def _buildSequences(dirname, basename, ext, frames, splitPadding=False):
+        """
+        Yield the sequences of grouped frames: a single sequence, or one
+        sequence per frame padding width if ``splitPadding`` is True.
+
+        See :meth:`_buildSequence`
+
+        :type splitPadding: bool
+        :rtype: generator
+        """
+        if instrument.ENABLED:
+            instrument.count('grouping.sequences', len(frames) if splitPadding and frames else 1)
+
+        if not splitPadding or len(frames) <= 1:
+            yield FileSequence._buildSequence(dirname, basename, ext, frames)
+            return
+        for width in sorted(frames):
+            yield FileSequence._buildSequence(
+                dirname, basename, ext, {width: frames[width]})
+
+    @staticmethod
+    def _buildSequence(dirname, basename, ext, frames):
+        """
+        Build a :class:`FileSequence` from its already parsed components,
+        rather than formatting and parsing a sequence string.
+
+        :type dirname: str
+        :type basename: str
+        :type ext: str
+        :type frames: dict
+        :param frames: the integer frames found in the file names, keyed
+                       by the width of their frame number
+        :rtype: :class:`FileSequence`
+        """
+        seq = FileSequence.__new__(FileSequence)
+        seq._dir = dirname or ''
+        seq._base = basename or ''
+        seq._ext = ext or ''
+        if frames:
+            if len(frames) == 1:
+                items = next(frames.itervalues())
             else:
-                seq._frameSet = None
-                seq._pad = ''
-            seq.__init__(str(seq))
-            yield seq
+                items = set().union(*frames.itervalues())
+            seq._frameSet = FrameSet._from_sorted(sorted(items))
+            seq._pad = FileSequence.getPaddingChars(min(frames))
+        else:
+            seq._frameSet = None
+            seq._pad = ''
+        seq.__init__(str(seq))
+        return seq
 
     @staticmethod
-    def findSequencesInList(paths):
+    def findSequencesInList(paths, workers=1, splitPadding=False):
         """
         Returns the list of discrete sequences within paths.  This does not try
         to determine if the files actually exist on disk, it assumes you
         already know that.
 
+        For very large lists, ``workers`` can be set to group the paths in a
+        pool of processes. The paths are sharded by their directory, so that
+        every sequence is grouped entirely within one shard, and the results
+        are the same sequences as the serial grouping (though not necessarily
+        in the same order).
+
+        .. note::
+            On platforms that spawn rather than fork new processes (Windows),
+            the calling script must be guarded by ``if __name__ == '__main__'``
+
         :param paths: a list of paths
+        :type workers: int
+        :param workers: the number of processes used to group the paths
+        :type splitPadding: bool
+        :param splitPadding: if True, return a sequence for each frame padding.
+                             See :meth:`yield_sequences_in_list`
         :rtype: list
         """
-        return list(FileSequence.yield_sequences_in_list(paths))
+        if workers <= 1:
+            return list(FileSequence.yield_sequences_in_list(
+                paths, splitPadding=splitPadding))
+
+        # a few shards per worker helps to balance uneven directories
+        numShards = workers * 4
+        shards = [[] for _ in xrange(numShards)]
+
+        for path in imap(utils.asString, paths):
+            # shard by the dirname, as parsed by DISK_RE
+            idx = max(path.rfind('/'), path.rfind('\\'))
+            shards[hash(path[:idx + 1]) % numShards].append(path)
+
+        shards = [shard for shard in shards if shard]
+        if len(shards) <= 1:
+            return list(FileSequence.yield_sequences_in_list(
+                shards[0] if shards else [], splitPadding=splitPadding))
+
+        # only the opt-in sharded path needs processes
+        import multiprocessing
+        pool = multiprocessing.Pool(min(workers, len(shards)))
+        try:
+            results = []
+            jobs = [(shard, splitPadding) for shard in shards]
+            for seqs in pool.imap_unordered(_findSequencesInShard, jobs):
+                results.extend(seqs)
+            return results
+        finally:
+            pool.close()
+            pool.join()
 
     @classmethod
-    def findSequencesOnDisk(cls, pattern, include_hidden=False, strictPadding=False):
+    def findSequencesOnDisk(cls, pattern, include_hidden=False, strictPadding=False,
+                            stats=False, workers=1, splitPadding=False):
         """
         Yield the sequences found in the given directory.
         
@@ -496,75 +1293,269 @@ class FileSequence(object):
         Example::
             findSequencesOnDisk('/path/to/files/image_stereo_{left,right}.#.jpg')
             findSequencesOnDisk('/path/to/files/imag?_*_{left,right}.@@@.jpg', strictPadding=True)
+
+        A list of patterns can also be given, in which case a dictionary
+        mapping each pattern to its list of sequences is returned. Each
+        directory is only listed once, and its files are dispatched to the
+        patterns through a single combined matcher. A file can belong to
+        more than one pattern.
+
+        Example::
+            findSequencesOnDisk(['/path/to/files/beauty.#.exr',
+                                 '/path/to/files/depth.#.exr'])
+
+        If ``stats`` is True, the size and modification time of every frame is
+        gathered during the scan and attached to each sequence. See
+        :meth:`frameStats`, :meth:`totalSize`, :meth:`undersizedFrames`,
+        :meth:`oldestFrame` and :meth:`newestFrame`. The stat calls can be
+        spread across a pool of ``workers`` threads, which helps on network
+        filesystems.
+
+        Example::
+            seqs = findSequencesOnDisk('/path/to/files', stats=True, workers=16)
+            empty = [s for s in seqs if s.undersizedFrames()]
+
+        If ``splitPadding`` is True, the files of a sequence that use different
+        frame padding are returned as one sequence per padding, from a single
+        scan of the directory.
+
+        Example::
+            findSequencesOnDisk('/path/to/files/seq.*.ext', splitPadding=True)
+            # ['/path/to/files/seq.1-5@@.ext', '/path/to/files/seq.1-5#.ext']
         
-        :param pattern: directory to scan, or pattern to filter in directory
+        :param pattern: directory to scan, or pattern to filter in directory,
+                        or a list of them
         :type include_hidden: bool
         :param include_hidden: if true, show .hidden files as well
         :type strictPadding: bool
         :param strictPadding: if True, ignore files with padding length different from pattern
-        :rtype: list
-        """
+        :type stats: bool
+        :param stats: if True, gather the size and mtime of each frame
+        :type workers: int
+        :param workers: the number of threads used to gather stats
+        :type splitPadding: bool
+        :param splitPadding: if True, return a sequence for each frame padding
+        :rtype: list, or dict if a list of patterns was given
+        :raises: :class:`fileseq.exceptions.FileSeqException` if a pattern is invalid
+        """
+        if not isinstance(pattern, basestring) and hasattr(pattern, '__iter__'):
+            return cls._findSequencesOnDiskMulti(
+                pattern, include_hidden, strictPadding, stats, workers, splitPadding)
+
         # reserve some functions we're going to need quick access to
         _not_hidden = lambda f: not f.startswith('.')
         _match_pattern = None
         _filter_padding = None
-        _join = os.path.join
 
-        dirpath, filepat = pattern, None
+        parsed = cls._parseDiskPattern(pattern, strictPadding)
+        if parsed is None:
+            return []
+
+        dirpath, regex, padNum = parsed
 
         # Support the pattern defining a filter for the files
         # in the existing directory
-        if not os.path.isdir(pattern):
-            dirpath, filepat = os.path.split(pattern)
-
-            if not os.path.isdir(dirpath):
-                return []
-
-            # Start building a regex for filtering files
-            seq = cls(filepat)
-            patt = seq.basename().replace('.', r'\.')
-            if seq.padding():
-                patt += '\d+'
-            if seq.extension():
-                patt += seq.extension()
-
-            # Convert braces groups into regex capture groups
-            view = bytearray(patt)
-            matches = re.finditer(r'{(.*?)(?:,(.*?))*}', patt)
-            for match in reversed(list(matches)):
-                i, j = match.span()
-                view[i:j] = '(%s)' % '|'.join([m.strip() for m in match.groups()])
-            view = view.replace('*', '.*')
-            view = view.replace('?', '.')
-            view += '$'
-            try:
-                _match_pattern = re.compile(str(view)).match
-            except re.error:
-                msg = 'Invalid file pattern: {}'.format(filepat)
-                raise FileSeqException(msg)
+        if regex is not None:
+            _match_pattern = regex.match
 
-            if seq.padding() and strictPadding:
-                _filter_padding = functools.partial(cls._filterByPaddingNum, num=seq.zfill())
+        if padNum is not None:
+            _filter_padding = functools.partial(cls._hasPaddingNum, num=padNum)
 
-        # Get just the immediate files under the dir.
-        # Avoids testing the os.listdir() for files as
-        # a second step.
-        ret = next(os.walk(dirpath), None)
-        files = ret[-1] if ret else []
-
-        # collapse some generators to get us the files that match our regex
+        # collapse the filters into a single test of each file name,
+        # so that only the matching files need to be stat'd
+        filters = []
         if not include_hidden:
-            files = ifilter(_not_hidden, files)
+            filters.append(_not_hidden)
 
         # Filter by files that match the provided file pattern
         if _match_pattern:
-            files = ifilter(_match_pattern, files)
+            filters.append(_match_pattern)
 
         # Filter by files that match the frame padding in the file pattern
         if _filter_padding:
-            # returns a generator
-            files = _filter_padding(files)
+            filters.append(_filter_padding)
+
+        _match = None
+        if filters:
+            _match = lambda f: all(test(f) for test in filters)
+
+        # Get just the immediate files under the dir.
+        _, files, filestats = utils.listDir(
+            dirpath, match=_match, stats=stats, workers=workers)
+
+        return cls._sequencesInDir(dirpath, files, filestats, splitPadding)
+
+    @classmethod
+    def _findSequencesOnDiskMulti(cls, patterns, include_hidden=False,
+                                  strictPadding=False, stats=False, workers=1,
+                                  splitPadding=False):
+        """
+        Find the sequences on disk for each of a list of patterns, listing
+        each directory only once.
+
+        See :meth:`findSequencesOnDisk`
+
+        :type patterns: list
+        :rtype: dict
+        """
+        results = {}
+        byDir = {}
+
+        for pattern in patterns:
+            results[pattern] = []
+            parsed = cls._parseDiskPattern(pattern, strictPadding)
+            if parsed is None:
+                continue
+            dirpath, regex, padNum = parsed
+            patt = '.*' if regex is None else regex.pattern
+            byDir.setdefault(dirpath, []).append((pattern, patt, padNum))
+
+        # Python re only supports 100 groups in a single expression
+        chunkSize = 99
+
+        for dirpath, items in byDir.iteritems():
+            # Combine the patterns into optional lookaheads, so that a
+            # single match reports every pattern that a name satisfies
+            matchers = []
+            for i in xrange(0, len(items), chunkSize):
+                chunk = items[i:i + chunkSize]
+                combined = ''.join('(?:(?=({0}))|)'.format(patt) for _, patt, _ in chunk)
+                matchers.append((i, re.compile(combined).match))
+
+            matched = {}
+
+            def _match(name):
+                if not include_hidden and name.startswith('.'):
+                    return False
+                hits = []
+                for offset, matcher in matchers:
+                    groups = matcher(name).groups()
+                    hits.extend(offset + j for j, g in enumerate(groups) if g is not None)
+                if not hits:
+                    return False
+                matched[name] = hits
+                return True
+
+            _, files, filestats = utils.listDir(
+                dirpath, match=_match, stats=stats, workers=workers)
+
+            buckets = [([], [] if stats else None) for item in items]
+            for i, name in enumerate(files):
+                for idx in matched[name]:
+                    padNum = items[idx][2]
+                    if padNum is not None and not cls._hasPaddingNum(name, padNum):
+                        continue
+                    names, nameStats = buckets[idx]
+                    names.append(name)
+                    if stats:
+                        nameStats.append(filestats[i])
+
+            for (pattern, _, _), (names, nameStats) in zip(items, buckets):
+                results[pattern] = cls._sequencesInDir(
+                    dirpath, names, nameStats, splitPadding)
+
+        return results
+
+    @classmethod
+    def _parseDiskPattern(cls, pattern, strictPadding=False):
+        """
+        Split a :meth:`findSequencesOnDisk` pattern into the directory to scan,
+        the compiled regular expression that the file names must match, and
+        the frame padding number that the file names must match.
+
+        The regular expression is None if the pattern is a directory,
+        and the padding number is None unless strictPadding applies.
+
+        :param pattern: directory to scan, or pattern to filter in directory
+        :type strictPadding: bool
+        :rtype: tuple (dirpath, regex, padding number), or None if the
+                directory does not exist
+        :raises: :class:`fileseq.exceptions.FileSeqException` if the pattern is invalid
+        """
+        if os.path.isdir(pattern):
+            return pattern, None, None
+
+        dirpath, filepat = os.path.split(pattern)
+        if not os.path.isdir(dirpath):
+            return None
+
+        regex, zfill = cls._compilePattern(filepat)
+        padNum = zfill if strictPadding else None
+
+        return dirpath, regex, padNum
+
+    @classmethod
+    def compilePattern(cls, pattern):
+        """
+        Compile a file pattern, as accepted by :meth:`findSequencesOnDisk`,
+        into a regular expression that matches the whole of the file names
+        belonging to the pattern. Padding characters match any frame number,
+        and exact frame ranges are not considered.
+
+        The pattern can use the glob-like syntax described in
+        :func:`fileseq.patterns.translate`, including nested brace
+        groups and character classes.
+
+        The compiled regular expressions are cached, so the same pattern
+        can be cheaply compiled again across many directories.
+
+        :Example:
+            >>> rx = FileSequence.compilePattern('beauty_{left,right}.#.exr')
+            >>> filter(rx.match, ['beauty_left.0001.exr', 'beauty_mid.0001.exr'])
+            ['beauty_left.0001.exr']
+
+        :type pattern: str
+        :param pattern: the file name pattern, i.e. beauty.#.exr
+        :rtype: compiled regular expression
+        :raises: :class:`fileseq.exceptions.FileSeqException` if the pattern is invalid
+        """
+        return cls._compilePattern(pattern)[0]
+
+    @classmethod
+    def _compilePattern(cls, pattern):
+        """
+        Compile and cache a file pattern, as per :meth:`compilePattern`.
+
+        :type pattern: str
+        :rtype: tuple (regex, padding number or None if there is no padding)
+        :raises: :class:`fileseq.exceptions.FileSeqException` if the pattern is invalid
+        """
+        key = (cls, pattern)
+        compiled = _PATTERN_CACHE.get(key)
+        if compiled is not None:
+            return compiled
+
+        seq = cls(pattern)
+        patt = patterns.translate(seq.basename())
+        if seq.padding():
+            patt += r'-?\d+'
+        patt += patterns.translate(seq.extension())
+
+        try:
+            regex = re.compile(patt + '$')
+        except re.error:
+            msg = 'Invalid file pattern: {}'.format(pattern)
+            raise FileSeqException(msg)
+
+        compiled = (regex, seq.zfill() if seq.padding() else None)
+        _PATTERN_CACHE.put(key, compiled)
+        return compiled
 
+    @classmethod
+    def _sequencesInDir(cls, dirpath, files, filestats=None, splitPadding=False):
+        """
+        Group the file names found in a directory into sequences.
+
+        :type dirpath: str
+        :type files: list
+        :param files: the file names in the directory
+        :type filestats: list
+        :param filestats: optional ``os.stat`` results aligned with files,
+                          to attach to the sequences
+        :type splitPadding: bool
+        :param splitPadding: if True, return a sequence for each frame padding
+        :rtype: list
+        """
         # Ensure our dirpath ends with a path separator, so
         # that we can control which sep is used during the 
         # os.path.join
@@ -572,10 +1563,74 @@ class FileSequence(object):
         if not dirpath.endswith(sep):
             dirpath += sep
 
-        files = (_join(dirpath, f) for f in files)
-        files = list(files)
+        _join = os.path.join
+        paths = [_join(dirpath, f) for f in files]
 
-        return list(FileSequence.yield_sequences_in_list(files))
+        seqs = list(cls.yield_sequences_in_list(paths, splitPadding=splitPadding))
+        if filestats is not None:
+            cls._attachFrameStats(seqs, paths, filestats, splitPadding)
+        return seqs
+
+    @staticmethod
+    def _attachFrameStats(seqs, paths, filestats, splitPadding=False):
+        """
+        Attach the stats of the given paths to the sequences they were
+        grouped into. All paths are expected to be from the same directory.
+
+        A frame found with several paddings (ie 1, 01 and 001) keeps the
+        stats of the file named with the padding of its sequence, or else
+        of the first one found, and is recorded in
+        :meth:`frameStatCollisions`.
+
+        :type seqs: list
+        :param seqs: the sequences grouped from ``paths``
+        :type paths: list
+        :type filestats: list
+        :param filestats: the ``os.stat`` results aligned with ``paths``
+        :type splitPadding: bool
+        :param splitPadding: if True, the sequences were split by padding
+        """
+        _split = utils.splitDiskPath
+        frameStats = {}
+        collisions = {}
+
+        for path, st in zip(paths, filestats):
+            parts = _split(path)
+            if not parts:
+                continue
+            _, basename, frameStr, ext = parts
+            if st is not None:
+                st = FrameStat(st.st_size, st.st_mtime)
+            key = (basename, ext)
+            if splitPadding:
+                # the same frame number can appear with several paddings
+                key += (len(frameStr) if frameStr else 0,)
+            frame = int(frameStr) if frameStr else None
+            stats = frameStats.setdefault(key, {})
+            if frame in stats:
+                found = collisions.setdefault(key, {})
+                found.setdefault(frame, [stats[frame]]).append((frameStr, st))
+            else:
+                stats[frame] = (frameStr, st)
+
+        for seq in seqs:
+            key = (seq.basename(), seq.extension())
+            if splitPadding:
+                key += (seq.zfill(),)
+            stats = dict((frame, st) for frame, (_, st)
+                         in frameStats.get(key, {}).iteritems())
+            found = collisions.get(key)
+            if found:
+                zfill = seq.zfill()
+                for frame, entries in found.iteritems():
+                    for frameStr, st in entries:
+                        if frameStr == str(frame).zfill(zfill):
+                            stats[frame] = st
+                            break
+                found = dict((frame, tuple(frameStr for frameStr, _ in entries))
+                             for frame, entries in found.iteritems())
+                seq._frameStatCollisions = found
+            seq._frameStats = stats
 
     @classmethod
     def findSequenceOnDisk(cls, pattern, strictPadding=False):
@@ -608,6 +1663,128 @@ class FileSequence(object):
             if os.path.isfile(pattern):
                 return seq
 
+        ext = seq.extension()
+        basename = seq.basename()
+        pad = seq.padding()
+
+        dirpath = os.path.split(utils.asString(pattern))[0]
+
+        # A wildcard directory can only be resolved by globbing
+        if has_magic(dirpath):
+            return cls._globSequenceOnDisk(seq, pattern, strictPadding)
+
+        frames = {}
+        for frame in cls._listFrames(dirpath, basename, ext):
+            width = len(frame)
+            if width not in frames:
+                frames[width] = set()
+            frames[width].add(int(frame))
+
+        if pad and strictPadding:
+            num = seq.zfill()
+            frames = {num: frames[num]} if num in frames else {}
+
+        if not frames:
+            msg = 'no sequence found on disk matching {0}'
+            raise FileSeqException(msg.format(pattern))
+
+        return cls._buildSequence(os.path.join(dirpath, ''), basename, ext, frames)
+
+    @staticmethod
+    def _listFrames(dirpath, basename, ext):
+        """
+        Yield the frame number strings of the files in a directory that
+        belong to the sequence with the given basename and extension,
+        from a single listing of the directory.
+
+        :type dirpath: str
+        :type basename: str
+        :type ext: str
+        :rtype: generator
+        """
+        _match = re.compile(r'{0}(-?\d+){1}$'.format(
+            re.escape(basename), re.escape(ext))).match
+
+        began = instrument.clock() if instrument.ENABLED else None
+
+        try:
+            names = os.listdir(dirpath or os.curdir)
+        except OSError:
+            names = []
+
+        if began is not None:
+            instrument.record('disk.listdir', instrument.clock() - began)
+            instrument.count('disk.entries', len(names))
+
+        for name in names:
+            match = _match(name)
+            if match:
+                yield match.group(1)
+
+    def existingFrames(self):
+        """
+        Return the frames of the sequence that exist on disk.
+
+        The directory of the sequence is listed once, and a frame only counts
+        as existing if its file name has the exact padding of the sequence,
+        as given by :meth:`frame`. This is much cheaper than checking each
+        path of the sequence, especially on network filesystems.
+
+        The frames of an open-ended frame range are bounded by the files
+        found on disk, and returned in ascending order.
+
+        :rtype: :class:`fileseq.frameset.FrameSet` or None
+        :returns: None if the sequence has no frame pattern
+        """
+        if not self._frameSet or not self._zfill:
+            return None
+
+        zfill = self._zfill
+        found = set()
+        for frame in self._listFrames(self._dir, self._base, self._ext):
+            num = int(frame)
+            if str(num).zfill(zfill) == frame:
+                found.add(num)
+
+        if self._frameSet.is_open:
+            return FrameSet([f for f in sorted(found) if f in self._frameSet])
+        return FrameSet([f for f in self._frameSet if f in found])
+
+    def missingOnDisk(self):
+        """
+        Return the frames of the sequence that don't exist on disk.
+        See :meth:`existingFrames`
+
+        An open-ended frame range is bounded by the last of its frames
+        found on disk, so only the gaps up to that frame are missing.
+
+        :rtype: :class:`fileseq.frameset.FrameSet` or None
+        :returns: None if the sequence has no frame pattern
+        """
+        existing = self.existingFrames()
+        if existing is None:
+            return None
+        frameSet = self._frameSet
+        if frameSet.is_open:
+            if not existing:
+                return FrameSet('')
+            frameSet = frameSet - FrameSet('{0}-'.format(existing.end() + 1))
+        items = existing.items
+        return FrameSet([f for f in frameSet if f not in items])
+
+    @classmethod
+    def _globSequenceOnDisk(cls, seq, pattern, strictPadding=False):
+        """
+        Search for a specific sequence on disk by globbing the pattern,
+        and grouping the matches into sequences.
+
+        :type seq: :class:`FileSequence`
+        :param seq: the parsed sequence pattern
+        :param pattern: the sequence pattern being searched for
+        :type strictPadding: bool
+        :rtype: :class:`FileSequence`
+        :raises: :class:`fileseq.exceptions.FileSeqException` if no sequence is found on disk
+        """
         patt = seq.format('{dirname}{basename}*{extension}')
 
         ext = seq.extension()
@@ -632,18 +1809,24 @@ class FileSequence(object):
         Yield only path elements from iterable which have a frame
         padding that matches the given target padding number
         """
-        _check = DISK_RE.match
+        _check = functools.partial(cls._hasPaddingNum, num=num)
 
         for item in iterable:
             # Add a filter for paths that don't match the frame
             # padding of a given number
-            matches = _check(item)
-            if matches:
-                actualNum = len(matches.group(3) or '')
-                if actualNum != num:
-                    continue
-            
-            yield item
+            if _check(item):
+                yield item
+
+    @staticmethod
+    def _hasPaddingNum(path, num):
+        """
+        Return True if the path has a frame padding that matches
+        the given target padding number (or is not a sequence path).
+        """
+        parts = utils.splitDiskPath(path)
+        if parts:
+            return len(parts[2] or '') == num
+        return True
 
     @staticmethod
     def getPaddingChars(num):
@@ -678,3 +1861,16 @@ class FileSequence(object):
             msg += " Supported padding characters: {} or printf syntax padding"
             msg += " %<int>d"
             raise ValueError(msg.format(char, str(PAD_MAP.keys())))
+
+
+def _findSequencesInShard(job):
+    """
+    Group a shard of paths within a worker process.
+    See :meth:`FileSequence.findSequencesInList`
+
+    :type job: tuple
+    :param job: the (paths, splitPadding) of the shard
+    :rtype: list
+    """
+    paths, splitPadding = job
+    return list(FileSequence.yield_sequences_in_list(paths, splitPadding=splitPadding))
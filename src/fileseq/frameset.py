@@ -3,19 +3,49 @@
 frameset - A set-like object representing a frame range for fileseq.
 """
 
+import re
+import sys
+import struct
 import numbers
+import operator
 
+from array import array
 from collections import Set, Sequence
+from functools import partial
+from itertools import chain, count, islice
 
-from fileseq import constants
-from fileseq.constants import PAD_MAP, FRANGE_RE, PAD_RE
+from fileseq import constants, instrument
+from fileseq.constants import PAD_MAP, FRANGE_RE, OPEN_FRANGE_RE, PAD_RE
 from fileseq.exceptions import MaxSizeException, ParseException
-from fileseq.utils import xfrange, unique, pad
+from fileseq.utils import xfrange, unique, pad, gcd, getMaxFrameSize
 
 # Issue #44
 # Possibly use an alternate xrange implementation, depending on platform. 
 from fileseq.utils import xrange
 
+# The estimated bytes used by each frame of a FrameSet: the int object, its
+# slot in the ordered tuple, and its entry in the frozenset's hash table
+# (a hash and a pointer, in a table that is kept well under full)
+_BYTES_PER_FRAME = sys.getsizeof(1 << 20) + struct.calcsize('P') * 5
+
+# The regular expressions that find a run of some number of digits,
+# by number of digits. See FrameSet._isDense
+_DIGIT_RUNS = {}
+
+def _digitRun(number):
+    """
+    Return a regular expression that finds any number of at least as many
+    digits as ``number``.
+
+    :type number: int
+    :rtype: compiled regular expression
+    """
+    digits = len(str(number))
+    if digits not in _DIGIT_RUNS:
+        _DIGIT_RUNS[digits] = re.compile(r'\d{%d}' % digits)
+    return _DIGIT_RUNS[digits]
+
+
 class FrameSet(Set):
     """
     A :class:`FrameSet` is an immutable representation of the ordered, unique
@@ -58,9 +88,27 @@ class FrameSet(Set):
            as both its start and end methods will raise IndexError.  The
            :meth:`is_null`
            property has been added to allow you to guard against this.
+        6. The last part of a frame range can be open-ended (ie "1001-" or
+           "1001-x2"), for every frame from a start onwards. These frames are
+           never materialized: membership, iteration, :meth:`start`, indexing,
+           intersection and subset tests all work lazily, while ``len()``, :meth:`end` and
+           the :attr:`items` and :attr:`order` of an open-ended
+           :class:`FrameSet` raise a ``MaxSizeException``. See :attr:`is_open`.
+           Frames that lead up to or are covered by the open-ended range are
+           folded into it, so ``FrameSet('1-5,3-')`` is ``FrameSet('1-')``.
+        7. Large and dense frame ranges in ascending order, and such results
+           of set operations, are stored by the
+           :class:`fileseq.bitmap.BitmapFrameSet` subclass, which still has the
+           ``repr`` of a :class:`FrameSet`. Test for a frame set with
+           ``isinstance(obj, FrameSet)`` rather than comparing its type. See
+           `fileseq.constants.BITMAP_MIN_FRAMES`.
 
     :type frange: str
     :param frange: the frame range as a string (ie "1-100x5")
+    :type maxSize: int
+    :param maxSize: optional max number of frames, replacing the limit of
+                    :func:`fileseq.utils.maxFrameSize` or
+                    `fileseq.constants.MAX_FRAME_SIZE` for this call
     :rtype: None
     :raises: :class:`fileseq.exceptions.ParseException` if the frame range
              (or a portion of it) could not be parsed.
@@ -68,7 +116,7 @@ class FrameSet(Set):
              `fileseq.constants.MAX_FRAME_SIZE`
     """
 
-    __slots__ = ('_frange', '_items', '_order')
+    __slots__ = ('_frange', '_items', '_order', '_open')
 
     def __new__(cls, *args, **kwargs):
         """
@@ -76,15 +124,20 @@ class FrameSet(Set):
 
         :type frange: str
         :param frange: the frame range as a string (ie "1-100x5")
-        :returns: the :class:`FrameSet` instance
+        :returns: the :class:`FrameSet` instance, which is a
+                  :class:`fileseq.bitmap.BitmapFrameSet` for large and dense
+                  frames in ascending order, see :meth:`_isDense`
         :raises: :class:`fileseq.exceptions.ParseException` if the frame range
                  (or a portion of it) could not be parsed
         """
-        self = super(cls, FrameSet).__new__(cls, *args, **kwargs)
+        if cls is FrameSet and args and FrameSet._isDense(args[0]):
+            from fileseq.bitmap import BitmapFrameSet
+            cls = BitmapFrameSet
+        self = super(FrameSet, cls).__new__(cls)
         return self
 
 
-    def __init__(self, frange):        
+    def __init__(self, frange, maxSize=None):
         # if the user provides anything but a string, short-circuit the build
         if not isinstance(frange, basestring):
             # if it's apparently a FrameSet already, short-circuit the build
@@ -94,21 +147,27 @@ class FrameSet(Set):
                 return
             # if it's inherently disordered, sort and build
             elif isinstance(frange, Set):
-                self._maxSizeCheck(frange)
+                self._maxSizeCheck(frange, maxSize)
+                self._open = None
                 self._items = frozenset(map(int, frange))
                 self._order = tuple(sorted(self._items))
                 self._frange = FrameSet.framesToFrameRange(
                     self._order, sort=False, compress=False)
+                if instrument.ENABLED:
+                    instrument.count('FrameSet.frames', len(self._order))
                 return
             # if it's ordered, find unique and build
             elif isinstance(frange, Sequence):
-                self._maxSizeCheck(frange)
+                self._maxSizeCheck(frange, maxSize)
+                self._open = None
                 items = set()
                 order = unique(items, map(int, frange))
                 self._order = tuple(order)
                 self._items = frozenset(items)
                 self._frange = FrameSet.framesToFrameRange(
                     self._order, sort=False, compress=False)
+                if instrument.ENABLED:
+                    instrument.count('FrameSet.frames', len(self._order))
                 return
             # in all other cases, cast to a string
             else:
@@ -121,6 +180,7 @@ class FrameSet(Set):
         # we're willing to trim padding characters from consideration
         # this translation is orders of magnitude faster than prior method
         self._frange = str(frange).translate(None, ''.join(PAD_MAP.keys()))
+        self._open = None
 
         # because we're acting like a set, we need to support the empty set
         if not self._frange:
@@ -128,23 +188,47 @@ class FrameSet(Set):
             self._order = tuple()
             return
 
+        began = instrument.clock() if instrument.ENABLED else None
+
         # build the mutable stores, then cast to immutable for storage
         items = set()
         order = []
 
-        maxSize = constants.MAX_FRAME_SIZE 
+        if maxSize is None:
+            maxSize = getMaxFrameSize()
+
+        # the most frames allowed by maxSize and the MAX_FRAME_MEMORY budget,
+        # so that the parts are checked with a plain comparison
+        limit = maxSize
+        budget = constants.MAX_FRAME_MEMORY
+        if budget is not None:
+            limit = min(limit, budget // _BYTES_PER_FRAME)
 
         for part in self._frange.split(","):
             # this is to deal with leading / trailing commas
             if not part:
                 continue
+            # nothing can follow the frames of an open-ended part
+            if self._open is not None:
+                msg = 'Could not parse "{0}": only the last part can be open-ended'
+                raise ParseException(msg.format(self._frange))
+            # handle open-ended frames (1001-), without building them
+            if part[-1] == '-' or '-x' in part:
+                self._open = FrameSet._parse_open_part(part)
+                if self._open is not None:
+                    continue
             # parse the partial range
             start, end, modifier, chunk = FrameSet._parse_frange_part(part)
+            # reject a huge range before any of its frames are materialized
+            size = FrameSet._partSize(start, end, modifier, chunk)
+            if size > limit:
+                self._maxSizeCheck(size, maxSize)
             # handle batched frames (1-100x5)
             if modifier == 'x':
                 frames = xfrange(start, end, chunk, maxSize=maxSize)
                 frames = [f for f in frames if f not in items]
-                self._maxSizeCheck(len(frames) + len(items))
+                if len(frames) + len(items) > limit:
+                    self._maxSizeCheck(len(frames) + len(items), maxSize)
                 order.extend(frames)
                 items.update(frames)
             # handle staggered frames (1-100:5)
@@ -152,7 +236,8 @@ class FrameSet(Set):
                 for stagger in xrange(chunk, 0, -1):
                     frames = xfrange(start, end, stagger, maxSize=maxSize)
                     frames = [f for f in frames if f not in items]
-                    self._maxSizeCheck(len(frames) + len(items))
+                    if len(frames) + len(items) > limit:
+                        self._maxSizeCheck(len(frames) + len(items), maxSize)
                     order.extend(frames)
                     items.update(frames)
             # handle filled frames (1-100y5)
@@ -161,22 +246,35 @@ class FrameSet(Set):
                 frames = xfrange(start, end, 1, maxSize=maxSize)
                 frames = (f for f in frames if f not in not_good)
                 frames = [f for f in frames if f not in items]
-                self._maxSizeCheck(len(frames) + len(items))
+                if len(frames) + len(items) > limit:
+                    self._maxSizeCheck(len(frames) + len(items), maxSize)
                 order.extend(frames)
                 items.update(frames)
             # handle full ranges and single frames
             else:
                 frames = xfrange(start, end, 1 if start < end else -1, maxSize=maxSize)
                 frames = [f for f in frames if f not in items]
-                self._maxSizeCheck(len(frames) + len(items))
+                if len(frames) + len(items) > limit:
+                    self._maxSizeCheck(len(frames) + len(items), maxSize)
                 order.extend(frames)
                 items.update(frames)
 
+        if self._open is not None:
+            folded, tail = FrameSet._foldTail(order, self._open)
+            if tail != self._open or len(folded) != len(order):
+                order = items = folded
+                self._open = tail
+                self._frange = FrameSet._buildOpenRange(order, tail)
+
         # lock the results into immutable internals
         # this allows for hashing and fast equality checking
         self._items = frozenset(items)
         self._order = tuple(order)
 
+        if began is not None:
+            instrument.record('FrameSet.parse', instrument.clock() - began)
+            instrument.count('FrameSet.frames', len(self._order))
+
     @property
     def is_null(self):
         """
@@ -185,7 +283,17 @@ class FrameSet(Set):
 
         :rtype: bool
         """
-        return not (self._frange and self._items and self._order)
+        return not (self._frange and (self._open or self._items and self._order))
+
+    @property
+    def is_open(self):
+        """
+        Read-only access to determine if the :class:`FrameSet` ends with an
+        open-ended range (ie "1001-"), and so holds an unbounded number of frames.
+
+        :rtype: bool
+        """
+        return self._open is not None
 
     @property
     def frange(self):
@@ -202,7 +310,11 @@ class FrameSet(Set):
         Read-only access to the unique frames that form this :class:`FrameSet`.
 
         :rtype: frozenset
+        :raises: :class:`fileseq.exceptions.MaxSizeException` if the
+                 :class:`FrameSet` is open-ended
         """
+        if self._open is not None:
+            self._unbounded('items')
         return self._items
 
     @property
@@ -211,19 +323,198 @@ class FrameSet(Set):
         Read-only access to the ordered frames that form this :class:`FrameSet`.
 
         :rtype: tuple
+        :raises: :class:`fileseq.exceptions.MaxSizeException` if the
+                 :class:`FrameSet` is open-ended
         """
+        if self._open is not None:
+            self._unbounded('order')
         return self._order
 
     @classmethod
-    def from_iterable(cls, frames, sort=False):
+    def from_iterable(cls, frames, sort=False, maxSize=None):
         """
         Build a :class:`FrameSet` from an iterable of frames.
 
         :param frames: an iterable object containing frames as integers
         :param sort: True to sort frames before creation, default is False
+        :param maxSize: optional max number of frames, see :class:`FrameSet`
+        :rtype: :class:`FrameSet`
+        """
+        return FrameSet(sorted(frames) if sort else frames, maxSize)
+
+    @classmethod
+    def fromBuffer(cls, buf, typecode='l', maxSize=None):
+        """
+        Build a :class:`FrameSet` from a buffer of packed integer frames,
+        such as an ``array.array``, a string of bytes, an ``mmap`` or a
+        NumPy array. The frames keep their order, and duplicates are dropped.
+
+        :Example:
+            >>> FrameSet.fromBuffer(array('l', [1, 2, 3, 10]))
+            FrameSet("1-3,10")
+
+        :param buf: an ``array.array``, or an object supporting the buffer
+                    interface
+        :type typecode: str
+        :param typecode: the ``array`` type code of the packed frames
+        :param maxSize: optional max number of frames, see :class:`FrameSet`
+        :rtype: :class:`FrameSet`
+        :raises: :class:`ValueError` if the buffer size is not a multiple
+                 of the size of the frames
+        """
+        if isinstance(buf, array):
+            frames = buf
+        else:
+            if isinstance(buf, memoryview):
+                buf = buf.tobytes()
+            frames = array(typecode)
+            frames.fromstring(buffer(buf))
+        return cls(frames.tolist(), maxSize)
+
+    def toArray(self, typecode='l'):
+        """
+        Return the ordered frames as an ``array.array``, which packs them
+        into a compact buffer that can be handed to NumPy, ``struct`` or
+        file writes.
+
+        The default ``'l'`` type code holds 64 bit frames on 64 bit Linux
+        and macOS. Python 2 has no ``'q'`` type code.
+
+        :Example:
+            >>> FrameSet('1-3,10').toArray()
+            array('l', [1, 2, 3, 10])
+
+        :type typecode: str
+        :param typecode: the ``array`` type code of the frames
+        :rtype: array.array
+        :raises: :class:`OverflowError` if a frame does not fit the type code
+                 :class:`fileseq.exceptions.MaxSizeException` if the
+                 :class:`FrameSet` is open-ended
+        """
+        return array(typecode, self.order)
+
+    @classmethod
+    def _from_sorted(cls, frames, tail=None):
+        """
+        Build a :class:`FrameSet` directly from unique integer frames that
+        are already sorted, skipping the casting, sorting and de-duplication
+        done when constructing from a collection.
+
+        :param frames: a sorted sequence of unique integer frames
+        :type tail: tuple
+        :param tail: optional ``(start, step)`` of an open-ended range that
+                     follows the frames. Frames that it covers are folded
+                     into it, see :meth:`_foldTail`
         :rtype: :class:`FrameSet`
+        :raises: :class:`fileseq.exceptions.MaxSizeException` if the frames
+                 exceed `fileseq.constants.MAX_FRAME_SIZE`
+        """
+        if tail is not None:
+            frames, tail = FrameSet._foldTail(frames, tail)
+        cls._maxSizeCheck(frames)
+        self = cls.__new__(cls)
+        self._order = tuple(frames)
+        self._items = frozenset(self._order)
+        self._open = tail
+        self._frange = FrameSet._buildOpenRange(self._order, tail)
+        if instrument.ENABLED:
+            instrument.count('FrameSet.frames', len(self._order))
+        return self
+
+    @staticmethod
+    def _from_items(items):
+        """
+        Build the :class:`FrameSet` of a set operation result, in ascending
+        order. A result that is large and dense enough, as per
+        :meth:`_useBitmap`, uses the compressed bitmap backend of
+        :class:`fileseq.bitmap.BitmapFrameSet`.
+
+        :type items: frozenset
+        :rtype: :class:`FrameSet`
+        """
+        threshold = constants.BITMAP_MIN_FRAMES
+        if threshold is not None and len(items) >= threshold and \
+                FrameSet._useBitmap(len(items), min(items), max(items)):
+            from fileseq.bitmap import BitmapFrameSet
+            return BitmapFrameSet._from_sorted(sorted(items))
+        return FrameSet.from_iterable(items, sort=True)
+
+    @staticmethod
+    def _useBitmap(count, first, last):
+        """
+        Check if `count` frames from `first` to `last` are enough, and dense
+        enough, for the bitmap backend of :class:`fileseq.bitmap.BitmapFrameSet`.
+        See `fileseq.constants.BITMAP_MIN_FRAMES` and
+        `fileseq.constants.BITMAP_MIN_DENSITY`.
+
+        :type count: int
+        :type first: int
+        :type last: int
+        :rtype: bool
+        """
+        threshold = constants.BITMAP_MIN_FRAMES
+        if threshold is None or count < threshold:
+            return False
+        # the bitmap chunks hold 65536 frames each
+        chunks = (last >> 16) - (first >> 16) + 1
+        return count >= constants.BITMAP_MIN_DENSITY * chunks
+
+    @staticmethod
+    def _isDense(frange):
         """
-        return FrameSet(sorted(frames) if sort else frames)
+        Check if a new :class:`FrameSet` of `frange` should use the bitmap
+        backend, as per :meth:`_useBitmap`. Only ascending frames qualify,
+        as the bitmap keeps no other order.
+
+        :type frange: str or iterable
+        :rtype: bool
+        """
+        threshold = constants.BITMAP_MIN_FRAMES
+        if threshold is None or isinstance(frange, FrameSet):
+            return False
+        if isinstance(frange, basestring):
+            # the frames of a range are within its largest number of either
+            # sign, so a range of short numbers is rejected without parsing it
+            if not _digitRun(threshold // 2).search(frange):
+                return False
+            frange = str(frange).translate(None, ''.join(PAD_MAP.keys()))
+            parts = [part for part in frange.split(',') if part]
+            try:
+                parsed = [FrameSet._parse_frange_part(parts[0])]
+                if len(parts) > 1:
+                    parsed.append(FrameSet._parse_frange_part(parts[-1]))
+            except ParseException:
+                # including open-ended parts, left for __init__ to handle
+                return False
+            # ascending frames are all between the first and the last part,
+            # so check that span before parsing the parts in between
+            first, last = parsed[0][0], max(parsed[-1][:2])
+            if last < first or not FrameSet._useBitmap(last - first + 1, first, last):
+                return False
+            count = 0
+            last = None
+            for part in parts:
+                try:
+                    start, end, modifier, chunk = FrameSet._parse_frange_part(part)
+                except ParseException:
+                    return False
+                if start > end or (modifier == ':' and chunk > 1) or (
+                        last is not None and start <= last):
+                    return False
+                last = end
+                count += FrameSet._partSize(start, end, modifier, chunk)
+            return FrameSet._useBitmap(count, first, last)
+        if not isinstance(frange, (Set, Sequence)) or len(frange) < threshold:
+            return False
+        try:
+            frames = map(int, frange)
+        except (TypeError, ValueError):
+            return False
+        if isinstance(frange, Set):
+            return FrameSet._useBitmap(len(frames), min(frames), max(frames))
+        if any(a >= b for a, b in zip(frames, islice(frames, 1, None))):
+            return False
+        return FrameSet._useBitmap(len(frames), frames[0], frames[-1])
 
     @classmethod
     def _cast_to_frameset(cls, other):
@@ -250,7 +541,15 @@ class FrameSet(Set):
         :rtype: int
         :raises: :class:`ValueError` if frame is not in self
         """
-        return self.order.index(frame)
+        if self._open is None or frame in self._items:
+            return self._order.index(frame)
+        if frame not in self:
+            raise ValueError('{0} is not in {1!r}'.format(frame, self))
+        # skip the frames of the open-ended range already in the ordered frames
+        start, step = self._open
+        covered = sum(1 for f in self._items
+                      if start <= f < frame and FrameSet._inTail(self._open, f))
+        return len(self._order) + (frame - start) // step - covered
 
     def frame(self, index):
         """
@@ -261,7 +560,7 @@ class FrameSet(Set):
         :rtype: int
         :raises: :class:`IndexError` if index is out of bounds
         """
-        return self.order[index]
+        return self[index]
 
     def hasFrame(self, frame):
         """
@@ -280,7 +579,9 @@ class FrameSet(Set):
         :rtype: int
         :raises: :class:`IndexError` (with the empty :class:`FrameSet`)
         """
-        return self.order[0]
+        if self._open is not None and not self._order:
+            return self._open[0]
+        return self._order[0]
 
     def end(self):
         """
@@ -288,8 +589,12 @@ class FrameSet(Set):
 
         :rtype: int
         :raises: :class:`IndexError` (with the empty :class:`FrameSet`)
+                 :class:`fileseq.exceptions.MaxSizeException` if the
+                 :class:`FrameSet` is open-ended
         """
-        return self.order[-1]
+        if self._open is not None:
+            self._unbounded('end')
+        return self._order[-1]
 
     def isConsecutive(self):
         """
@@ -306,6 +611,10 @@ class FrameSet(Set):
 
         :rtype: bool
         """
+        if self._open is not None:
+            start, step = self._open
+            head = [f for f in self._items if f < start]
+            return step == 1 and (not head or len(head) == start - min(head))
         return len(self) == abs(self.end()-self.start()) + 1
 
     def frameRange(self, zfill=0):
@@ -325,7 +634,7 @@ class FrameSet(Set):
         """
         return FrameSet.padFrameRange(self.frange, zfill)
 
-    def invertedFrameRange(self, zfill=0):
+    def invertedFrameRange(self, zfill=0, maxSize=None):
         """
         Return the inverse of the :class:`FrameSet` 's frame range, padded if
         desired.
@@ -342,9 +651,20 @@ class FrameSet(Set):
 
         :type zfill: int
         :param zfill: the width to use to zero-pad the frame range string
+        :type maxSize: int
+        :param maxSize: optional max number of inverted frames, replacing
+                        the current limit for this call
         :rtype: str
         :raises: :class:`fileseq.exceptions.MaxSizeException`
         """
+        if self._open is not None:
+            # only the frames before a consecutive open-ended range can be missing
+            start, step = self._open
+            if step != 1:
+                self._unbounded('inverted frame range')
+            head = sorted(f for f in self._items if f < start)
+            return FrameSet._from_sorted(head + [start]).invertedFrameRange(zfill, maxSize)
+
         result = []
         frames = sorted(self.items)
         for idx, frame in enumerate(frames[:-1]):
@@ -354,7 +674,7 @@ class FrameSet(Set):
                 # Check if the next update to the result set
                 # will exceed out max frame size. 
                 # Prevent memory overflows.
-                self._maxSizeCheck(len(r) + len(result))
+                self._maxSizeCheck(len(r) + len(result), maxSize)
                 result += r
         
         if not result:
@@ -369,9 +689,203 @@ class FrameSet(Set):
 
         :rtype: :class:`FrameSet`
         """
+        if self._open is not None:
+            return FrameSet._from_sorted(sorted(self._items), self._open)
         return FrameSet(FrameSet.framesToFrameRange(
             self.items, sort=True, compress=False))
 
+    def iterBatches(self, size):
+        """
+        Iterate over the ordered frames in tuples of ``size`` frames, the
+        last of which may be shorter. Each batch is sliced directly from
+        the stored frames.
+
+        :Example:
+            >>> list(FrameSet('1-5').iterBatches(2))
+            [(1, 2), (3, 4), (5,)]
+
+        :type size: int
+        :param size: the number of frames in each batch
+        :rtype: generator of tuple
+        :raises: :class:`ValueError` if size is less than 1
+        """
+        size = int(size)
+        if size < 1:
+            raise ValueError('Batch size must be at least 1, got {0}'.format(size))
+        order = self._order
+        if self._open is None:
+            return (order[i:i + size] for i in xrange(0, len(order), size))
+        frames = iter(self)
+        return iter(lambda: tuple(islice(frames, size)), ())
+
+    def offset(self, n):
+        """
+        Return a new :class:`FrameSet` with every frame shifted by ``n``.
+
+        The frame range is shifted part by part, rather than rebuilt from
+        the frames, so it keeps the form it was written in.
+
+        :Example:
+            >>> FrameSet('1-10x3,20').offset(100)
+            FrameSet("101-110x3,120")
+
+        :type n: int
+        :rtype: :class:`FrameSet`
+        """
+        n = int(n)
+        parts = [FrameSet._format_frange_part(start + n, end + n, modifier, chunk)
+                 for start, end, modifier, chunk in self._parts()]
+        tail = None if self._open is None else (self._open[0] + n, self._open[1])
+        return FrameSet._from_transform(
+            parts, map(partial(operator.add, n), self._order), tail)
+
+    def scale(self, k):
+        """
+        Return a new :class:`FrameSet` with every frame multiplied by ``k``.
+
+        Single frames, ranges and chunked ranges are scaled part by part.
+        Filled and staggered parts are rebuilt from their scaled frames,
+        since they have no scaled form.
+
+        :Example:
+            >>> FrameSet('1-10').scale(2)
+            FrameSet("2-20x2")
+
+        :type k: int
+        :param k: a non-zero integer factor
+        :rtype: :class:`FrameSet`
+        :raises: :class:`ValueError` if ``k`` is 0
+                 :class:`fileseq.exceptions.MaxSizeException` if ``k`` is
+                 negative and the :class:`FrameSet` is open-ended
+        """
+        k = int(k)
+        if k == 0:
+            raise ValueError('Cannot scale the frames of {0!r} by 0'.format(self))
+        if k < 0 and self._open is not None:
+            self._unbounded('negative scale')
+
+        parts = []
+        for start, end, modifier, chunk in self._parts():
+            if start == end and modifier != 'y':
+                parts.append(str(start * k))
+            elif modifier in (None, 'x'):
+                modifier = 'x' if modifier or abs(k) > 1 else None
+                parts.append(FrameSet._format_frange_part(
+                    start * k, end * k, modifier, chunk * abs(k)))
+            else:
+                part = FrameSet._format_frange_part(start, end, modifier, chunk)
+                parts.append(FrameSet.framesToFrameRange(
+                    [f * k for f in FrameSet(part)._order], sort=False))
+
+        tail = None if self._open is None else (self._open[0] * k, self._open[1] * k)
+        return FrameSet._from_transform(
+            parts, map(partial(operator.mul, k), self._order), tail)
+
+    def clamp(self, start=None, end=None):
+        """
+        Return a new :class:`FrameSet` with only the frames between
+        ``start`` and ``end``, inclusive. Either bound can be None.
+
+        Single frames, ranges and chunked ranges are clamped part by part.
+        Clamping the end of an open-ended :class:`FrameSet` builds the frames
+        of its open-ended range, up to ``end``.
+
+        :Example:
+            >>> FrameSet('1-100x10,200').clamp(15, 150)
+            FrameSet("21-100x10")
+
+        :type start: int
+        :param start: the first frame to keep, or None
+        :type end: int
+        :param end: the last frame to keep, or None
+        :rtype: :class:`FrameSet`
+        """
+        def _inside(frame):
+            return (start is None or frame >= start) and (end is None or frame <= end)
+
+        parts = []
+        for first, last, modifier, chunk in self._parts():
+            if modifier in (None, 'x'):
+                if first <= last:
+                    if start is not None and first < start:
+                        first += -((first - start) // chunk) * chunk
+                    if end is not None and last > end:
+                        last = end
+                    if first > last:
+                        continue
+                else:
+                    if end is not None and first > end:
+                        first -= -((end - first) // chunk) * chunk
+                    if start is not None and last < start:
+                        last = start
+                    if first < last:
+                        continue
+                parts.append(FrameSet._format_frange_part(first, last, modifier, chunk))
+            else:
+                part = FrameSet._format_frange_part(first, last, modifier, chunk)
+                parts.append(FrameSet.framesToFrameRange(
+                    filter(_inside, FrameSet(part)._order), sort=False))
+
+        order = list(filter(_inside, self._order))
+        tail = self._open
+        if tail is not None:
+            first, step = tail
+            if start is not None and first < start:
+                first += -((first - start) // step) * step
+            tail = (first, step)
+            if end is not None:
+                # a bounded end turns the open-ended range into frames
+                tail = None
+                if first <= end:
+                    FrameSet._maxSizeCheck((end - first) // step + 1 + len(order))
+                    order.extend(f for f in xrange(first, end + 1, step) if f not in self._items)
+                    parts.append(FrameSet._format_frange_part(
+                        first, end, 'x' if step > 1 else None, step))
+
+        return FrameSet._from_transform(parts, order, tail)
+
+    def _parts(self):
+        """
+        Return the parsed bounded parts of the frame range, without
+        any open-ended part.
+
+        :rtype: list of tuple (start, end, modifier, chunk)
+        """
+        parts = [part for part in self._frange.split(',') if part]
+        if self._open is not None:
+            parts.pop()
+        return [FrameSet._parse_frange_part(part) for part in parts]
+
+    @classmethod
+    def _from_transform(cls, parts, order, tail=None):
+        """
+        Build a :class:`FrameSet` from the transformed parts of a frame range,
+        and the same transform of its ordered frames, without parsing.
+
+        :type parts: list
+        :param parts: the frame range parts as strings
+        :param order: the unique frames in the order the parts produce them
+        :type tail: tuple
+        :param tail: optional ``(start, step)`` of an open-ended range
+        :rtype: :class:`FrameSet`
+        """
+        self = cls.__new__(cls)
+        self._open = tail
+        if tail is not None:
+            order = list(order)
+            folded, self._open = FrameSet._foldTail(order, tail)
+            if self._open != tail or len(folded) != len(order):
+                # the parts no longer match the canonical frames
+                order = folded
+                parts = [FrameSet.framesToFrameRange(order, sort=False, compress=False)]
+            parts.append(FrameSet._build_open_part(*self._open))
+        self._order = tuple(order)
+        self._items = frozenset(self._order)
+        self._frange = ','.join(part for part in parts if part)
+        if instrument.ENABLED:
+            instrument.count('FrameSet.frames', len(self._order))
+        return self
+
     def __getstate__(self):
         """
         Allows for serialization to a pickled :class:`FrameSet`.
@@ -407,9 +921,10 @@ class FrameSet(Set):
                 self._frange = state['__frange']
                 self._items = frozenset(state['__set'])
                 self._order = tuple(state['__list'])
+                self._open = None
             else:
                 for k in self.__slots__:
-                    setattr(self, k, state[k])
+                    setattr(self, k, state.get(k))
         else:
             msg = "Unrecognized state data from which to deserialize FrameSet"
             raise ValueError(msg)
@@ -423,15 +938,40 @@ class FrameSet(Set):
         :rtype: int
         :raises: :class:`IndexError` if index is out of bounds
         """
-        return self.order[index]
+        if self._open is None:
+            return self._order[index]
+        if isinstance(index, slice):
+            if index.stop is None:
+                self._unbounded('open slice')
+            if any(i is not None and i < 0 for i in (index.start, index.stop, index.step)):
+                raise IndexError('negative slice of the open-ended {0!r}'.format(self))
+            return tuple(islice(self, index.start, index.stop, index.step))
+        if index < 0:
+            raise IndexError('negative index of the open-ended {0!r}'.format(self))
+        if index < len(self._order):
+            return self._order[index]
+        return next(islice(self, index, None))
 
     def __len__(self):
         """
         Returns the length of the ordered frames of this :class:`FrameSet`.
 
         :rtype: int
+        :raises: :class:`fileseq.exceptions.MaxSizeException` if the
+                 :class:`FrameSet` is open-ended
         """
-        return len(self.order)
+        if self._open is not None:
+            self._unbounded('length')
+        return len(self._order)
+
+    def __nonzero__(self):
+        """
+        Returns whether this :class:`FrameSet` has any frames, without
+        needing its length.
+
+        :rtype: bool
+        """
+        return bool(self._order) or self._open is not None
 
     def __str__(self):
         """
@@ -455,7 +995,12 @@ class FrameSet(Set):
 
         :rtype: generator
         """
-        return (i for i in self.order)
+        if self._open is not None:
+            items = self._items
+            start, step = self._open
+            tail = (f for f in count(start, step) if f not in items)
+            return chain(self._order, tail)
+        return (i for i in self._order)
 
     def __reversed__(self):
         """
@@ -474,7 +1019,9 @@ class FrameSet(Set):
         :param item: the frame number to check for
         :rtype: bool
         """
-        return item in self.items
+        if item in self._items:
+            return True
+        return self._open is not None and FrameSet._inTail(self._open, item)
 
     def __hash__(self):
         """
@@ -483,7 +1030,7 @@ class FrameSet(Set):
 
         :rtype: int
         """
-        return hash(self.frange) | hash(self.items) | hash(self.order)
+        return hash(self._items) | hash(self._order) | hash(self._open)
 
     def __lt__(self, other):
         """
@@ -510,6 +1057,9 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
+        if self._open is not None or other._open is not None:
+            return FrameSet._subsetOpen(self, other) and (
+                not FrameSet._subsetOpen(other, self) or self._order < other._order)
         return self.items < other.items or (
             self.items == other.items and self.order < other.order)
 
@@ -527,6 +1077,8 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
+        if self._open is not None or other._open is not None:
+            return FrameSet._subsetOpen(self, other)
         return self.items <= other.items
 
     def __eq__(self, other):
@@ -545,8 +1097,10 @@ class FrameSet(Set):
             if not hasattr(other, '__iter__'):
                 return NotImplemented
             other = self.from_iterable(other)
-        this = hash(self.items) | hash(self.order)
-        that = hash(other.items) | hash(other.order)
+        if self._open != other._open:
+            return False
+        this = hash(self._items) | hash(self._order)
+        that = hash(other._items) | hash(other._order)
         return this == that
 
     def __ne__(self, other):
@@ -580,6 +1134,8 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
+        if self._open is not None or other._open is not None:
+            return FrameSet._subsetOpen(other, self)
         return self.items >= other.items
 
     def __gt__(self, other):
@@ -607,6 +1163,9 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
+        if self._open is not None or other._open is not None:
+            return FrameSet._subsetOpen(other, self) and (
+                not FrameSet._subsetOpen(self, other) or self._order > other._order)
         return self.items > other.items or (
             self.items == other.items and self.order > other.order)
 
@@ -628,7 +1187,9 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
-        return self.from_iterable(self.items & other.items, sort=True)
+        if self._open is not None or other._open is not None:
+            return FrameSet._intersectionOpen(self, other)
+        return FrameSet._from_items(self.items & other.items)
 
     __rand__ = __and__
 
@@ -649,7 +1210,9 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
-        return self.from_iterable(self.items - other.items, sort=True)
+        if self._open is not None or other._open is not None:
+            return FrameSet._differenceOpen(self, other)
+        return FrameSet._from_items(self.items - other.items)
 
     def __rsub__(self, other):
         """
@@ -668,7 +1231,9 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
-        return self.from_iterable(other.items - self.items, sort=True)
+        if self._open is not None or other._open is not None:
+            return FrameSet._differenceOpen(other, self)
+        return FrameSet._from_items(other.items - self.items)
 
     def __or__(self, other):
         """
@@ -688,7 +1253,9 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
-        return self.from_iterable(self.items | other.items, sort=True)
+        if self._open is not None or other._open is not None:
+            return FrameSet._unionOpen(self, other)
+        return FrameSet._from_items(self.items | other.items)
 
     __ror__ = __or__
 
@@ -709,7 +1276,10 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
-        return self.from_iterable(self.items ^ other.items, sort=True)
+        if self._open is not None or other._open is not None:
+            return FrameSet._unionOpen(FrameSet._differenceOpen(self, other),
+                                       FrameSet._differenceOpen(other, self))
+        return FrameSet._from_items(self.items ^ other.items)
 
     __rxor__ = __xor__
 
@@ -725,6 +1295,8 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
+        if self._open is not None or other._open is not None:
+            return not FrameSet._intersectionOpen(self, other)
         return self.items.isdisjoint(other.items)
 
     def issubset(self, other):
@@ -739,6 +1311,8 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
+        if self._open is not None or other._open is not None:
+            return FrameSet._subsetOpen(self, other)
         return self.items <= other.items
 
     def issuperset(self, other):
@@ -753,6 +1327,8 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
+        if self._open is not None or other._open is not None:
+            return FrameSet._subsetOpen(other, self)
         return self.items >= other.items
 
     def union(self, *other):
@@ -763,8 +1339,10 @@ class FrameSet(Set):
         :type other: :class:`FrameSet` or objects that can cast to :class:`FrameSet`
         :rtype: :class:`FrameSet`
         """
+        if self._isOpenAmong(other):
+            return reduce(FrameSet.__or__, map(FrameSet._cast_to_frameset, other), self)
         from_frozenset = self.items.union(*map(set, other))
-        return self.from_iterable(from_frozenset, sort=True)
+        return FrameSet._from_items(from_frozenset)
 
     def intersection(self, *other):
         """
@@ -774,8 +1352,10 @@ class FrameSet(Set):
         :type other: :class:`FrameSet` or objects that can cast to :class:`FrameSet`
         :rtype: :class:`FrameSet`
         """
+        if self._isOpenAmong(other):
+            return reduce(FrameSet.__and__, map(FrameSet._cast_to_frameset, other), self)
         from_frozenset = self.items.intersection(*map(set, other))
-        return self.from_iterable(from_frozenset, sort=True)
+        return FrameSet._from_items(from_frozenset)
 
     def difference(self, *other):
         """
@@ -785,8 +1365,10 @@ class FrameSet(Set):
         :type other: :class:`FrameSet` or objects that can cast to :class:`FrameSet`
         :rtype: :class:`FrameSet`
         """
+        if self._isOpenAmong(other):
+            return reduce(FrameSet.__sub__, map(FrameSet._cast_to_frameset, other), self)
         from_frozenset = self.items.difference(*map(set, other))
-        return self.from_iterable(from_frozenset, sort=True)
+        return FrameSet._from_items(from_frozenset)
 
     def symmetric_difference(self, other):
         """
@@ -799,8 +1381,10 @@ class FrameSet(Set):
         other = self._cast_to_frameset(other)
         if other is NotImplemented:
             return NotImplemented
+        if self._open is not None or other._open is not None:
+            return self ^ other
         from_frozenset = self.items.symmetric_difference(other.items)
-        return self.from_iterable(from_frozenset, sort=True)
+        return FrameSet._from_items(from_frozenset)
 
     def copy(self):
         """
@@ -810,29 +1394,354 @@ class FrameSet(Set):
         """
         return FrameSet(str(self))
 
+    def _unbounded(self, what):
+        """
+        Raise a MaxSizeException for a value that an open-ended
+        :class:`FrameSet` does not have.
+
+        :type what: str
+        :raises: :class:`fileseq.exceptions.MaxSizeException`
+        """
+        msg = 'Cannot take the {0} of the open-ended frame range "{1}"'
+        raise MaxSizeException(msg.format(what, self._frange))
+
+    def _isOpenAmong(self, others):
+        """
+        Return whether this or any of the other :class:`FrameSet` objects
+        is open-ended.
+
+        :type others: iterable
+        :rtype: bool
+        """
+        return self._open is not None or any(
+            isinstance(other, FrameSet) and other._open is not None for other in others)
+
+    @staticmethod
+    def _inTail(tail, frame):
+        """
+        Return whether a frame is one of the frames of an open-ended range.
+
+        :type tail: tuple (start, step)
+        :type frame: int
+        :rtype: bool
+        """
+        start, step = tail
+        return (isinstance(frame, numbers.Integral) and frame >= start
+                and (frame - start) % step == 0)
+
+    @staticmethod
+    def _foldTail(order, tail):
+        """
+        Return the frames and open-ended range of an open-ended
+        :class:`FrameSet` in canonical form, so that the same frames always
+        have the same internals: frames that the range covers are dropped,
+        and the range starts from the lowest of the frames that lead up to
+        it on its step.
+
+        :Example:
+            >>> FrameSet._foldTail([1, 2, 3, 4, 5], (3, 1))
+            ([], (1, 1))
+
+        :type order: sequence
+        :param order: the unique frames before the open-ended range
+        :type tail: tuple (start, step)
+        :rtype: tuple (list, tuple)
+        """
+        start, step = tail
+        frames = [f for f in order if not FrameSet._inTail(tail, f)]
+        items = set(frames)
+        if start - step in items:
+            while start - step in items:
+                start -= step
+            tail = (start, step)
+            frames = [f for f in frames if not FrameSet._inTail(tail, f)]
+        return frames, tail
+
+    @staticmethod
+    def _tailCovers(tail, other):
+        """
+        Return whether the frames of the open-ended range ``tail`` include
+        every frame of ``other`` from the start of ``tail`` onwards.
+
+        :type tail: tuple (start, step)
+        :type other: tuple (start, step)
+        :rtype: bool
+        """
+        return other[1] % tail[1] == 0 and (other[0] - tail[0]) % tail[1] == 0
+
+    @staticmethod
+    def _subsetOpen(a, b):
+        """
+        Return whether every frame of ``a`` is in ``b``, where at least
+        one of the :class:`FrameSet` objects is open-ended, without building
+        the frames of an open-ended range.
+
+        :rtype: bool
+        """
+        if not all(f in b for f in a._items):
+            return False
+        if a._open is None:
+            return True
+        if b._open is None or not FrameSet._tailCovers(b._open, a._open):
+            return False
+        # the frames of a's range before b's range must be single frames of b
+        start, step = a._open
+        stop = b._open[0]
+        if start >= stop:
+            return True
+        if (stop - start - 1) // step + 1 > len(b._items):
+            return False
+        return all(f in b._items for f in xrange(start, stop, step))
+
+    @staticmethod
+    def _commonTail(a, b, first):
+        """
+        Return the first frame from ``first`` onwards that is in both of the
+        open-ended ranges ``a`` and ``b``, or None if they have no frames in
+        common. The frames in common repeat every lcm of the two steps.
+
+        The frame is found by solving the congruences
+        ``frame = startA (mod stepA)`` and ``frame = startB (mod stepB)``,
+        rather than by searching.
+
+        :type a: tuple (start, step)
+        :type b: tuple (start, step)
+        :type first: int
+        :rtype: int or None
+        """
+        (startA, stepA), (startB, stepB) = a, b
+        divisor = gcd(stepA, stepB)
+        diff = startB - startA
+        if diff % divisor:
+            return None
+        # solve (stepA / divisor) * k = diff / divisor (mod stepB / divisor)
+        # for k, with the inverse of stepA / divisor from extended Euclid
+        modulus = stepB // divisor
+        r0, r1 = (stepA // divisor) % modulus, modulus
+        x0, x1 = 1, 0
+        while r1:
+            q = r0 // r1
+            r0, r1 = r1, r0 - q * r1
+            x0, x1 = x1, x0 - q * x1
+        k = (diff // divisor) * x0 % modulus
+        frame = startA + stepA * k
+        return first + (frame - first) % (stepA * modulus)
+
+    @staticmethod
+    def _intersectionOpen(a, b):
+        """
+        Return the intersection of two :class:`FrameSet` objects, where
+        at least one is open-ended.
+
+        :rtype: :class:`FrameSet`
+        """
+        frames = set(f for f in a._items if f in b)
+        frames.update(f for f in b._items if f in a)
+        tail = None
+        if a._open is not None and b._open is not None:
+            first = FrameSet._commonTail(a._open, b._open, max(a._open[0], b._open[0]))
+            if first is not None:
+                stepA, stepB = a._open[1], b._open[1]
+                tail = (first, stepA // gcd(stepA, stepB) * stepB)
+        return FrameSet._from_sorted(sorted(frames), tail)
+
+    @staticmethod
+    def _differenceOpen(a, b):
+        """
+        Return the frames of ``a`` that are not in ``b``, where at least
+        one of the :class:`FrameSet` objects is open-ended. The frames of
+        the open-ended range of ``a`` are only built as far as needed.
+
+        :rtype: :class:`FrameSet`
+        :raises: :class:`fileseq.exceptions.MaxSizeException` if the
+                 difference of two open-ended ranges is unbounded, but
+                 can not be expressed as an open-ended range
+        """
+        frames = set(f for f in a._items if f not in b)
+        tail = a._open
+        if tail is not None:
+            start, step = tail
+            # past the single frames of b and the start of its range, the
+            # frames of a's range that are left repeat
+            stop = max(b._items) + 1 if b._items else start
+            if b._open is not None:
+                stop = max(stop, b._open[0])
+            first = start + (max(stop - start, 0) + step - 1) // step * step
+            if b._open is not None:
+                tail = FrameSet._differenceTail(a, b, first)
+            else:
+                tail = (first, step)
+            if first > start:
+                FrameSet._maxSizeCheck((first - start) // step + len(frames))
+                frames.update(f for f in xrange(start, first, step) if f not in b)
+        return FrameSet._from_sorted(sorted(frames), tail)
+
+    @staticmethod
+    def _differenceTail(a, b, first):
+        """
+        Return the open-ended range of the frames of the range of ``a``
+        that are not in the range of ``b``, from ``first`` onwards.
+
+        :type a: :class:`FrameSet`
+        :type b: :class:`FrameSet`
+        :type first: int
+        :param first: a frame of the range of ``a``, at or past the start
+                      of the range of ``b``
+        :rtype: tuple (start, step) or None
+        :raises: :class:`fileseq.exceptions.MaxSizeException` if the frames
+                 left are not a single open-ended range
+        """
+        step, other = a._open[1], b._open[1]
+        common = FrameSet._commonTail(a._open, b._open, first)
+        if common is None:
+            # b's range takes no frames from a's range
+            return first, step
+        lcm = step // gcd(step, other) * other
+        if lcm == step:
+            # b's range takes every frame
+            return None
+        if lcm == 2 * step:
+            # every other frame is left, starting just before or after common
+            return (common - step if common - step >= first else common + step), lcm
+        msg = 'The difference of "{0}" and "{1}" is not a frame range'
+        raise MaxSizeException(msg.format(a._frange, b._frange))
+
+    @staticmethod
+    def _unionOpen(a, b):
+        """
+        Return the union of two :class:`FrameSet` objects, where at least
+        one is open-ended.
+
+        :rtype: :class:`FrameSet`
+        :raises: :class:`fileseq.exceptions.MaxSizeException` if both are
+                 open-ended and their union can not be expressed as a
+                 single open-ended range
+        """
+        frames = set(a._items)
+        frames.update(b._items)
+        tail = a._open or b._open
+        if a._open is not None and b._open is not None:
+            tail = FrameSet._unionTail(a._open, b._open)
+            if tail is None:
+                msg = 'The union of "{0}" and "{1}" is not a frame range'
+                raise MaxSizeException(msg.format(a._frange, b._frange))
+            # build the frames of either range that start before the union
+            for start, step in (a._open, b._open):
+                if start < tail[0]:
+                    FrameSet._maxSizeCheck((tail[0] - start) // step + len(frames))
+                    frames.update(xrange(start, tail[0], step))
+        return FrameSet._from_sorted(sorted(frames), tail)
+
+    @staticmethod
+    def _unionTail(a, b):
+        """
+        Return the open-ended range of the frames that are in either of the
+        open-ended ranges ``a`` and ``b``, from the start of the later one
+        onwards, or None if those frames are not a single open-ended range.
+
+        That is the case when one range covers the other, or when both have
+        the same even step, and the frames of one fall halfway between the
+        frames of the other, i.e. ``1-x2`` and ``2-x2`` are ``1-``.
+
+        :type a: tuple (start, step)
+        :type b: tuple (start, step)
+        :rtype: tuple (start, step) or None
+        """
+        first = max(a[0], b[0])
+        if FrameSet._tailCovers(a, b):
+            step = a[1]
+        elif FrameSet._tailCovers(b, a):
+            step = b[1]
+        elif a[1] == b[1] and a[1] % 2 == 0 and (a[0] - b[0]) % a[1] == a[1] // 2:
+            step = a[1] // 2
+        else:
+            return None
+        # the first frame of either range from the start of the later one
+        return min(start + (first - start + n - 1) // n * n for start, n in (a, b)), step
+
     @classmethod
-    def _maxSizeCheck(cls, obj):
+    def _maxSizeCheck(cls, obj, maxSize=None):
         """
-        Raise a MaxSizeException if ``obj`` exceeds MAX_FRAME_SIZE
+        Raise a MaxSizeException if ``obj`` exceeds ``maxSize``, or if
+        its frames would exceed the MAX_FRAME_MEMORY budget
 
         :type obj: number or collection
+        :type maxSize: int
+        :param maxSize: the max number of frames, defaulting to the limit
+                        of the current thread, see :func:`fileseq.utils.getMaxFrameSize`
         :raises: :class:`fileseq.exceptions.MaxSizeException`
         """
-        fail = False
         size = 0
 
         if isinstance(obj, numbers.Number):
-            if obj > constants.MAX_FRAME_SIZE:
-                fail = True
-                size = obj
+            size = obj
 
         elif hasattr(obj, '__len__'):
             size = len(obj)
-            fail = size > constants.MAX_FRAME_SIZE
 
-        if fail:
-            raise MaxSizeException('Frame size %s > %s (MAX_FRAME_SIZE)' \
-                    % (size, constants.MAX_FRAME_SIZE))
+        msg = None
+        budget = constants.MAX_FRAME_MEMORY
+
+        if maxSize is not None:
+            limit, name = maxSize, 'maxSize'
+        else:
+            limit, name = getMaxFrameSize(), 'MAX_FRAME_SIZE'
+
+        if size > limit:
+            msg = 'Frame size %s > %s (%s)' % (size, limit, name)
+
+        elif budget is not None and size * _BYTES_PER_FRAME > budget:
+            msg = 'Frame size %s would use about %s bytes > %s (MAX_FRAME_MEMORY)' \
+                    % (size, size * _BYTES_PER_FRAME, budget)
+
+        if msg is not None:
+            if instrument.ENABLED:
+                instrument.count('MaxSizeException')
+            raise MaxSizeException(msg)
+
+    @staticmethod
+    def _partSize(start, end, modifier, chunk):
+        """
+        Return the number of frames of a parsed part of a frame range,
+        without building them.
+
+        :type start: int
+        :type end: int
+        :type modifier: str
+        :type chunk: int
+        :rtype: int
+        """
+        span = abs(end - start) + 1
+        if modifier == 'x':
+            return (span - 1) // chunk + 1
+        if modifier == 'y':
+            return span - ((span - 1) // chunk + 1)
+        # full ranges, and staggered ranges which end with a step of 1
+        return span
+
+    def memoryUsage(self, detailed=False):
+        """
+        Return the bytes of memory used by the :class:`FrameSet`.
+
+        This is the sum of the ``_items`` frozenset, the ``_order`` tuple,
+        the frame int objects that they share and the frame range string.
+        Small ints which are shared by the whole interpreter are not counted.
+
+        :type detailed: bool
+        :param detailed: if True, return the bytes of each part in a dict
+                         with the keys ``object``, ``items``, ``order``,
+                         ``frames`` and ``frange``
+        :rtype: int or dict
+        """
+        sizeof = sys.getsizeof
+        usage = {
+            'object': sizeof(self),
+            'items': sizeof(self._items),
+            'order': sizeof(self._order),
+            'frames': sum(sizeof(f) for f in self._items if not -5 <= f <= 256),
+            'frange': sizeof(self._frange),
+        }
+        return usage if detailed else sum(usage.itervalues())
 
     @staticmethod
     def isFrameRange(frange):
@@ -849,10 +1758,12 @@ class FrameSet(Set):
         frange = str(frange).translate(None, ''.join(PAD_MAP.keys()))
         if not frange:
             return True
-        for part in frange.split(','):
-            if not part:
-                continue
+        parts = [part for part in frange.split(',') if part]
+        for i, part in enumerate(parts):
             try:
+                # only the last part can be open-ended
+                if i == len(parts) - 1 and FrameSet._parse_open_part(part):
+                    break
                 FrameSet._parse_frange_part(part)
             except ParseException:
                 return False
@@ -903,6 +1814,78 @@ class FrameSet(Set):
             raise ParseException(msg.format(frange))
         return start, end, modifier, chunk
 
+    @staticmethod
+    def _parse_open_part(frange):
+        """
+        Internal method: parse an open-ended frame range part.
+
+        :type frange: str
+        :param frange: single part of a frame range as a string (ie "1001-x2")
+        :rtype: tuple (start, step), or None if the part is not open-ended
+        :raises: :class:`fileseq.exceptions.ParseException` if the step is 0
+        """
+        match = OPEN_FRANGE_RE.match(frange)
+        if not match:
+            return None
+        start, step = match.groups()
+        step = int(step) if step is not None else 1
+        if step == 0:
+            msg = 'Could not parse "{0}": chunk cannot be 0'
+            raise ParseException(msg.format(frange))
+        return int(start), step
+
+    @staticmethod
+    def _format_frange_part(start, end, modifier, chunk):
+        """
+        Private method: builds an unpadded frame range part from the values
+        returned by :meth:`_parse_frange_part`.
+
+        :type start: int
+        :type end: int
+        :type modifier: str
+        :type chunk: int
+        :rtype: str
+        """
+        # a filled part of a single frame has no frames, so keep its form
+        if start == end and modifier != 'y':
+            return str(start)
+        if modifier is None:
+            return '{0}-{1}'.format(start, end)
+        return '{0}-{1}{2}{3}'.format(start, end, modifier, chunk)
+
+    @staticmethod
+    def _build_open_part(start, step, zfill=0):
+        """
+        Private method: builds an open-ended frame range part.
+
+        :type start: int
+        :param start: first frame
+        :type step: int
+        :param step: increment
+        :type zfill: int
+        :param zfill: width for zero padding
+        :rtype: str
+        """
+        if step == 1:
+            return '{0}-'.format(pad(start, zfill))
+        return '{0}-x{1}'.format(pad(start, zfill), step)
+
+    @staticmethod
+    def _buildOpenRange(order, tail=None):
+        """
+        Private method: builds the frame range of ordered frames, followed
+        by an optional open-ended range.
+
+        :type order: sequence
+        :type tail: tuple
+        :param tail: optional ``(start, step)`` of an open-ended range
+        :rtype: str
+        """
+        frange = FrameSet.framesToFrameRange(order, sort=False, compress=False)
+        if tail is None:
+            return frange
+        return ','.join(p for p in (frange, FrameSet._build_open_part(*tail)) if p)
+
     @staticmethod
     def _build_frange_part(start, stop, stride, zfill=0):
         """
@@ -1003,3 +1986,61 @@ class FrameSet(Set):
         if sort:
             frames.sort()
         return ','.join(FrameSet.framesToFrameRanges(frames, zfill))
+
+
+class _LazyFrames(object):
+    """
+    A mixin for :class:`FrameSet` backends that hold ``_count`` frames in
+    another form, such as :class:`fileseq.bitmap.BitmapFrameSet` and
+    :class:`fileseq.shared.SharedFrameSet`. The ordered frames, unique
+    frames and frame range that the inherited :class:`FrameSet` methods
+    use are built from iteration once, on demand, into a ``_cache`` dict.
+    """
+
+    __slots__ = ()
+
+    # these backends are always bounded
+    _open = None
+
+    @property
+    def _order(self):
+        if 'order' not in self._cache:
+            self._cache['order'] = tuple(self)
+        return self._cache['order']
+
+    @property
+    def _items(self):
+        if 'items' not in self._cache:
+            self._cache['items'] = frozenset(self._order)
+        return self._cache['items']
+
+    @property
+    def _frange(self):
+        if 'frange' not in self._cache:
+            self._cache['frange'] = FrameSet.framesToFrameRange(self, sort=False)
+        return self._cache['frange']
+
+    @property
+    def is_null(self):
+        return self._count == 0
+
+    def __len__(self):
+        return self._count
+
+    def __nonzero__(self):
+        return self._count > 0
+
+    def iterBatches(self, size):
+        """
+        Iterate over the ordered frames in tuples of ``size`` frames,
+        without building the frames of the set.
+
+        :type size: int
+        :rtype: generator of tuple
+        :raises: :class:`ValueError` if size is less than 1
+        """
+        size = int(size)
+        if size < 1:
+            raise ValueError('Batch size must be at least 1, got {0}'.format(size))
+        frames = iter(self)
+        return iter(lambda: tuple(islice(frames, size)), ())
@@ -0,0 +1,167 @@
+#! /usr/bin/env python
+"""
+instrument - Opt-in counters and timers of the hot paths of fileseq.
+
+Instrumentation is disabled by default, in which case the instrumented code
+only checks the :obj:`ENABLED` flag. Once enabled, fileseq records:
+
+    * ``FrameSet.parse`` - timer of parsing frame range strings
+    * ``FrameSet.frames`` - the number of frames materialized into FrameSets
+    * ``MaxSizeException`` - the number of ranges rejected as too large
+    * ``cache.<name>.hit``, ``cache.<name>.miss`` - lookups of the internal caches
+    * ``grouping.paths`` - the number of paths split while grouping sequences
+    * ``grouping.sequences`` - the number of sequences grouped
+    * ``disk.listdir`` - timer of listing directories
+    * ``disk.entries`` - the number of directory entries scanned
+
+Example::
+
+    from fileseq import instrument
+
+    instrument.enable()
+    seqs = findSequencesOnDisk('/path/to/renders')
+    print instrument.snapshot()['counters']['disk.entries']
+
+    # or only while a block runs, reporting each event as it happens
+    with instrument.collecting(hook=lambda name, value: log.debug('%s %s', name, value)):
+        seqs = findSequencesOnDisk('/path/to/renders')
+"""
+
+import threading
+from contextlib import contextmanager
+from timeit import default_timer as clock
+
+
+# Checked by the instrumented code before recording anything, so that
+# disabled instrumentation costs a single attribute lookup
+ENABLED = False
+
+_lock = threading.Lock()
+_counters = {}
+_timers = {}
+_hook = None
+
+
+def enable(hook=None):
+    """
+    Start recording counters and timers.
+
+    If given, ``hook`` is called with ``(name, value)`` for every event as
+    it is recorded: the increment of a counter, or the seconds of a timer.
+    It is called from the thread that recorded the event.
+
+    :type hook: callable
+    :param hook: optional callback for each event
+    """
+    global ENABLED, _hook
+    _hook = hook
+    ENABLED = True
+
+def disable():
+    """
+    Stop recording counters and timers. The values recorded so far are
+    kept until :func:`reset`.
+    """
+    global ENABLED, _hook
+    ENABLED = False
+    _hook = None
+
+def reset():
+    """
+    Discard all of the recorded counters and timers.
+    """
+    with _lock:
+        _counters.clear()
+        _timers.clear()
+
+def snapshot():
+    """
+    Return a copy of the values recorded so far, as a dictionary of::
+
+        {
+            'counters': {name: total},
+            'timers': {name: {'count': calls, 'seconds': total seconds}},
+        }
+
+    :rtype: dict
+    """
+    with _lock:
+        return {
+            'counters': dict(_counters),
+            'timers': dict((name, {'count': n, 'seconds': secs})
+                           for name, (n, secs) in _timers.iteritems()),
+        }
+
+@contextmanager
+def collecting(hook=None):
+    """
+    Enable instrumentation while the block runs, restoring the previous
+    state afterwards. The recorded values are not reset.
+
+    :type hook: callable
+    :param hook: optional callback for each event, see :func:`enable`
+    """
+    global ENABLED, _hook
+    previous = ENABLED, _hook
+    enable(hook)
+    try:
+        yield
+    finally:
+        ENABLED, _hook = previous
+
+def count(name, value=1):
+    """
+    Add ``value`` to the counter ``name``.
+
+    :type name: str
+    :type value: int
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+    hook = _hook
+    if hook is not None:
+        hook(name, value)
+
+def record(name, seconds):
+    """
+    Add a measured duration to the timer ``name``.
+
+    :type name: str
+    :type seconds: float
+    """
+    with _lock:
+        n, total = _timers.get(name, (0, 0.0))
+        _timers[name] = (n + 1, total + seconds)
+    hook = _hook
+    if hook is not None:
+        hook(name, seconds)
+
+def counted(name, iterable):
+    """
+    Yield the items of ``iterable``, adding the number of items to the
+    counter ``name`` once the iteration finishes or is abandoned.
+
+    :type name: str
+    :type iterable: iterable
+    :rtype: generator
+    """
+    n = 0
+    try:
+        for item in iterable:
+            n += 1
+            yield item
+    finally:
+        count(name, n)
+
+@contextmanager
+def timer(name):
+    """
+    Time the block, recording its duration to the timer ``name``.
+
+    :type name: str
+    """
+    start = clock()
+    try:
+        yield
+    finally:
+        record(name, clock() - start)
@@ -0,0 +1,109 @@
+#! /usr/bin/env python
+"""
+patterns - Translation of glob-like file patterns into regular expressions.
+"""
+
+import re
+
+
+def _classEnd(pattern, i):
+    """
+    Return the index just past the end of the character class starting
+    at index ``i`` of the pattern, or -1 if the class is not terminated.
+
+    :type pattern: str
+    :type i: int
+    :param i: the index of the opening '['
+    :rtype: int
+    """
+    n = len(pattern)
+    j = i + 1
+    if j < n and pattern[j] == '!':
+        j += 1
+    # a leading ']' is part of the class
+    if j < n and pattern[j] == ']':
+        j += 1
+    j = pattern.find(']', j)
+    if j == -1:
+        return -1
+    return j + 1
+
+def _bracePairs(pattern):
+    """
+    Find the brace groups of a pattern that are properly closed.
+
+    :type pattern: str
+    :rtype: tuple (set of opening indices, set of closing indices)
+    """
+    opening, closing = set(), set()
+    stack = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '[':
+            end = _classEnd(pattern, i)
+            if end != -1:
+                i = end
+                continue
+        elif c == '{':
+            stack.append(i)
+        elif c == '}' and stack:
+            opening.add(stack.pop())
+            closing.add(i)
+        i += 1
+    return opening, closing
+
+def translate(pattern):
+    """
+    Translate a glob-like pattern into a regular expression pattern string.
+    The result is not anchored.
+
+    Supports the following syntax, where everything else is matched literally:
+        *         - any number of characters
+        ?         - a single character
+        [seq]     - any character in seq
+        [!seq]    - any character not in seq
+        {foo,bar} - either 'foo' or 'bar'. Brace groups can be nested,
+                    i.e. {foo,ba{r,z}}
+
+    :type pattern: str
+    :param pattern: the glob-like pattern
+    :rtype: str
+    """
+    opening, closing = _bracePairs(pattern)
+    res = []
+    depth = 0
+    i, n = 0, len(pattern)
+
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            res.append('.*')
+        elif c == '?':
+            res.append('.')
+        elif c == '[':
+            end = _classEnd(pattern, i)
+            if end == -1:
+                res.append(re.escape(c))
+            else:
+                stuff = pattern[i + 1:end - 1].replace('\\', '\\\\')
+                if stuff[0] == '!':
+                    stuff = '^' + stuff[1:]
+                elif stuff[0] == '^':
+                    stuff = '\\' + stuff
+                res.append('[{0}]'.format(stuff))
+                i = end
+                continue
+        elif c == '{' and i in opening:
+            depth += 1
+            res.append('(?:')
+        elif c == '}' and i in closing:
+            depth -= 1
+            res.append(')')
+        elif c == ',' and depth:
+            res.append('|')
+        else:
+            res.append(re.escape(c))
+        i += 1
+
+    return ''.join(res)
@@ -0,0 +1,458 @@
+#! /usr/bin/env python
+"""
+shared - Read-only FrameSets in shared memory, for multiprocessing workers.
+
+A large :class:`fileseq.frameset.FrameSet` is published once as a compact
+list of arithmetic runs, or of single frames when they are too scattered
+to form runs, in a memory-mapped file, which every worker process maps
+read-only by name. Pickling a :class:`SharedFrameSet` only sends that
+name, so the frames are neither copied nor reparsed per worker::
+
+    from multiprocessing import Pool
+    from fileseq.shared import SharedFrameSet
+
+    with SharedFrameSet.create(expected) as shared:
+        pool = Pool(64)
+        missing = pool.map(checkShot, [(shot, shared) for shot in shots])
+
+On Linux the file is created in ``/dev/shm``, which is backed by memory.
+"""
+
+import os
+import sys
+import bisect
+import struct
+import numbers
+from array import array
+from itertools import chain, islice
+
+from fileseq.frameset import FrameSet, _LazyFrames
+from fileseq.exceptions import FileSeqException
+from fileseq.utils import xrange
+
+# The header of a shared frame set: magic, version, the layout of the
+# records, the number of frames, the number of records in order, and the
+# number of sorted records used for membership tests (0 when the ordered
+# records are already sorted)
+_HEADER = struct.Struct('=6q')
+_MAGIC = 0x51455346
+_VERSION = 2
+
+# The layouts of the records: runs of frames, or single frames
+_RUNS, _FRAMES = 0, 1
+
+# Each run of frames: first frame, step and number of frames. Values are
+# native 64 bit ints, so a file is only shared between processes of the
+# same machine
+_RUN = struct.Struct('=3q')
+
+# Each single frame, in the layout of single frames
+_FRAME = struct.Struct('=q')
+
+# Runs are only stored when they average at least this many frames. A run
+# takes the bytes of three frames, and each process indexes its first frame
+_MIN_RUN_FRAMES = 4
+
+# The directory of the shared files, preferring memory-backed storage
+_SHM_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+def frameRuns(frames):
+    """
+    Split frames into arithmetic runs of ``(start, step, count)``, in the
+    same order as the frames.
+
+    :Example:
+        >>> list(frameRuns([1, 2, 3, 10, 20, 30, 7]))
+        [(1, 1, 3), (10, 10, 3), (7, 1, 1)]
+
+    :type frames: iterable
+    :param frames: unique integer frames
+    :rtype: generator of tuple
+    """
+    start = last = step = None
+    n = 0
+    for frame in frames:
+        if start is None:
+            start = last = frame
+            n = 1
+        elif step is None:
+            step = frame - start
+            last = frame
+            n = 2
+        elif frame - last == step:
+            last = frame
+            n += 1
+        else:
+            yield start, step, n
+            start = last = frame
+            step = None
+            n = 1
+    if start is not None:
+        yield start, step or 1, n
+
+
+class SharedFrameSet(_LazyFrames, FrameSet):
+    """
+    A read-only :class:`fileseq.frameset.FrameSet` backed by a memory-mapped
+    list of frame runs or single frames, which can be shared by processes.
+
+    Membership, iteration, ``len()``, indexing, slicing, :meth:`start` and
+    :meth:`end` work directly on the mapped records. Anything else, such as
+    set operations, first builds the frames of the set in the calling
+    process, once.
+
+    Use :meth:`create` to publish a frame set, and :meth:`open` to map a
+    published one by its :attr:`name`.
+    """
+
+    __slots__ = ('_path', '_map', '_owner', '_layout', '_count', '_runsAt', '_numRuns',
+                 '_sortedAt', '_numSorted', '_cache')
+
+    @classmethod
+    def create(cls, frameSet, path=None):
+        """
+        Publish the frames of a :class:`fileseq.frameset.FrameSet` to a new
+        shared file, and return it mapped. The caller owns the file, and
+        removes it with :meth:`unlink`, or by leaving a ``with`` block.
+
+        :type frameSet: :class:`fileseq.frameset.FrameSet`
+        :param frameSet: also accepts anything that can cast to a FrameSet
+        :type path: str
+        :param path: optional path of the file, defaulting to a new
+                     temporary file in shared memory
+        :rtype: :class:`SharedFrameSet`
+        :raises: :class:`fileseq.exceptions.MaxSizeException` if the frame
+                 set is open-ended
+        """
+        if not isinstance(frameSet, FrameSet):
+            frameSet = FrameSet(frameSet)
+        if frameSet.is_open:
+            frameSet._unbounded('shared frames')
+        order = frameSet._order
+
+        runs = list(frameRuns(order))
+        # membership is tested by bisecting records of ascending frames
+        previous = None
+        ascending = True
+        for start, step, n in runs:
+            if (previous is not None and start <= previous) or (step < 0 and n > 1):
+                ascending = False
+                break
+            previous = start + step * (n - 1)
+        sortedOrder = () if ascending else sorted(order)
+
+        if len(order) >= _MIN_RUN_FRAMES * len(runs):
+            sortedRuns = list(frameRuns(sortedOrder))
+            header = _HEADER.pack(_MAGIC, _VERSION, _RUNS, len(order), len(runs), len(sortedRuns))
+            records = ''.join(_RUN.pack(*run) for run in chain(runs, sortedRuns))
+        else:
+            # scattered frames are smaller as single frames than as runs
+            header = _HEADER.pack(_MAGIC, _VERSION, _FRAMES, len(order), len(order),
+                                  len(sortedOrder))
+            frames = list(chain(order, sortedOrder))
+            records = struct.pack('={0}q'.format(len(frames)), *frames)
+
+        if path is None:
+            import tempfile
+            fd, path = tempfile.mkstemp(prefix='fileseq_', suffix='.frames', dir=_SHM_DIR)
+            f = os.fdopen(fd, 'wb')
+        else:
+            f = open(path, 'wb')
+        try:
+            with f:
+                f.write(header)
+                f.write(records)
+            self = cls.open(path)
+        except Exception:
+            os.remove(path)
+            raise
+        self._owner = True
+        return self
+
+    @classmethod
+    def open(cls, name):
+        """
+        Map a frame set published with :meth:`create`, read-only.
+
+        :type name: str
+        :param name: the :attr:`name` of the shared frame set
+        :rtype: :class:`SharedFrameSet`
+        :raises: :class:`fileseq.exceptions.FileSeqException` if the file
+                 is not a shared frame set
+        """
+        import mmap
+        with open(name, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(mapped) < _HEADER.size:
+            mapped.close()
+            raise FileSeqException('Not a shared frame set: {0}'.format(name))
+        magic, version, layout, count, numRuns, numSorted = _HEADER.unpack_from(mapped)
+        if magic != _MAGIC or version != _VERSION or layout not in (_RUNS, _FRAMES):
+            mapped.close()
+            raise FileSeqException('Not a shared frame set: {0}'.format(name))
+
+        self = cls.__new__(cls)
+        self._path = name
+        self._map = mapped
+        self._owner = False
+        self._layout = layout
+        self._count = count
+        self._runsAt = _HEADER.size
+        self._numRuns = numRuns
+        if numSorted:
+            size = _RUN.size if layout == _RUNS else _FRAME.size
+            self._sortedAt = _HEADER.size + numRuns * size
+            self._numSorted = numSorted
+        else:
+            self._sortedAt = self._runsAt
+            self._numSorted = numRuns
+        self._cache = {}
+        return self
+
+    @property
+    def name(self):
+        """
+        The path of the shared file, for :meth:`open`.
+
+        :rtype: str
+        """
+        return self._path
+
+    def close(self):
+        """
+        Unmap the shared frames from this process.
+        """
+        self._map.close()
+
+    def unlink(self):
+        """
+        Remove the shared file. Processes that have mapped it keep their
+        mapping until they close it.
+        """
+        try:
+            os.remove(self._path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        if self._owner:
+            self.unlink()
+
+    def __reduce__(self):
+        # workers map the published file, rather than unpickling the frames
+        return _openShared, (self._path,)
+
+    def memoryUsage(self, detailed=False):
+        """
+        Return the bytes of memory used by the :class:`SharedFrameSet` in
+        this process: the object, the mapped runs, which are shared with
+        every other process, and any frames built on demand.
+
+        :type detailed: bool
+        :param detailed: if True, return the bytes of each part in a dict
+                         with the keys ``object``, ``shared`` and ``cache``
+        :rtype: int or dict
+        """
+        usage = {
+            'object': sys.getsizeof(self),
+            'shared': len(self._map),
+            'cache': sum(sys.getsizeof(v) for v in self._cache.itervalues()),
+        }
+        return usage if detailed else sum(usage.itervalues())
+
+    def _run(self, at, i):
+        """
+        Return the run ``(start, step, count)`` of the record at position
+        ``i`` of the records starting at byte ``at``. A single frame is a
+        run of one frame.
+
+        :rtype: tuple
+        """
+        if self._layout == _FRAMES:
+            return _FRAME.unpack_from(self._map, at + i * _FRAME.size)[0], 1, 1
+        return _RUN.unpack_from(self._map, at + i * _RUN.size)
+
+    def _bisect(self, at, n, value):
+        """
+        Return the position of the last of ``n`` records starting at byte
+        ``at`` whose first frame is at most ``value``, or -1.
+
+        :rtype: int
+        """
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._run(at, mid)[0] <= value:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo - 1
+
+    def _firsts(self):
+        """
+        Return the index of the first frame of each ordered run. The
+        indices are built once in this process, rather than stored in the
+        shared file.
+
+        :rtype: array.array
+        """
+        if 'firsts' not in self._cache:
+            firsts = array('l')
+            index = 0
+            for i in xrange(self._numRuns):
+                firsts.append(index)
+                index += self._run(self._runsAt, i)[2]
+            self._cache['firsts'] = firsts
+        return self._cache['firsts']
+
+    def _first(self, i):
+        """
+        Return the index of the first frame of the ordered record ``i``.
+
+        :rtype: int
+        """
+        return i if self._layout == _FRAMES else self._firsts()[i]
+
+    def _locate(self, index):
+        """
+        Return the position of the ordered record holding the frame at
+        ``index``.
+
+        :rtype: int
+        """
+        if self._layout == _FRAMES:
+            return index
+        return bisect.bisect_right(self._firsts(), index) - 1
+
+    def _iterFrom(self, index):
+        """
+        Iterate over the ordered frames, from the frame at ``index``.
+
+        :rtype: generator
+        """
+        if index >= self._count:
+            return iter(())
+        at = self._runsAt
+        i = self._locate(index)
+        start, step, n = self._run(at, i)
+        skip = index - self._first(i)
+        runs = (self._run(at, r) for r in xrange(i + 1, self._numRuns))
+        return chain(xrange(start + skip * step, start + n * step, step),
+                     chain.from_iterable(xrange(start, start + n * step, step)
+                                         for start, step, n in runs))
+
+    def __contains__(self, item):
+        """
+        Check if item is a member of this :class:`SharedFrameSet`, by
+        bisecting the sorted runs.
+
+        :type item: int
+        :rtype: bool
+        """
+        if not isinstance(item, numbers.Integral):
+            return False
+        at = self._sortedAt
+        i = self._bisect(at, self._numSorted, item)
+        if i < 0:
+            return False
+        start, step, n = self._run(at, i)
+        return item <= start + step * (n - 1) and (item - start) % step == 0
+
+    def __iter__(self):
+        """
+        Iterate over the ordered frames, one run at a time.
+
+        :rtype: generator
+        """
+        at = self._runsAt
+        runs = (self._run(at, i) for i in xrange(self._numRuns))
+        return chain.from_iterable(
+            xrange(start, start + n * step, step) for start, step, n in runs)
+
+    def __getitem__(self, index):
+        """
+        Index or slice the ordered frames, reading only the runs needed.
+
+        :type index: int or slice
+        :rtype: int or tuple
+        :raises: :class:`IndexError` if index is out of bounds
+        """
+        if isinstance(index, slice):
+            start, stop, stride = index.indices(self._count)
+            if stride < 0:
+                return self._order[index]
+            return tuple(islice(self._iterFrom(start), 0, max(0, stop - start), stride))
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('FrameSet index out of range')
+        i = self._locate(index)
+        start, step, _ = self._run(self._runsAt, i)
+        return start + (index - self._first(i)) * step
+
+    def index(self, frame):
+        """
+        Return the index of the given frame number.
+
+        :type frame: int
+        :rtype: int
+        :raises: :class:`ValueError` if frame is not in self
+        """
+        if frame not in self:
+            raise ValueError('{0} is not in {1!r}'.format(frame, self))
+        if self._sortedAt == self._runsAt:
+            i = self._bisect(self._runsAt, self._numRuns, frame)
+            start, step, _ = self._run(self._runsAt, i)
+            return self._first(i) + (frame - start) // step
+        return self._order.index(frame)
+
+    def start(self):
+        """
+        The first frame of the ordered frames.
+
+        :rtype: int
+        :raises: :class:`IndexError` if empty
+        """
+        return self[0]
+
+    def end(self):
+        """
+        The last frame of the ordered frames.
+
+        :rtype: int
+        :raises: :class:`IndexError` if empty
+        """
+        return self[-1]
+
+    def toArray(self, typecode='l'):
+        """
+        Return the ordered frames as an ``array.array``, built a run at a
+        time. See :meth:`fileseq.frameset.FrameSet.toArray`.
+
+        :type typecode: str
+        :rtype: array.array
+        """
+        frames = array(typecode)
+        at = self._runsAt
+        for i in xrange(self._numRuns):
+            start, step, n = self._run(at, i)
+            frames.extend(xrange(start, start + n * step, step))
+        return frames
+
+    def __repr__(self):
+        return '{0}("{1}")'.format(self.__class__.__name__, self._path)
+
+
+def _openShared(name):
+    """
+    Unpickle a :class:`SharedFrameSet` by mapping its file.
+
+    :rtype: :class:`SharedFrameSet`
+    """
+    return SharedFrameSet.open(name)
@@ -4,10 +4,39 @@ utils - General tools of use to fileseq operations.
 """
 
 import os
+import sys
+import stat
+import errno
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from itertools import chain, count, islice
 
-from fileseq import exceptions 
+from fileseq import constants, exceptions, instrument
+from fileseq.constants import DISK_RE, COPY_CHUNK_SIZE, HASH_CHUNK_SIZE, MMAP_MIN_SIZE
 
+# Prefer scandir when it is available (builtin on python 3.5+, or
+# the backport package), since it can classify directory entries
+# without an extra stat call per entry.
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+# The frame size limit of each thread, as set by maxFrameSize
+_limits = threading.local()
+
+
+def gcd(a, b):
+    """
+    Return the greatest common divisor of two integers.
+    """
+    while b:
+        a, b = b, a % b
+    return abs(a)
 
 def lenRange(start, stop, step=1):
     """
@@ -78,6 +107,8 @@ def xfrange(start, stop, step=1, maxSize=-1):
     if maxSize >= 0:
         size = lenRange(start, stop, step)
         if size > maxSize:
+            if instrument.ENABLED:
+                instrument.count('MaxSizeException')
             raise exceptions.MaxSizeException(
                 "Size %d > %s (MAX_FRAME_SIZE)" % (size, maxSize))
         
@@ -85,6 +116,39 @@ def xfrange(start, stop, step=1, maxSize=-1):
     # generator expression to get a proper Generator
     return (f for f in xrange(start, stop, step))
 
+def getMaxFrameSize():
+    """
+    Return the frame size limit in effect for the current thread: the limit
+    of the innermost :func:`maxFrameSize` block, otherwise
+    :obj:`fileseq.constants.MAX_FRAME_SIZE`.
+
+    :rtype: int
+    """
+    size = getattr(_limits, 'maxSize', None)
+    return constants.MAX_FRAME_SIZE if size is None else size
+
+@contextmanager
+def maxFrameSize(size):
+    """
+    Replace :obj:`fileseq.constants.MAX_FRAME_SIZE` while the block runs,
+    for the current thread only. Other threads, including the worker threads
+    of functions called from the block, keep their own limit.
+
+    Example::
+
+        with maxFrameSize(50000000):
+            frames = FrameSet('1-40000000')
+
+    :type size: int
+    :param size: the max number of frames of a :class:`fileseq.frameset.FrameSet`
+    """
+    previous = getattr(_limits, 'maxSize', None)
+    _limits.maxSize = size
+    try:
+        yield
+    finally:
+        _limits.maxSize = previous
+
 def unique(seen, *iterables):
     """
     Get the unique items in iterables while preserving order.  Note that this
@@ -111,6 +175,28 @@ def pad(number, width=0):
     """
     return str(number).zfill(width)
 
+def memoryUsage(objects):
+    """
+    Return the total bytes of memory used by a collection of
+    :class:`fileseq.frameset.FrameSet` or
+    :class:`fileseq.filesequence.FileSequence` objects, including the
+    collection itself. An object found more than once is counted once.
+
+    :type objects: iterable
+    :param objects: a list, set or other iterable of the objects.
+                    Pass ``mapping.values()`` to measure the values of a dict
+    :rtype: int
+    """
+    total = sys.getsizeof(objects) if hasattr(objects, '__len__') else 0
+    seen = set()
+    for obj in objects:
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        usage = getattr(obj, 'memoryUsage', None)
+        total += usage() if usage is not None else sys.getsizeof(obj)
+    return total
+
 def _getPathSep(path):
     """
     Abstracts returning the appropriate path separator 
@@ -141,4 +227,517 @@ def asString(obj):
     """
     if type(obj) in _STR_TYPES:
         return obj
-    return str(obj)
\ No newline at end of file
+    return str(obj)
+
+
+_DIGITS = '0123456789'
+_LETTERS = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_WORD_CHARS = _LETTERS + _DIGITS + '_'
+
+def _isExtensionWord(part):
+    """
+    Return True if part is one of the leading components of a
+    multi-part extension, as matched by ``\w*[a-zA-Z]\w`` in
+    :obj:`fileseq.constants.DISK_PATTERN`: only word characters,
+    with a letter as the second to last character.
+    """
+    return (len(part) > 1
+            and part[-2] in _LETTERS
+            and not part.strip(_WORD_CHARS))
+
+def splitDiskPath(path):
+    """
+    Split a path into its ``(dirname, basename, frame, extension)``
+    components, with the same semantics as matching
+    :obj:`fileseq.constants.DISK_RE`, but without the cost of its
+    backtracking.
+
+    The frame is None if the path has no frame number.
+
+    :Example:
+        >>> splitDiskPath('/path/to/foo.0001.exr')
+        ('/path/to/', 'foo.', '0001', '.exr')
+
+    :type path: str
+    :rtype: tuple
+    """
+    # the pattern does not match across lines
+    if '\n' in path:
+        match = DISK_RE.match(path)
+        return match.groups() if match else None
+
+    idx = max(path.rfind('/'), path.rfind('\\')) + 1
+    dirname, name = path[:idx], path[idx:]
+
+    # Work right-to-left to find where the extension starts: the last
+    # dotted component can contain anything, and any components before
+    # it must be extension words.
+    size = len(name)
+    extStart = size
+    dot = name.rfind('.')
+    if dot != -1 and dot != size - 1:
+        extStart = dot
+        while True:
+            prev = name.rfind('.', 0, extStart)
+            if prev == -1 or not _isExtensionWord(name[prev + 1:extStart]):
+                break
+            extStart = prev
+
+    head = name[:extStart]
+    ext = name[extStart:]
+
+    # the frame is the run of digits that ends at the extension,
+    # with an optional negative sign
+    basename = head.rstrip(_DIGITS)
+    if len(basename) == len(head):
+        return dirname, head, None, ext
+
+    if basename.endswith('-'):
+        basename = basename[:-1]
+    return dirname, basename, head[len(basename):], ext
+
+
+class LRUCache(object):
+    """
+    A thread-safe mapping that holds at most ``maxsize`` items,
+    discarding the least recently used item when full.
+
+    :type maxsize: int
+    :param maxsize: the max number of items to hold
+    :type name: str
+    :param name: optional name to count the hits and misses of the cache
+                 under, see :mod:`fileseq.instrument`
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize, name=None):
+        self._maxsize = maxsize
+        self._name = name
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key, default=None):
+        """
+        Return the value for key, or default if it is not cached.
+        """
+        with self._lock:
+            value = self._items.pop(key, self._MISSING)
+            if value is not self._MISSING:
+                # re-insert to mark it as the most recently used
+                self._items[key] = value
+
+        if instrument.ENABLED and self._name:
+            hit = value is not self._MISSING
+            instrument.count('cache.{0}.{1}'.format(self._name, 'hit' if hit else 'miss'))
+
+        return default if value is self._MISSING else value
+
+    def put(self, key, value):
+        """
+        Cache the value for key, discarding the least recently
+        used item if the cache is full.
+        """
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = value
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """
+        Discard all cached items.
+        """
+        with self._lock:
+            self._items.clear()
+
+
+def _threadPool(workers):
+    """
+    Return a new pool of ``workers`` threads. multiprocessing is only
+    imported once a pool is needed, to keep importing fileseq cheap.
+
+    :type workers: int
+    :rtype: :class:`multiprocessing.pool.ThreadPool`
+    """
+    from multiprocessing.pool import ThreadPool
+    return ThreadPool(workers)
+
+def threadMap(func, iterable, workers=1):
+    """
+    Return the list of ``func`` applied to each item of ``iterable``,
+    using a pool of threads if ``workers`` is greater than 1.
+
+    Results are returned in the same order as ``iterable``.
+
+    :type func: callable
+    :type iterable: iterable
+    :type workers: int
+    :param workers: the number of threads to spread the calls across
+    :rtype: list
+    """
+    items = list(iterable)
+    workers = min(workers or 1, len(items))
+    if workers <= 1:
+        return map(func, items)
+
+    pool = _threadPool(workers)
+    try:
+        return pool.map(func, items)
+    finally:
+        pool.close()
+        pool.join()
+
+def threadImap(func, iterable, workers=1):
+    """
+    Yield ``func`` applied to each item of ``iterable``, using a pool
+    of threads if ``workers`` is greater than 1.
+
+    Results are yielded as they complete, so not necessarily in the same
+    order as ``iterable``. Unlike :func:`threadMap`, this allows the caller
+    to report progress while the work is still running.
+
+    :type func: callable
+    :type iterable: iterable
+    :type workers: int
+    :param workers: the number of threads to spread the calls across
+    :rtype: generator
+    """
+    items = list(iterable)
+    workers = min(workers or 1, len(items))
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    pool = _threadPool(workers)
+    try:
+        for result in pool.imap_unordered(func, items):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+def _stat(path):
+    """
+    Return the ``os.stat`` result of a path, or None if it could not be read
+    """
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+def _statEntry(entry):
+    """
+    Return the ``DirEntry.stat`` result of a scandir entry, or None if
+    it could not be read
+    """
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+def listDir(dirpath, match=None, stats=False, workers=1):
+    """
+    List the immediate contents of a directory in a single pass.
+
+    Returns a tuple of ``(dirnames, filenames, filestats)``, where ``filestats``
+    is a list of ``os.stat`` results aligned with ``filenames`` if ``stats``
+    is True, otherwise None. A stat result may be None if the file could
+    not be read (i.e. a broken symlink, or a file removed during the scan).
+
+    If ``match`` is given, only the entries whose names pass ``match(name)``
+    are classified, stat'd and returned.
+
+    Entries are classified with ``scandir`` where available. When stats are
+    requested, they are gathered with ``DirEntry.stat()`` (or ``os.stat`` as
+    a fallback, which also classifies the entry), so that each entry costs
+    at most a single metadata call. The stat calls are spread across a pool
+    of ``workers`` threads, which helps hide the latency of network
+    filesystems.
+
+    Like ``os.walk``, errors listing the directory are ignored and produce
+    empty results.
+
+    :type dirpath: str
+    :type match: callable
+    :param match: optional filter for the names of the entries
+    :type stats: bool
+    :param stats: if True, also gather the stats of each file
+    :type workers: int
+    :param workers: the number of threads used to gather stats
+    :rtype: tuple
+    """
+    if not instrument.ENABLED:
+        return _listDir(dirpath, match, stats, workers)
+
+    scanned = [0]
+
+    def _counted(name):
+        scanned[0] += 1
+        return match is None or match(name)
+
+    with instrument.timer('disk.listdir'):
+        result = _listDir(dirpath, _counted, stats, workers)
+    instrument.count('disk.entries', scanned[0])
+    return result
+
+def _listDir(dirpath, match=None, stats=False, workers=1):
+    """
+    List the immediate contents of a directory. See :func:`listDir`
+    """
+    dirs, files, filestats = [], [], None
+    _join = os.path.join
+
+    if scandir is not None:
+        try:
+            entries = scandir(dirpath)
+        except OSError:
+            return dirs, files, [] if stats else None
+
+        fileEntries = []
+        for entry in entries:
+            if match is not None and not match(entry.name):
+                continue
+            try:
+                isdir = entry.is_dir()
+            except OSError:
+                isdir = False
+            if isdir:
+                dirs.append(entry.name)
+            else:
+                fileEntries.append(entry)
+
+        files = [entry.name for entry in fileEntries]
+        if stats:
+            filestats = threadMap(_statEntry, fileEntries, workers)
+        return dirs, files, filestats
+
+    try:
+        names = os.listdir(dirpath)
+    except OSError:
+        return dirs, files, [] if stats else None
+
+    if match is not None:
+        names = filter(match, names)
+
+    if not stats:
+        _isdir = os.path.isdir
+        for name in names:
+            if _isdir(_join(dirpath, name)):
+                dirs.append(name)
+            else:
+                files.append(name)
+        return dirs, files, filestats
+
+    filestats = []
+    _isdir = stat.S_ISDIR
+    results = threadMap(_stat, (_join(dirpath, name) for name in names), workers)
+    for name, st in zip(names, results):
+        if st is not None and _isdir(st.st_mode):
+            dirs.append(name)
+        else:
+            files.append(name)
+            filestats.append(st)
+    return dirs, files, filestats
+
+# The errors of a zero-copy transfer that mean it is not supported
+# between the given files, rather than a failure of the copy itself
+_NO_ZERO_COPY = frozenset(getattr(errno, name) for name in (
+    'ENOSYS', 'EINVAL', 'EXDEV', 'ENOTSUP', 'EOPNOTSUPP', 'ENOTSOCK')
+    if hasattr(errno, name))
+
+def _copyFileRange(infd, outfd, size, chunkSize):
+    """
+    Copy between file descriptors within the kernel with ``os.copy_file_range``
+    """
+    copied = 0
+    while copied < size:
+        n = os.copy_file_range(infd, outfd, min(chunkSize, size - copied))
+        if not n:
+            break
+        copied += n
+    return copied
+
+def _sendFile(infd, outfd, size, chunkSize):
+    """
+    Copy between file descriptors within the kernel with ``os.sendfile``
+    """
+    copied = 0
+    while copied < size:
+        n = os.sendfile(outfd, infd, copied, min(chunkSize, size - copied))
+        if not n:
+            break
+        copied += n
+    return copied
+
+def _readWrite(infd, outfd, size, chunkSize):
+    """
+    Copy between file descriptors through a buffer in user space
+    """
+    copied = 0
+    while True:
+        buf = os.read(infd, chunkSize)
+        if not buf:
+            break
+        written = 0
+        while written < len(buf):
+            written += os.write(outfd, buf[written:])
+        copied += len(buf)
+    return copied
+
+# The ways of copying file data, from the fastest that is available
+_COPY_METHODS = [method for name, method in (
+    ('copy_file_range', _copyFileRange),
+    ('sendfile', _sendFile),
+    ('read', _readWrite)) if hasattr(os, name)]
+
+def _copyData(infd, outfd, size, chunkSize):
+    """
+    Copy ``size`` bytes between open file descriptors, with the fastest
+    method that the platform and the filesystems support.
+    """
+    for method in _COPY_METHODS[:-1]:
+        try:
+            return method(infd, outfd, size, chunkSize)
+        except OSError as err:
+            if err.errno not in _NO_ZERO_COPY:
+                raise
+        # start over with the next method
+        os.lseek(infd, 0, os.SEEK_SET)
+        os.lseek(outfd, 0, os.SEEK_SET)
+        os.ftruncate(outfd, 0)
+    return _COPY_METHODS[-1](infd, outfd, size, chunkSize)
+
+def makeDirs(path):
+    """
+    Create the directory ``path`` and its parents, if they don't exist.
+
+    :type path: str
+    """
+    if not path or os.path.isdir(path):
+        return
+    try:
+        os.makedirs(path)
+    except OSError:
+        # created concurrently by another thread or process
+        if not os.path.isdir(path):
+            raise
+
+def replaceFile(src, dst):
+    """
+    Rename ``src`` to ``dst``, replacing ``dst`` if it exists.
+
+    :type src: str
+    :type dst: str
+    """
+    if hasattr(os, 'replace'):
+        os.replace(src, dst)
+        return
+    try:
+        os.rename(src, dst)
+    except OSError:
+        # windows refuses to rename over an existing file
+        if not os.path.exists(dst):
+            raise
+        os.remove(dst)
+        os.rename(src, dst)
+
+def copyFile(src, dst, chunkSize=COPY_CHUNK_SIZE):
+    """
+    Copy the data and stats of the file ``src`` to ``dst``, replacing ``dst``.
+
+    The data is transferred within the kernel where possible
+    (``os.copy_file_range``, then ``os.sendfile``), falling back to reading
+    and writing chunks of ``chunkSize`` bytes. The copy is written to a
+    temporary file beside ``dst`` and renamed into place once complete, so
+    that ``dst`` is never left partially written.
+
+    :type src: str
+    :type dst: str
+    :type chunkSize: int
+    :param chunkSize: the number of bytes to transfer at a time
+    :rtype: int
+    :returns: the number of bytes copied
+    """
+    binary = getattr(os, 'O_BINARY', 0)
+    tmp = dst + '.part'
+
+    infd = os.open(src, os.O_RDONLY | binary)
+    try:
+        size = os.fstat(infd).st_size
+        outfd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | binary, 0o666)
+        try:
+            copied = _copyData(infd, outfd, size, chunkSize)
+        finally:
+            os.close(outfd)
+    except:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    finally:
+        os.close(infd)
+
+    import shutil
+    shutil.copystat(src, tmp)
+    replaceFile(tmp, dst)
+    return copied
+
+def moveFile(src, dst, chunkSize=COPY_CHUNK_SIZE):
+    """
+    Move the file ``src`` to ``dst``, replacing ``dst``. Moves across
+    filesystems fall back to copying and removing ``src``.
+
+    :type src: str
+    :type dst: str
+    :type chunkSize: int
+    :param chunkSize: the number of bytes to transfer at a time when copying
+    :rtype: int
+    :returns: the number of bytes copied, which is 0 for a rename
+    """
+    try:
+        replaceFile(src, dst)
+        return 0
+    except OSError as err:
+        if err.errno != errno.EXDEV:
+            raise
+    copied = copyFile(src, dst, chunkSize)
+    os.remove(src)
+    return copied
+
+def hashFile(path, algorithm='sha1', chunkSize=HASH_CHUNK_SIZE):
+    """
+    Return the hex digest of the contents of a file.
+
+    Files of at least :obj:`fileseq.constants.MMAP_MIN_SIZE` bytes are
+    memory-mapped and hashed in place, rather than read through a buffer.
+    The hashing releases the GIL, so files can be hashed concurrently
+    from several threads.
+
+    :type path: str
+    :type algorithm: str
+    :param algorithm: the name of a ``hashlib`` algorithm
+    :type chunkSize: int
+    :param chunkSize: the number of bytes hashed at a time
+    :rtype: str
+    """
+    import hashlib
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_MIN_SIZE:
+            for chunk in iter(lambda: f.read(chunkSize), b''):
+                digest.update(chunk)
+            return digest.hexdigest()
+
+        import mmap
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for offset in xrange(0, size, chunkSize):
+                digest.update(buffer(mapped, offset, chunkSize))
+        finally:
+            mapped.close()
+    return digest.hexdigest()
@@ -5,12 +5,15 @@ from __future__ import division
 import unittest
 import cPickle
 import re
+import random
 import types
-from itertools import chain
+from itertools import chain, product
 
 from utils import *
 
 from fileseq import FrameSet, framesToFrameRange, ParseException
+from fileseq.constants import DISK_RE
+from fileseq.utils import splitDiskPath
 
 
 def _yrange(first, last=None, incr=1):
@@ -180,8 +183,10 @@ FRAME_SET_SHOULD_FAIL = [
     ("NegWFillChar", "-1y5"),
     ("PosWStaggerChar", "1:5"),
     ("NegWStaggerChar", "-1:5"),
-    ("PosWSepChar", "1-"),
-    ("NegWSepChar", "-1-"),
+    ("PosWSepCharNotLast", "1-,5"),
+    ("NegWSepCharNotLast", "-1-,5"),
+    ("OpenWFillChar", "1-y5"),
+    ("OpenWStaggerChar", "1-:5"),
     ("BadAlphaChars", "bilbo"),
     ("RangeWDupeSpecialChar", "1-20x:y5"),
     ("RangeWBadCaseChunkChar", "1-20X5"),
@@ -1239,6 +1244,44 @@ for name, tst, exp in FRAME_SET_SHOULD_SUCCEED:
         lambda self, t=tst, e=exp: TestFramesToFrameRange._check_frameToRangeEquivalence(self, t, e))
 
 
+
+DISK_PATH_DIRS = ['', 'dir/', '/abs/dir/', 'C:\\dir\\', 'mixed/dir\\', 'dir.v1/', '/']
+DISK_PATH_BASES = ['foo', 'foo.', 'foo_', 'foo-', 'foo--', '', '.hidden', 'file20.v123.',
+                   'a1a.', 'name with space ', 'foo.debug.', '123', 'v2_', 'foo.0001.']
+DISK_PATH_FRAMES = ['', '0001', '-001', '1', '-1', '10000', '00', '-', '1-100', '1x']
+DISK_PATH_EXTS = ['', '.exr', '.tar.gz', '.7zip', '.a1', '.1a', '.', '..exr', '.exr.bak',
+                  '.v2.exr', '#.exr', '.ab1.exr', '.a_b', '.x y', '\n', '.exr\n']
+
+
+def _diskPathCorpus():
+    """
+    Build the corpus of paths used to check splitDiskPath against DISK_RE:
+    every combination of some tricky path components, plus seeded random
+    strings of the characters that matter to the pattern.
+    """
+    for parts in product(DISK_PATH_DIRS, DISK_PATH_BASES, DISK_PATH_FRAMES, DISK_PATH_EXTS):
+        yield ''.join(parts)
+    for _, frange, _ in FRAME_SET_SHOULD_SUCCEED:
+        yield 'dir/foo.{0}.exr'.format(frange)
+    rand = random.Random(0)
+    chars = u'ab0._-/\\Z \n\xe9'
+    for _ in xrange(20000):
+        yield u''.join(rand.choice(chars) for _ in xrange(rand.randint(0, 16)))
+
+
+class TestSplitDiskPath(unittest.TestCase):
+    """
+    Exercise the splitDiskPath tokenizer, which must give the same results
+    as matching DISK_RE.
+    """
+
+    def testSplitDiskPath(self):
+        for path in _diskPathCorpus():
+            match = DISK_RE.match(path)
+            expected = match.groups() if match else None
+            self.assertEqual(splitDiskPath(path), expected, 'failed on %r' % path)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=1)
 
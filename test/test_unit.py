@@ -5,8 +5,17 @@ from __future__ import division
 import unittest
 import cPickle
 import re
-from itertools import imap
+import operator
+import shutil
+import tempfile
+import threading
+import multiprocessing
+from array import array
+from itertools import imap, islice, product
 import string
+import json
+import hashlib
+from StringIO import StringIO
 from collections import namedtuple
 
 from utils import *
@@ -20,7 +29,7 @@ from fileseq import (FrameSet,
                      getPaddingNum, 
                      FileSeqException)
 
-from fileseq import constants, exceptions, utils
+from fileseq import bench, cli, constants, exceptions, instrument, utils
 from fileseq.constants import PAD_MAP
 
 
@@ -31,6 +40,60 @@ class TestUtils(unittest.TestCase):
         xrng = utils.xrange(1, sys.maxint)
         self.assertTrue(len(xrng) != 0)
 
+    def testGcd(self):
+        self.assertEqual(utils.gcd(12, 18), 6)
+        self.assertEqual(utils.gcd(100000, 100002), 2)
+        self.assertEqual(utils.gcd(7, 0), 7)
+        self.assertEqual(utils.gcd(-4, 6), 2)
+
+
+class TestPatterns(unittest.TestCase):
+
+    def testTranslate(self):
+        tests = [
+            ("foo.exr", ["foo.exr"], ["fooxexr", "foo.exr2"]),
+            ("foo*.exr", ["foo.exr", "foo_bar.exr"], ["bar.exr"]),
+            ("foo?.exr", ["foo1.exr"], ["foo.exr", "foo12.exr"]),
+            ("foo[0-9].exr", ["foo1.exr"], ["fooa.exr"]),
+            ("foo[!0-9].exr", ["fooa.exr"], ["foo1.exr"]),
+            ("foo[].exr", ["foo[].exr"], ["foo.exr"]),
+            ("foo{a,b}.exr", ["fooa.exr", "foob.exr"], ["fooc.exr", "foo{a,b}.exr"]),
+            ("foo{a,b,c}.exr", ["fooa.exr", "foob.exr", "fooc.exr"], ["food.exr"]),
+            ("foo{a,b{1,2}}.exr", ["fooa.exr", "foob1.exr", "foob2.exr"], ["foob.exr"]),
+            ("foo{,_v2}.exr", ["foo.exr", "foo_v2.exr"], ["foo_v3.exr"]),
+            ("foo{a,b.exr", ["foo{a,b.exr"], ["fooa.exr"]),
+            ("foo,a}.exr", ["foo,a}.exr"], []),
+            ("foo+(1).exr", ["foo+(1).exr"], ["foo(1).exr"]),
+        ]
+        for pattern, good, bad in tests:
+            regex = FileSequence.compilePattern(pattern)
+            for name in good:
+                self.assertTrue(regex.match(name), "%s should match %s" % (pattern, name))
+            for name in bad:
+                self.assertFalse(regex.match(name), "%s should not match %s" % (pattern, name))
+
+    def testCompilePatternCached(self):
+        self.assertTrue(FileSequence.compilePattern("foo*") is FileSequence.compilePattern("foo*"))
+        self.assertRaises(FileSeqException, FileSequence.compilePattern, "foo[z-a]")
+
+    def testCompilePattern(self):
+        regex = fileseq.compilePattern("crypto_{00,01}.#.exr")
+        self.assertTrue(regex is fileseq.compilePattern("crypto_{00,01}.#.exr"))
+        names = ["crypto_00.0001.exr", "crypto_01.1.exr", "crypto_00.-001.exr",
+                 "crypto_02.0001.exr", "crypto_00.exr", "crypto_00.0001.exr.bak"]
+        self.assertEqual(filter(regex.match, names), names[:3])
+
+    def testLRUCache(self):
+        cache = utils.LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(len(cache), 2)
+
 
 class TestFrameSet(unittest.TestCase):
 
@@ -67,6 +130,98 @@ class TestFrameSet(unittest.TestCase):
         finally:
             constants.MAX_FRAME_SIZE = _maxSize
 
+    def testMaxFrameSizeScoped(self):
+        default = constants.MAX_FRAME_SIZE
+        self.assertEqual(utils.getMaxFrameSize(), default)
+
+        with utils.maxFrameSize(500):
+            self.assertEqual(utils.getMaxFrameSize(), 500)
+            FrameSet('1-500')
+            self.assertRaises(exceptions.MaxSizeException, FrameSet, '1-501')
+            self.assertRaises(exceptions.MaxSizeException, FrameSet, range(501))
+            self.assertRaises(exceptions.MaxSizeException, FileSequence, '/path/file.1-501#.exr')
+            self.assertRaises(exceptions.MaxSizeException, FrameSet('1,600').invertedFrameRange)
+
+            with utils.maxFrameSize(default * 2):
+                self.assertEqual(len(FrameSet('1-%d' % (default + 1))), default + 1)
+            self.assertEqual(utils.getMaxFrameSize(), 500)
+
+            # the limit is local to the thread that set it
+            other = []
+            t = threading.Thread(target=lambda: other.append(utils.getMaxFrameSize()))
+            t.start()
+            t.join()
+            self.assertEqual(other, [default])
+
+        self.assertEqual(utils.getMaxFrameSize(), default)
+        self.assertIs(fileseq.maxFrameSize, utils.maxFrameSize)
+
+    def testMaxSizeArgument(self):
+        self.assertEqual(len(FrameSet('1-100', maxSize=100)), 100)
+        self.assertRaises(exceptions.MaxSizeException, FrameSet, '1-101', maxSize=100)
+        self.assertRaises(exceptions.MaxSizeException, FrameSet, range(101), maxSize=100)
+        self.assertRaises(exceptions.MaxSizeException, FrameSet.from_iterable, range(101), maxSize=100)
+        self.assertRaises(exceptions.MaxSizeException, FrameSet('1,200').invertedFrameRange, maxSize=100)
+        self.assertRaises(exceptions.MaxSizeException, FileSequence, '/path/file.1-101#.exr', maxSize=100)
+
+        seq = FileSequence('/path/file.1#.exr')
+        self.assertRaises(exceptions.MaxSizeException, seq.setFrameRange, '1-101', maxSize=100)
+
+        with utils.maxFrameSize(10):
+            # the argument takes precedence over the scoped limit
+            self.assertEqual(len(FrameSet('1-100', maxSize=100)), 100)
+            self.assertEqual(FileSequence('/path/file.1,50#.exr').invertedFrameRange(maxSize=100),
+                             '0002-0049')
+
+    def testMaxFrameMemory(self):
+        _budget = constants.MAX_FRAME_MEMORY
+        try:
+            constants.MAX_FRAME_MEMORY = 100000
+
+            FrameSet('1-1000')
+            FrameSet('1-5000x10')
+
+            # rejected from the size of each part, before building its frames
+            self.assertRaises(exceptions.MaxSizeException, FrameSet, '1-5000')
+            self.assertRaises(exceptions.MaxSizeException, FrameSet, '1-5000y1000')
+            self.assertRaises(exceptions.MaxSizeException, FrameSet, range(5000))
+            self.assertRaises(exceptions.MaxSizeException, FrameSet('1,5000').invertedFrameRange)
+
+            constants.MAX_FRAME_MEMORY = None
+            FrameSet(range(5000))
+
+        finally:
+            constants.MAX_FRAME_MEMORY = _budget
+
+    def testPartSize(self):
+        for frange in ('1-10', '10-1', '-5-5', '1-10x3', '10-1x3', '1-10y3', '1-10:3', '1-9x20', '7'):
+            start, end, modifier, chunk = FrameSet._parse_frange_part(frange.split(':')[0])
+            if ':' in frange:
+                modifier, chunk = ':', int(frange.split(':')[1])
+            self.assertEqual(FrameSet._partSize(start, end, modifier, chunk), len(FrameSet(frange)), frange)
+
+    def testMemoryUsage(self):
+        small = FrameSet('1-10')
+        large = FrameSet('1001-2000')
+
+        usage = large.memoryUsage(detailed=True)
+        self.assertEqual(sorted(usage), ['frames', 'frange', 'items', 'object', 'order'])
+        self.assertEqual(sum(usage.values()), large.memoryUsage())
+        # small ints are shared by the interpreter, not owned
+        self.assertEqual(small.memoryUsage(True)['frames'], 0)
+        self.assertEqual(usage['frames'], 1000 * sys.getsizeof(1001))
+        self.assertGreater(large.memoryUsage(), small.memoryUsage())
+
+        seq = FileSequence('/path/to/file.1001-2000#.exr')
+        usage = seq.memoryUsage(detailed=True)
+        self.assertEqual(usage['frameSet'], seq.frameSet().memoryUsage())
+        self.assertEqual(usage['frameStats'], 0)
+        self.assertEqual(sum(usage.values()), seq.memoryUsage())
+
+        self.assertEqual(utils.memoryUsage([large, large, seq]),
+                         sys.getsizeof([large, large, seq]) + large.memoryUsage() + seq.memoryUsage())
+        self.assertEqual(fileseq.memoryUsage, utils.memoryUsage)
+
     def test2FramesContiguous(self):
         table = [
             ([1,2], "1-2"),
@@ -113,6 +268,243 @@ class TestFrameSet(unittest.TestCase):
             self.assertFalse(FrameSet(t).isConsecutive(), 
                 "Expected %s to not be consecutive" % t)
 
+    def testFromSorted(self):
+        for frames in ([], [5], [1, 2, 3, 10, 12, 14], [-3, -1, 0, 7]):
+            fs = FrameSet._from_sorted(frames)
+            self.assertEqual(fs, FrameSet(frames))
+            self.assertEqual(str(fs), str(FrameSet(frames)))
+            self.assertEqual(fs.order, tuple(frames))
+
+    def testOpenEnded(self):
+        fs = FrameSet('1-3,10-')
+        self.assertTrue(fs.is_open)
+        self.assertFalse(fs.is_null)
+        self.assertTrue(fs)
+        self.assertFalse(FrameSet('1-10').is_open)
+        self.assertEqual(str(fs), '1-3,10-')
+        self.assertEqual(fs.frameRange(4), '0001-0003,0010-')
+        self.assertEqual(FrameSet('5-x2').frameRange(3), '005-x2')
+        self.assertEqual(cPickle.loads(cPickle.dumps(fs)), fs)
+
+        self.assertIn(3, fs)
+        self.assertNotIn(5, fs)
+        self.assertIn(1000000000, fs)
+        self.assertNotIn(1000000000, FrameSet('1-x2'))
+        self.assertEqual(fs.start(), 1)
+        self.assertEqual(FrameSet('10-').start(), 10)
+        self.assertEqual(list(islice(fs, 6)), [1, 2, 3, 10, 11, 12])
+        self.assertEqual(fs[4], 11)
+        self.assertEqual(fs.frame(5), 12)
+        self.assertEqual(fs[2:5], (3, 10, 11))
+        self.assertEqual(fs.index(12), 5)
+        self.assertEqual(FrameSet('12,10-').index(13), 3)
+
+        for func in (len, FrameSet.end, reversed, lambda f: f.items, lambda f: f[1:]):
+            self.assertRaises(exceptions.MaxSizeException, func, fs)
+        self.assertRaises(exceptions.ParseException, FrameSet, '10-,20')
+        self.assertRaises(exceptions.ParseException, FrameSet, '10-x0')
+        self.assertTrue(FrameSet.isFrameRange('1-3,10-x2'))
+        self.assertFalse(FrameSet.isFrameRange('10-,20'))
+
+        self.assertEqual(FrameSet('1-10,20-').invertedFrameRange(), '11-19')
+        self.assertTrue(FrameSet('1-5,6-').isConsecutive())
+        self.assertFalse(fs.isConsecutive())
+        self.assertEqual(str(FrameSet('30,1-').normalize()), '1-')
+
+        # frames that the open-ended range covers are folded into it
+        for frange, canonical in (('1-5,3-', '1-'), ('7,5,4,6-', '4-'), ('1,3,5-x2', '1-x2'),
+                                  ('1-5,10-x5', '1-4,5-x5'), ('0,2,5-', '0,2,5-')):
+            fs = FrameSet(frange)
+            self.assertEqual(str(fs), canonical)
+            self.assertEqual(fs, FrameSet(canonical))
+            self.assertEqual(hash(fs), hash(FrameSet(canonical)))
+        self.assertNotEqual(FrameSet('1-5,3-'), FrameSet('2-'))
+        self.assertEqual(len(set([FrameSet('1-5,3-'), FrameSet('1-')])), 1)
+
+    def testOpenEndedSetOperations(self):
+        fs = FrameSet('1-3,10-')
+        self.assertEqual(str(fs & FrameSet('1-100x5')), '1,11-96x5')
+        self.assertEqual(str(fs & FrameSet('5-x2')), '11-x2')
+        self.assertEqual(str(FrameSet('4-x2') & FrameSet('3-x3')), '6-x6')
+        self.assertEqual(str(fs - FrameSet('2,12')), '1,3,10-11,13-')
+        self.assertEqual(str(fs | FrameSet('5')), '1-3,5,10-')
+        self.assertEqual(str(FrameSet('1-10') | FrameSet('5-')), '1-')
+        self.assertEqual(str(FrameSet('2-x2') | FrameSet('6-x4')), '2-x2')
+        self.assertEqual(str(FrameSet('9-x2') | FrameSet('1-x4')), '1,5,9-x2')
+        self.assertEqual(FrameSet('1-10') - FrameSet('5-'), FrameSet('1-4'))
+        self.assertEqual(FrameSet('1-') - FrameSet('5-'), FrameSet('1-4'))
+        self.assertEqual(str(FrameSet('1-5') ^ FrameSet('3-')), '1-2,6-')
+        self.assertEqual(str(fs.union([5], FrameSet('20-'))), '1-3,5,10-')
+        self.assertEqual(str(fs.intersection(FrameSet('2-'), [2, 3, 50])), '2-3,50')
+        self.assertEqual(str(fs.difference([1])), '2-3,10-')
+
+        # the frames in common are solved for, not searched across the steps
+        self.assertEqual(str(FrameSet('1-x100000') & FrameSet('2-x100001')),
+                         '10000000001-x10000100000')
+        self.assertEqual(str(FrameSet('1-x100000') & FrameSet('2-x100002')), '')
+        self.assertTrue(FrameSet('1-x100000').isdisjoint(FrameSet('2-x100002')))
+        self.assertFalse(FrameSet('1-x99991').isdisjoint(FrameSet('5-x99989')))
+
+        self.assertTrue(FrameSet('12-20') <= fs)
+        self.assertTrue(fs.issuperset([1, 2, 99]))
+        self.assertFalse(fs.issubset(FrameSet('1-100')))
+        self.assertTrue(fs.isdisjoint(FrameSet('4-9')))
+        self.assertFalse(fs.isdisjoint(FrameSet('4-')))
+
+        # subsets of open-ended ranges are decided without building frames
+        self.assertFalse(FrameSet('1-') <= FrameSet('1-x2'))
+        self.assertFalse(FrameSet('1-').issubset(FrameSet('1-x2')))
+        self.assertTrue(FrameSet('1-x2') <= FrameSet('1-'))
+        self.assertTrue(FrameSet('3-x4') < FrameSet('1-x2'))
+        self.assertTrue(FrameSet('1-') >= FrameSet('1-100,200-x5'))
+        self.assertTrue(FrameSet('1-').issuperset(FrameSet('5-x3')))
+        self.assertFalse(FrameSet('1-x2').issuperset(FrameSet('2-x2')))
+        self.assertTrue(FrameSet('3,5,7-x2') <= FrameSet('1-x2'))
+        self.assertFalse(FrameSet('1-x2') <= FrameSet('3,7-x2'))
+        self.assertFalse(FrameSet('1-10') >= FrameSet('5-'))
+
+        self.assertEqual(str(FrameSet('1-') - FrameSet('1-x2')), '2-x2')
+        self.assertEqual(str(FrameSet('1-x3') - FrameSet('4-x6')), '1-x6')
+        self.assertEqual(str(FrameSet('1-x2') - FrameSet('2-x2')), '1-x2')
+        self.assertEqual(str(FrameSet('1-') - FrameSet('50,1-x2')), '2-48x2,52-x2')
+
+        # ranges on the same step that fill in each other merge to a finer step
+        self.assertEqual(FrameSet('1-x2') | FrameSet('2-x2'), FrameSet('1-'))
+        self.assertEqual(str(FrameSet('1-x4') | FrameSet('7-x4')), '1,5-x2')
+        self.assertEqual(str(FrameSet('1-x4') | FrameSet('3-x4')), '1-x2')
+        self.assertEqual(str(FrameSet('10-x6') | FrameSet('1-x6')), '1,7-x3')
+        self.assertEqual(str(FrameSet('1-x2') ^ FrameSet('2-x2')), '1-')
+        self.assertEqual(str(FrameSet('1-x2').union(FrameSet('4-x2'), [2])), '1-')
+
+        # open-ended ranges on unrelated steps can not be combined
+        self.assertRaises(exceptions.MaxSizeException, FrameSet('1-x2').__or__, FrameSet('2-x3'))
+        self.assertRaises(exceptions.MaxSizeException, FrameSet('1-x4').__or__, FrameSet('2-x4'))
+        self.assertRaises(exceptions.MaxSizeException, FrameSet('1-x2').__xor__, FrameSet('2-x4'))
+        self.assertRaises(exceptions.MaxSizeException, FrameSet('1-').__sub__, FrameSet('1-x3'))
+
+    def testOpenEndedSetOperationsExhaustive(self):
+        # every result is either right, or can not be written as a frame range:
+        # past the frames and the starts of both, the frames repeat every lcm
+        # of the steps, and must be the frames of a single open-ended range
+        ops = {'__or__': operator.or_, '__and__': operator.and_,
+               '__sub__': lambda x, y: x and not y, '__xor__': operator.xor}
+        sets = [FrameSet('{0}{1}-x{2}'.format(frame, start, step))
+                for frame in ('', '3,', '7,') for start in xrange(4) for step in xrange(1, 5)]
+        for a, b in product(sets, repeat=2):
+            horizon = max(list(a._items) + list(b._items) + [a._open[0], b._open[0]]) + 1
+            lcm = a._open[1] * b._open[1] // utils.gcd(a._open[1], b._open[1])
+            for name, op in ops.iteritems():
+                expected = lambda f: bool(op(f in a, f in b))
+                try:
+                    result = getattr(a, name)(b)
+                except exceptions.MaxSizeException:
+                    repeats = [f for f in xrange(horizon, horizon + lcm) if expected(f)]
+                    step = reduce(utils.gcd, [f - repeats[0] for f in repeats], lcm)
+                    self.assertNotEqual(len(repeats), lcm // step)
+                    continue
+                for f in xrange(-1, horizon + 2 * lcm):
+                    self.assertEqual(f in result, expected(f))
+                self.assertEqual(result, FrameSet(str(result)))
+
+        seq = FileSequence('/path/to/file.1001-#.exr')
+        self.assertEqual(str(seq), '/path/to/file.1001-#.exr')
+        self.assertEqual(seq.start(), 1001)
+        self.assertEqual(seq[1], '/path/to/file.1002.exr')
+
+    def testIterBatches(self):
+        fs = FrameSet('1-5,10')
+        self.assertEqual(list(fs.iterBatches(2)), [(1, 2), (3, 4), (5, 10)])
+        self.assertEqual(list(fs.iterBatches(4)), [(1, 2, 3, 4), (5, 10)])
+        self.assertEqual(list(fs.iterBatches(100)), [(1, 2, 3, 4, 5, 10)])
+        self.assertEqual(list(FrameSet('').iterBatches(3)), [])
+        self.assertEqual(list(islice(FrameSet('1-3,10-').iterBatches(2), 3)),
+                         [(1, 2), (3, 10), (11, 12)])
+        self.assertRaises(ValueError, fs.iterBatches, 0)
+
+        seq = FileSequence('/path/to/file.-2-3#.exr')
+        self.assertEqual(list(seq.iterBatches(4)), [tuple(seq)[:4], tuple(seq)[4:]])
+        seq = FileSequence('/path/%to/file.1-3@@.exr')
+        self.assertEqual(list(seq.iterBatches(2)), [tuple(seq)[:2], tuple(seq)[2:]])
+        for path in ('/path/to/file.exr', '/path/to/file.1-3.exr'):
+            seq = FileSequence(path)
+            self.assertEqual(list(seq.iterBatches(2)), [tuple(seq)])
+        self.assertRaises(ValueError, seq.iterBatches, 0)
+
+    def testToArray(self):
+        fs = FrameSet('1-3,10,-5,200-100x50')
+        packed = fs.toArray()
+        self.assertEqual(packed.typecode, 'l')
+        self.assertEqual(packed.tolist(), list(fs))
+        self.assertEqual(fs.toArray('i').tolist(), list(fs))
+        self.assertEqual(len(FrameSet('').toArray()), 0)
+        self.assertRaises(OverflowError, FrameSet('100000').toArray, 'h')
+        self.assertRaises(exceptions.MaxSizeException, FrameSet('1-').toArray)
+
+        self.assertEqual(FrameSet.fromBuffer(packed), fs)
+        self.assertEqual(FrameSet.fromBuffer(packed.tostring()), fs)
+        self.assertEqual(FrameSet.fromBuffer(bytearray(packed.tostring())), fs)
+        self.assertEqual(FrameSet.fromBuffer(memoryview(packed.tostring())), fs)
+        self.assertEqual(FrameSet.fromBuffer(fs.toArray('i').tostring(), 'i'), fs)
+        self.assertEqual(str(FrameSet.fromBuffer(array('l', [3, 1, 3, 2]))), '3,1-2')
+        self.assertRaises(ValueError, FrameSet.fromBuffer, 'abc')
+        self.assertRaises(exceptions.MaxSizeException, FrameSet.fromBuffer, packed, maxSize=3)
+
+        with fileseq.SharedFrameSet.create(fs) as shared:
+            self.assertEqual(shared.toArray(), packed)
+
+    def testOffset(self):
+        table = [
+            ('', 5, ''),
+            ('1-10', 100, '101-110'),
+            ('1-10x3,20', -21, '-20--11x3,-1'),
+            ('10-1,5', 1, '11-2,6'),
+            ('1-20:4,1-20y5', 10, '11-30:4,11-30y5'),
+            ('1-3,10-x2', 5, '6-8,15-x2'),
+        ]
+        for src, n, expected in table:
+            fs = FrameSet(src).offset(n)
+            self.assertEqual(str(fs), expected)
+            self.assertEqual(fs, FrameSet(expected))
+
+    def testScale(self):
+        table = [
+            ('1-10', 2, '2-20x2'),
+            ('1-10x3,20', 3, '3-30x9,60'),
+            ('1-10', -1, '-1--10'),
+            ('1-10y3', 2, '4,6,10,12,16,18'),
+            ('0,1-', 2, '0-x2'),
+        ]
+        for src, k, expected in table:
+            fs = FrameSet(src).scale(k)
+            self.assertEqual(str(fs), expected)
+            self.assertEqual(list(islice(fs, 100)), [f * k for f in islice(FrameSet(src), 100)])
+        self.assertRaises(ValueError, FrameSet('1-10').scale, 0)
+        self.assertRaises(exceptions.MaxSizeException, FrameSet('1-').scale, -1)
+
+    def testClamp(self):
+        table = [
+            ('1-100x10,200', 15, 150, '21-100x10'),
+            ('1-100', None, 10, '1-10'),
+            ('100-1x7', 10, 50, '44-10x7'),
+            ('1-10,20-30', 12, 18, ''),
+            ('1-20y4', 5, 10, '6-8,10'),
+            ('1-5,10-x5', 3, 26, '3-4,5-26x5'),
+            ('1-5,10-x5', 12, None, '15-x5'),
+        ]
+        for src, start, end, expected in table:
+            fs = FrameSet(src).clamp(start, end)
+            self.assertEqual(str(fs), expected)
+            self.assertEqual(fs, FrameSet(expected))
+
+    def testSequenceTransforms(self):
+        seq = FileSequence('/path/to/file.1-10#.exr')
+        self.assertEqual(str(seq.offset(1000)), '/path/to/file.1001-1010#.exr')
+        self.assertEqual(str(seq.scale(2)), '/path/to/file.2-20x2#.exr')
+        self.assertEqual(str(seq.clamp(3, 5)), '/path/to/file.3-5#.exr')
+        self.assertEqual(seq.offset(1000)[0], '/path/to/file.1001.exr')
+        self.assertEqual(str(seq), '/path/to/file.1-10#.exr')
+        self.assertEqual(str(FileSequence('/path/to/file.exr').offset(5)), '/path/to/file.exr')
+
     def testSlicing(self):
         Case = namedtuple('Case', ['input', 'slice', 'expected'])
         table = [
@@ -267,6 +659,13 @@ class TestFileSequence(TestBase):
         seq = FileSequence("/cheech/chong.1,3,5#.exr")
         self.assertFalse(known.difference(seq))
 
+    def testFromSorted(self):
+        for frames in ([], [5], [1, 2, 3, 10, 12, 14], [-3, -1, 0, 7]):
+            fs = FrameSet._from_sorted(frames)
+            self.assertEqual(fs, FrameSet(frames))
+            self.assertEqual(str(fs), str(FrameSet(frames)))
+            self.assertEqual(fs.order, tuple(frames))
+
     def testSlicing(self):
         Case = namedtuple('Case', ['input', 'slice', 'expected'])
         table = [
@@ -526,10 +925,78 @@ class TestFileSequence(TestBase):
         actual = set(str(fs) for fs in FileSequence.yield_sequences_in_list(paths))
         self.assertEquals(actual, expected)
 
+        actual = set(str(fs) for fs in FileSequence.yield_sequences_in_list(sorted(paths), presorted=True))
+        self.assertEquals(actual, expected)
+
         paths = imap(_CustomPathString, paths)
         actual = set(str(fs) for fs in FileSequence.yield_sequences_in_list(paths))
         self.assertEquals(actual, {str(_CustomPathString(p)) for p in expected})
 
+    def test_yield_sequences_in_list_presorted(self):
+        consumed = []
+
+        def paths():
+            for i in xrange(1, 4):
+                for frame in xrange(1, 6):
+                    path = '/path/shot%d/foo.%04d.exr' % (i, frame)
+                    consumed.append(path)
+                    yield path
+
+        seqs = FileSequence.yield_sequences_in_list(paths(), presorted=True)
+        first = next(seqs)
+        self.assertEqual(str(first), '/path/shot1/foo.1-5#.exr')
+        # the first sequence is complete once the next one starts
+        self.assertEqual(len(consumed), 6)
+        rest = [str(s) for s in seqs]
+        self.assertEqual(rest, ['/path/shot2/foo.1-5#.exr', '/path/shot3/foo.1-5#.exr'])
+
+        unsorted = ['/path/foo.0002.exr', '/path/foo.0001.exr']
+        with self.assertRaises(FileSeqException):
+            list(FileSequence.yield_sequences_in_list(unsorted, presorted=True))
+
+    def test_yield_sequences_in_list_mixed_padding(self):
+        paths = ['/path/foo.0009.exr', '/path/foo.0010.exr', '/path/foo.11.exr',
+                 '/path/foo.0010.exr', '/path/foo.100.exr']
+        seqs = list(FileSequence.yield_sequences_in_list(paths))
+        self.assertEqual(len(seqs), 1)
+        # frames of every width are merged, padded to the narrowest
+        self.assertEqual(str(seqs[0]), '/path/foo.9-11,100@@.exr')
+        self.assertEqual(list(seqs[0].frameSet()), [9, 10, 11, 100])
+
+    def test_yield_sequences_in_list_split_padding(self):
+        paths = ['/path/foo.0009.exr', '/path/foo.0010.exr', '/path/foo.11.exr',
+                 '/path/foo.-1.exr', '/path/foo.100.exr', '/path/bar.1.exr']
+        expected = {'/path/foo.9-10#.exr', '/path/foo.-1,11@@.exr',
+                    '/path/foo.100@@@.exr', '/path/bar.1@.exr'}
+
+        actual = set(str(s) for s in FileSequence.yield_sequences_in_list(paths, splitPadding=True))
+        self.assertEqual(actual, expected)
+
+        actual = set(str(s) for s in FileSequence.yield_sequences_in_list(
+            sorted(paths), presorted=True, splitPadding=True))
+        self.assertEqual(actual, expected)
+
+        actual = set(str(s) for s in FileSequence.findSequencesInList(
+            paths, workers=2, splitPadding=True))
+        self.assertEqual(actual, expected)
+
+    def testFindSequencesInListWorkers(self):
+        paths = []
+        for i in xrange(20):
+            for frame in xrange(1, 11):
+                if frame == 5 and i % 2:
+                    continue
+                paths.append('/path/shot%d/foo.%04d.exr' % (i, frame))
+                paths.append('/path/shot%d/bar_v%d.%d.jpg' % (i, i, frame))
+            paths.append('/path/shot%d/notes.txt' % i)
+        paths.append('relative.0001.exr')
+        paths.append('C:\\path\\win.0001.exr')
+
+        expected = sorted(str(s) for s in FileSequence.findSequencesInList(paths))
+        actual = sorted(str(s) for s in FileSequence.findSequencesInList(paths, workers=3))
+        self.assertEqual(actual, expected)
+        self.assertEqual(len(actual), 62)
+
     def testIgnoreFrameSetStrings(self):
         for char in "xy:,".split():
             fs = FileSequence("/path/to/file{0}1-1x1#.exr".format(char))
@@ -583,6 +1050,22 @@ class TestFindSequencesOnDisk(TestBase):
             expected = self.toNormpaths(expected)
             self.assertEqual(actual, expected)
 
+    def testSplitPadding(self):
+        seqs = findSequencesOnDisk("mixed", splitPadding=True)
+        actual = sorted(str(s) for s in seqs)
+        expected = sorted(["mixed/seq.-1-5@@.ext", "mixed/seq.-1-5#.ext",
+                           "mixed/seq.-1-5@@@@@.ext"])
+        self.assertEqual(actual, self.toNormpaths(expected))
+
+        # each split matches the strict padding search for its width
+        for pattern in ("mixed/seq.@@.ext", "mixed/seq.#.ext", "mixed/seq.@@@@@.ext"):
+            strict = findSequencesOnDisk(pattern, strictPadding=True)
+            self.assertEqual(len(strict), 1)
+            self.assertTrue(str(strict[0]) in actual)
+
+        seqs = findSequencesOnDisk(["mixed/seq.*.ext"], splitPadding=True)
+        self.assertEqual(len(seqs["mixed/seq.*.ext"]), 3)
+
     def testNegSequencesOnDisk(self):
         seqs = findSequencesOnDisk("seqneg")
         self.assertEquals(1, len(seqs))
@@ -624,6 +1107,32 @@ class TestFindSequencesOnDisk(TestBase):
         found = set([str(s) for s in seqs])
         self.assertEqualPaths(known, found)
 
+    def testMultiplePatterns(self):
+        patterns = [
+            "seq/foo.#.exr",
+            "seq/foo.{debug,missing}.#.exr",
+            "seq/*.exr",
+            "seq/bar@@@.exr",
+            "seqhidden/bar#.exr",
+            "nonexistent/foo.#.exr",
+        ]
+        results = findSequencesOnDisk(patterns, strictPadding=True)
+        self.assertEqual(set(results.keys()), set(patterns))
+
+        for pattern in patterns:
+            actual = self.toNormpaths([str(s) for s in results[pattern]])
+            expected = self.toNormpaths([str(s) for s in findSequencesOnDisk(pattern, strictPadding=True)])
+            self.assertEqual(actual, expected)
+
+        self.assertEqualPaths([str(s) for s in results["seq/foo.#.exr"]], ["seq/foo.1-5#.exr"])
+        self.assertEqual(len(results["seq/*.exr"]), 6)
+        self.assertEqual(results["seq/bar@@@.exr"], [])
+        self.assertEqual(results["nonexistent/foo.#.exr"], [])
+
+    def testMultiplePatternsInvalid(self):
+        with self.assertRaises(FileSeqException):
+            findSequencesOnDisk(["seq/foo.#.exr", "seq/foo[z-a].#.exr"])
+
     def testCrossPlatformPathSep(self):
         expected = {
             "seqsubdirs/sub1/1-3#.exr",
@@ -651,6 +1160,77 @@ class TestFindSequencesOnDisk(TestBase):
             os.path.join = _join
 
 
+class TestFindSequencesOnDiskStats(TestBase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        sizes = {1: 10, 2: 0, 3: 20, 4: 5}
+        for frame, size in sizes.iteritems():
+            path = os.path.join(self.tmpdir, 'foo.%04d.exr' % frame)
+            with open(path, 'wb') as f:
+                f.write('x' * size)
+            os.utime(path, (1000 + frame, 1000 + frame))
+        open(os.path.join(self.tmpdir, 'single.txt'), 'wb').close()
+        os.mkdir(os.path.join(self.tmpdir, 'subdir'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def testFrameStats(self):
+        for workers in (1, 4):
+            seqs = findSequencesOnDisk(self.tmpdir, stats=True, workers=workers)
+            self.assertEqual(len(seqs), 2)
+            seq = [s for s in seqs if s.basename() == 'foo.'][0]
+
+            self.assertEqual(sorted(seq.frameStats().keys()), [1, 2, 3, 4])
+            self.assertEqual(seq.frameStats()[3].size, 20)
+            self.assertEqual(seq.totalSize(), 35)
+            self.assertEqual(list(seq.undersizedFrames()), [2])
+            self.assertEqual(list(seq.undersizedFrames(10)), [2, 4])
+            self.assertEqual(seq.oldestFrame(), 1)
+            self.assertEqual(seq.newestFrame(), 4)
+
+            # stats follow the frames of a sliced sequence
+            self.assertEqual(seq[2:].totalSize(), 25)
+
+            single = [s for s in seqs if s.basename() == 'single'][0]
+            self.assertEqual(single.frameStats().keys(), [None])
+            self.assertEqual(single.totalSize(), 0)
+
+    def testPatternStats(self):
+        seqs = findSequencesOnDisk(os.path.join(self.tmpdir, 'foo.#.exr'), stats=True)
+        self.assertEqual(len(seqs), 1)
+        self.assertEqual(seqs[0].totalSize(), 35)
+
+    def testSplitPaddingStats(self):
+        with open(os.path.join(self.tmpdir, 'foo.03.exr'), 'wb') as f:
+            f.write('x' * 7)
+        seqs = findSequencesOnDisk(self.tmpdir, stats=True, splitPadding=True)
+        sizes = dict((s.padding(), s.totalSize()) for s in seqs if s.basename() == 'foo.')
+        self.assertEqual(sizes, {'#': 35, '@@': 7})
+
+    def testMergedPaddingStats(self):
+        for name, size in (('bar.1.exr', 1), ('bar.01.exr', 2), ('bar.2.exr', 4)):
+            with open(os.path.join(self.tmpdir, name), 'wb') as f:
+                f.write('x' * size)
+        seq = [s for s in findSequencesOnDisk(self.tmpdir, stats=True)
+               if s.basename() == 'bar.'][0]
+        self.assertEqual(seq.zfill(), 1)
+        self.assertEqual(seq.frameStats()[1].size, 1)
+        self.assertEqual(seq.totalSize(), 5)
+        self.assertEqual(seq.frameStatCollisions().keys(), [1])
+        self.assertEqual(sorted(seq.frameStatCollisions()[1]), ['01', '1'])
+
+        foo = [s for s in findSequencesOnDisk(self.tmpdir, stats=True)
+               if s.basename() == 'foo.'][0]
+        self.assertEqual(foo.frameStatCollisions(), {})
+
+    def testNoStats(self):
+        seq = findSequencesOnDisk(os.path.join(self.tmpdir, 'foo.#.exr'))[0]
+        self.assertTrue(seq.frameStats() is None)
+        self.assertRaises(FileSeqException, seq.totalSize)
+
+
 class TestFindSequenceOnDisk(TestBase):
 
     def testFindSequenceOnDisk(self):
@@ -728,6 +1308,28 @@ class TestFindSequenceOnDisk(TestBase):
         finally:
             os.path = _path
 
+    def testPrefixBasenames(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            names = ['beauty.0001.exr', 'beauty.0002.exr', 'beauty_denoise.0001.exr',
+                     'beauty.0003.exr.bak', 'beauty.v2.exr', 'beauty.0001.jpg']
+            for name in names:
+                open(os.path.join(tmpdir, name), 'w').close()
+
+            seq = findSequenceOnDisk(os.path.join(tmpdir, 'beauty.#.exr'))
+            self.assertEqual(seq.basename(), 'beauty.')
+            self.assertEqual(seq.frameRange(), '0001-0002')
+            self.assertEqual(seq.dirname(), os.path.join(tmpdir, ''))
+
+            seq = findSequenceOnDisk(os.path.join(tmpdir, 'beauty_denoise.#.exr'))
+            self.assertEqual(seq.frameRange(), '0001')
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def testWildcardDirname(self):
+        seq = findSequenceOnDisk("se?/foo.#.exr")
+        self.assertEqual(str(seq), "seq/foo.1-5#.exr")
+
     def testPaddingMatch(self):
         tests = [
             ("mixed/seq.#.ext", "mixed/seq.-1-5#.ext"),
@@ -752,6 +1354,550 @@ class TestFindSequenceOnDisk(TestBase):
             actual = str(seq)
             self.assertEqual(actual, expected)
 
+    def testExistingFrames(self):
+        seq = FileSequence("seq/bar1000-1010#.exr")
+        self.assertEqual(str(seq.existingFrames()), "1000-1002,1004-1006")
+        self.assertEqual(str(seq.missingOnDisk()), "1003,1007-1010")
+
+        # the padding must match exactly
+        seq = FileSequence("seq/foo.1-5@@.exr")
+        self.assertEqual(str(seq.existingFrames()), "")
+        self.assertEqual(str(seq.missingOnDisk()), "1-5")
+        seq = FileSequence("seq/foo.3-8#.exr")
+        self.assertEqual(str(seq.existingFrames()), "3-5")
+
+        self.assertTrue(FileSequence("seq/foo.exr").existingFrames() is None)
+        self.assertTrue(FileSequence("seq/foo.exr").missingOnDisk() is None)
+        self.assertEqual(str(FileSequence("nope/foo.1-5#.exr").missingOnDisk()), "1-5")
+
+        # open-ended ranges are bounded by the frames found on disk
+        seq = FileSequence("seq/bar1001-#.exr")
+        self.assertEqual(str(seq.existingFrames()), "1001-1002,1004-1006")
+        self.assertEqual(str(seq.missingOnDisk()), "1003")
+        seq = FileSequence("seq/bar998,1005-x2#.exr")
+        self.assertEqual(str(seq.existingFrames()), "1005")
+        self.assertEqual(str(seq.missingOnDisk()), "998")
+        self.assertEqual(str(FileSequence("nope/foo.1-#.exr").existingFrames()), "")
+        self.assertEqual(str(FileSequence("nope/foo.1-#.exr").missingOnDisk()), "")
+
+
+class TestSequenceFileOperations(TestBase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.src = os.path.join(self.tmpdir, 'src')
+        os.mkdir(self.src)
+        for frame in xrange(1, 6):
+            with open(os.path.join(self.src, 'foo.%04d.exr' % frame), 'wb') as f:
+                f.write('x' * frame)
+        self.seq = findSequenceOnDisk(os.path.join(self.src, 'foo.#.exr'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def testCopyTo(self):
+        calls = []
+        progress = lambda src, dst, nbytes: calls.append((src, dst, nbytes))
+        dest = os.path.join(self.tmpdir, 'out', 'bar_v001.#.exr')
+
+        target = self.seq.copyTo(dest, workers=3, renumber=1000, progress=progress)
+        self.assertEqual(str(target), os.path.join(self.tmpdir, 'out', 'bar_v001.1001-1005#.exr'))
+        self.assertEqual(str(findSequenceOnDisk(dest)), str(target))
+        for frame in xrange(1, 6):
+            with open(target.frame(frame + 1000), 'rb') as f:
+                self.assertEqual(f.read(), 'x' * frame)
+        self.assertEqual(sorted(nbytes for _, _, nbytes in calls), [1, 2, 3, 4, 5])
+        # the source is left in place
+        self.assertEqual(len(findSequenceOnDisk(str(self.seq))), 5)
+
+        # frames already copied with the same size are skipped
+        os.remove(target.frame(1003))
+        del calls[:]
+        self.seq.copyTo(dest, workers=2, renumber=1000, resume=True, progress=progress)
+        self.assertEqual(sorted(nbytes for _, _, nbytes in calls), [0, 0, 0, 0, 3])
+
+        openSeq = FileSequence(os.path.join(self.src, 'foo.1-#.exr'))
+        self.assertRaises(FileSeqException, openSeq.copyTo, dest)
+
+    def testCopyToDirectory(self):
+        dest = os.path.join(self.tmpdir, 'out')
+        os.mkdir(dest)
+        target = self.seq.copyTo(dest, renumber={1: 10})
+        self.assertEqual(str(target), os.path.join(dest, 'foo.2-5,10#.exr'))
+        self.assertTrue(os.path.isfile(os.path.join(dest, 'foo.0010.exr')))
+
+        self.assertRaises(FileSeqException, self.seq.copyTo, dest, renumber={1: 2})
+        self.assertRaises(FileSeqException, self.seq.copyTo, os.path.join(dest, 'single.exr'))
+
+    def testMoveTo(self):
+        dest = os.path.join(self.tmpdir, 'out', 'foo.@.exr')
+        target = self.seq.moveTo(dest, workers=2, renumber=-1)
+        self.assertEqual(str(target), os.path.join(self.tmpdir, 'out', 'foo.0-4@.exr'))
+        self.assertEqual(sorted(os.listdir(os.path.dirname(dest))),
+                         ['foo.%d.exr' % f for f in xrange(5)])
+        self.assertEqual(os.listdir(self.src), [])
+
+        openSeq = FileSequence(os.path.join(self.tmpdir, 'out', 'foo.0-@.exr'))
+        self.assertRaises(FileSeqException, openSeq.moveTo, self.src)
+        self.assertEqual(len(os.listdir(os.path.dirname(dest))), 5)
+
+    def testMoveToOverlap(self):
+        target = self.seq.moveTo(self.seq, renumber=1)
+        self.assertEqual(str(target), os.path.join(self.src, 'foo.2-6#.exr'))
+        for frame in xrange(2, 7):
+            with open(target.frame(frame), 'rb') as f:
+                self.assertEqual(f.read(), 'x' * (frame - 1))
+
+    def testRenumber(self):
+        calls = []
+        progress = lambda src, dst, nbytes: calls.append((src, dst))
+
+        # overlapping shifts in both directions
+        for offset, expected in ((2, 'foo.3-7#.exr'), (-1, 'foo.2-6#.exr'), (999, 'foo.1001-1005#.exr')):
+            del calls[:]
+            self.seq = self.seq.renumber(offset, workers=3, progress=progress)
+            self.assertEqual(str(self.seq), os.path.join(self.src, expected))
+            self.assertEqual(str(findSequenceOnDisk(str(self.seq))), str(self.seq))
+            self.assertEqual(len(calls), 5)
+            self.assertEqual(len(os.listdir(self.src)), 5)
+
+        with open(self.seq.frame(1005), 'rb') as f:
+            self.assertEqual(f.read(), 'x' * 5)
+
+        # swap two frames
+        self.seq.renumber({1001: 1002, 1002: 1001}, workers=2)
+        with open(self.seq.frame(1001), 'rb') as f:
+            self.assertEqual(f.read(), 'xx')
+        with open(self.seq.frame(1002), 'rb') as f:
+            self.assertEqual(f.read(), 'x')
+
+    def testRenumberCollisions(self):
+        self.assertRaises(FileSeqException, self.seq.renumber, {1: 2})
+
+        # a frame outside the sequence is never overwritten
+        seq = self.seq[:3]
+        self.assertRaises(FileSeqException, seq.renumber, 2)
+        self.assertEqual(str(findSequenceOnDisk(str(self.seq))), str(self.seq))
+
+        openSeq = FileSequence(os.path.join(self.src, 'foo.1-#.exr'))
+        self.assertRaises(FileSeqException, openSeq.renumber, 10)
+        self.assertEqual(str(findSequenceOnDisk(str(self.seq))), str(self.seq))
+
+    def testChecksums(self):
+        sums = self.seq.checksums(workers=3)
+        expected = dict((f, hashlib.sha1('x' * f).hexdigest()) for f in xrange(1, 6))
+        self.assertEqual(sums.frames, expected)
+        self.assertEqual(sums.digest, hashlib.sha1(''.join(expected[f] for f in xrange(1, 6))).hexdigest())
+
+        # memory-mapped hashing gives the same digests
+        _minSize = utils.MMAP_MIN_SIZE
+        try:
+            utils.MMAP_MIN_SIZE = 1
+            self.assertEqual(self.seq.checksums('sha1'), sums)
+        finally:
+            utils.MMAP_MIN_SIZE = _minSize
+
+        # the sequence digest only depends on the contents
+        copied = self.seq.copyTo(os.path.join(self.tmpdir, 'out', 'bar.@.exr'), renumber=100)
+        self.assertEqual(copied.checksums().digest, sums.digest)
+        self.assertNotEqual(self.seq.checksums('md5').digest, sums.digest)
+        self.assertRaises(ValueError, self.seq.checksums, 'nope')
+        openSeq = FileSequence(os.path.join(self.src, 'foo.1-#.exr'))
+        self.assertRaises(FileSeqException, openSeq.checksums)
+
+    def testChecksumsCache(self):
+        hashed = []
+        _hashFile = utils.hashFile
+
+        def hashFile(path, *args, **kwargs):
+            hashed.append(path)
+            return _hashFile(path, *args, **kwargs)
+
+        utils.hashFile = hashFile
+        try:
+            for cache in ({}, os.path.join(self.tmpdir, 'cache.db')):
+                del hashed[:]
+                sums = self.seq.checksums(cache=cache)
+                self.assertEqual(len(hashed), 5)
+                self.assertEqual(self.seq.checksums(cache=cache), sums)
+                self.assertEqual(len(hashed), 5)
+
+                # only the modified frame is hashed again
+                path = self.seq.frame(3)
+                st = os.stat(path)
+                os.utime(path, (st.st_atime, st.st_mtime + 10))
+                self.assertEqual(self.seq.checksums(cache=cache), sums)
+                self.assertEqual(hashed[5:], [path])
+        finally:
+            utils.hashFile = _hashFile
+
+        os.remove(self.seq.frame(2))
+        self.assertRaises(FileSeqException, self.seq.checksums)
+
+    def testRemove(self):
+        os.remove(self.seq.frame(2))
+
+        # an open-ended sequence only removes the frames it is given
+        openSeq = FileSequence(os.path.join(self.src, 'foo.2-#.exr'))
+        self.assertRaises(FileSeqException, openSeq.remove)
+        self.assertRaises(FileSeqException, openSeq.remove, dry_run=True)
+        self.assertRaises(FileSeqException, openSeq.remove, '3-')
+        result = openSeq.remove('1-3,10', dry_run=True)
+        self.assertEqual((str(result.removed), str(result.missing)), ('3', '2,10'))
+
+        result = self.seq.remove('1-3', dry_run=True)
+        self.assertEqual((str(result.removed), str(result.missing)), ('1,3', '2'))
+        self.assertEqual(len(os.listdir(self.src)), 4)
+
+        result = self.seq.remove(FrameSet('1-3,10'), workers=2)
+        self.assertEqual((str(result.removed), str(result.missing)), ('1,3', '2'))
+        self.assertEqual(sorted(os.listdir(self.src)), ['foo.0004.exr', 'foo.0005.exr'])
+        self.assertTrue(result.elapsed >= 0)
+
+        result = self.seq.remove(workers=4)
+        self.assertEqual((str(result.removed), str(result.missing)), ('4-5', '1-3'))
+        self.assertEqual(os.listdir(self.src), [])
+
+        self.assertRaises(FileSeqException, FileSequence(self.src + '/single.exr').remove)
+
+
+class TestCli(TestBase):
+
+    def run_ls(self, *args):
+        out, err = StringIO(), StringIO()
+        status = cli.main(['ls'] + list(args), out=out, err=err)
+        return status, out.getvalue().splitlines(), err.getvalue()
+
+    def testLs(self):
+        status, lines, _ = self.run_ls('seq', '--strict-padding')
+        self.assertEqual(status, 0)
+        self.assertEqual(set(lines), set(str(s) for s in findSequencesOnDisk('seq')))
+        # each directory is written in sorted order
+        self.assertEqual(lines, sorted(lines))
+
+    def testLsPattern(self):
+        status, lines, _ = self.run_ls('--missing', 'seq/bar#.exr')
+        self.assertEqual(status, 0)
+        self.assertEqual(lines, ['seq/bar1000-1002,1004-1006#.exr\t1003'])
+
+        status, lines, _ = self.run_ls('--json', '--missing', 'seq/bar#.exr')
+        data = json.loads(lines[0])
+        self.assertEqual(data['path'], 'seq/bar1000-1002,1004-1006#.exr')
+        self.assertEqual((data['start'], data['end'], data['length']), (1000, 1006, 6))
+        self.assertEqual(data['missing'], '1003')
+
+    def testLsRecursive(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            for subdir in ('a', 'a/b', 'c', '.hidden'):
+                os.mkdir(os.path.join(tmpdir, subdir))
+                for frame in (1, 2, 3):
+                    path = os.path.join(tmpdir, subdir, 'foo.%04d.exr' % frame)
+                    open(path, 'wb').close()
+            open(os.path.join(tmpdir, 'a', 'bar.txt'), 'wb').close()
+
+            status, lines, _ = self.run_ls('-R', '-j', '3', tmpdir)
+            self.assertEqual(status, 0)
+            expected = [os.path.join(tmpdir, d, 'foo.1-3#.exr') for d in ('a', 'a/b', 'c')]
+            expected.append(os.path.join(tmpdir, 'a', 'bar.txt'))
+            self.assertEqual(sorted(lines), sorted(expected))
+
+            status, lines, _ = self.run_ls('-R', os.path.join(tmpdir, '*.#.exr'))
+            self.assertEqual(len(lines), 3)
+
+            status, lines, _ = self.run_ls('-R', '-a', tmpdir)
+            self.assertEqual(len(lines), 5)
+        finally:
+            shutil.rmtree(tmpdir)
+
+    def testLsStrictPadding(self):
+        # the file patterns match the files that findSequencesOnDisk finds
+        for pattern in ('mixed/seq.@@.ext', 'mixed/seq.#.ext', 'mixed/seq.*.ext', 'seq/foo_##.exr'):
+            for args in ((), ('--strict-padding',)):
+                status, lines, _ = self.run_ls(pattern, *args)
+                self.assertEqual(status, 0)
+                expected = findSequencesOnDisk(pattern, strictPadding=bool(args))
+                self.assertEqual(lines, sorted(str(s) for s in expected))
+
+    def testLsMissingDirectory(self):
+        status, lines, err = self.run_ls('seq', 'does/not/exist/foo.#.exr')
+        self.assertEqual(status, 1)
+        self.assertTrue(lines)
+        self.assertTrue('does/not/exist' in err)
+
+
+class TestBench(unittest.TestCase):
+
+    def testRunBenchmarks(self):
+        report = bench.runBenchmarks(scale=0.0005, repeat=1)
+        names = [r['name'] for r in report['results']]
+        for name in ('FrameSet.parse.stagger', 'FileSequence.iter',
+                     'yield_sequences_in_list', 'findSequencesOnDisk'):
+            self.assertTrue(name in names)
+        # the report can be saved, and compared with itself
+        report = json.loads(json.dumps(report))
+        ratios = [ratio for _, _, _, ratio in bench.compareReports(report, report)]
+        self.assertEqual(ratios, [1.0] * len(names))
+
+    def testMainCompareJson(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            first = os.path.join(tmpdir, 'r1.json')
+            second = os.path.join(tmpdir, 'r2.json')
+            args = ['split', '--scale', '0.0005', '--repeat', '1', '--json']
+            self.assertEqual(bench.main(args + ['--output', first]), 0)
+            self.assertEqual(bench.main(args + ['--output', second, '--compare', first]), 0)
+            with open(second) as f:
+                report = json.load(f)
+            names = [r['name'] for r in report['compare']['results']]
+            self.assertEqual(names, [r['name'] for r in report['results']])
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+class TestInstrument(TestBase):
+
+    def setUp(self):
+        instrument.reset()
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def testDisabled(self):
+        FrameSet('1-10')
+        findSequencesOnDisk('seq')
+        self.assertEqual(instrument.snapshot(), {'counters': {}, 'timers': {}})
+
+    def testCounters(self):
+        events = []
+        with instrument.collecting(hook=lambda name, value: events.append(name)):
+            FrameSet('1-10,20-25')
+            FrameSet([1, 2, 3])
+            seqs = findSequencesOnDisk('seq')
+            FileSequence.compilePattern('instrumented.#.exr')
+            FileSequence.compilePattern('instrumented.#.exr')
+            list(FileSequence.yield_sequences_in_list(['a.0001.exr', 'a.0002.exr', 'b.txt']))
+            self.assertRaises(exceptions.MaxSizeException, FrameSet, '1-100000000')
+        self.assertFalse(instrument.ENABLED)
+
+        snap = instrument.snapshot()
+        counters, timers = snap['counters'], snap['timers']
+        self.assertEqual(timers['FrameSet.parse']['count'], 1)
+        self.assertTrue(counters['FrameSet.frames'] >= 19)
+        self.assertEqual(counters['MaxSizeException'], 1)
+        self.assertEqual(counters['cache.pattern.miss'], 1)
+        self.assertEqual(counters['cache.pattern.hit'], 1)
+        self.assertEqual(timers['disk.listdir']['count'], 1)
+        self.assertEqual(counters['disk.entries'], len(os.listdir('seq')))
+        self.assertEqual(counters['grouping.paths'], len(os.listdir('seq')) + 3)
+        self.assertEqual(counters['grouping.sequences'], len(seqs) + 2)
+        self.assertTrue('disk.entries' in events and 'FrameSet.parse' in events)
+
+        # nothing more is recorded once disabled
+        FrameSet('1-10')
+        self.assertEqual(instrument.snapshot(), snap)
+
+
+def _sharedFrameCount(args):
+    shared, frames = args
+    return len(shared), sum(1 for f in frames if f in shared)
+
+
+class TestSharedFrameSet(unittest.TestCase):
+
+    def testMatchesFrameSet(self):
+        for src in ('', '7', '1-100', '10-1', '1,5,2,8,3', '1-100x3,200-150,7,500-1000y3'):
+            fs = FrameSet(src)
+            with fileseq.SharedFrameSet.create(fs) as shared:
+                self.assertEqual(list(shared), list(fs))
+                self.assertEqual(len(shared), len(fs))
+                self.assertEqual(bool(shared), bool(fs))
+                for f in xrange(-5, 1100):
+                    self.assertEqual(f in shared, f in fs, (src, f))
+                for i, f in enumerate(fs):
+                    self.assertEqual(shared[i], f)
+                    self.assertEqual(shared.index(f), i)
+                self.assertEqual(shared[2:50:3], fs[2:50:3])
+                self.assertEqual(shared[::-1], fs[::-1])
+                self.assertEqual(list(shared.iterBatches(7)), list(fs.iterBatches(7)))
+                if fs:
+                    self.assertEqual((shared.start(), shared.end()), (fs.start(), fs.end()))
+                    self.assertEqual(shared[-1], fs[-1])
+                # everything else works on the frames, built on demand
+                self.assertEqual(shared, fs)
+                self.assertEqual(shared & FrameSet('1-10'), fs & FrameSet('1-10'))
+                self.assertEqual(FrameSet(str(shared)), fs)
+
+    def testLifetime(self):
+        shared = fileseq.SharedFrameSet.create('1-1000')
+        name = shared.name
+        with shared:
+            reopened = fileseq.SharedFrameSet.open(name)
+            self.assertEqual(list(reopened), range(1, 1001))
+            copy = cPickle.loads(cPickle.dumps(shared, 2))
+            self.assertEqual(copy.name, name)
+            self.assertEqual(len(copy), 1000)
+            reopened.close()
+            copy.close()
+        self.assertFalse(os.path.exists(name))
+
+        self.assertRaises(exceptions.MaxSizeException, fileseq.SharedFrameSet.create, '1-')
+        with tempfile.NamedTemporaryFile() as f:
+            f.write('not frames' * 10)
+            f.flush()
+            self.assertRaises(exceptions.FileSeqException, fileseq.SharedFrameSet.open, f.name)
+
+    def testWorkers(self):
+        with fileseq.SharedFrameSet.create('1-20000x2') as shared:
+            pool = multiprocessing.Pool(2)
+            try:
+                results = pool.map(_sharedFrameCount, [(shared, xrange(0, 100)), (shared, xrange(1000, 1010))])
+            finally:
+                pool.terminate()
+        self.assertEqual(results, [(10000, 50), (10000, 5)])
+
+    def testCompactLayout(self):
+        from fileseq.shared import _HEADER
+        # scattered frames are stored as single frames, runs as runs
+        squares = [i * i for i in xrange(1, 2001)]
+        for frames, size in ((squares, 8 * 2000), ('1-100000', 24),
+                             ('1-10000x3,20000-30000', 48)):
+            fs = FrameSet(frames)
+            with fileseq.SharedFrameSet.create(fs) as shared:
+                self.assertEqual(shared.memoryUsage(detailed=True)['shared'], _HEADER.size + size)
+                self.assertEqual(list(shared), list(fs))
+                self.assertEqual(shared[1500], fs[1500])
+                self.assertEqual(shared.index(fs[1234]), 1234)
+                self.assertTrue(fs[-1] in shared)
+
+    def testFrameRuns(self):
+        from fileseq.shared import frameRuns
+        self.assertEqual(list(frameRuns([1, 2, 3, 10, 20, 30, 7])), [(1, 1, 3), (10, 10, 3), (7, 1, 1)])
+        self.assertEqual(list(frameRuns([])), [])
+        self.assertEqual(list(frameRuns([5, 3, 1, 8])), [(5, -2, 3), (8, 1, 1)])
+
+
+class TestBitmapFrameSet(unittest.TestCase):
+
+    def testMatchesFrameSet(self):
+        for src in ('', '7', '1-100', '10-1', '1,5,2,8,3', '1-100x3,200-150,7,500-1000y3',
+                    '1-300000x7', '1-200000y3,300000-400000:5', '-70000--1,5'):
+            fs = FrameSet(src)
+            frames = sorted(fs)
+            bitmap = fileseq.BitmapFrameSet(src)
+            self.assertEqual(list(bitmap), frames)
+            self.assertEqual(len(bitmap), len(fs))
+            self.assertEqual(bool(bitmap), bool(fs))
+            self.assertEqual(bitmap, FrameSet(frames))
+            self.assertEqual(bitmap.toArray().tolist(), frames)
+            for f in frames[:100] + frames[-100:] + range(-70005, -69995) + range(-5, 1010):
+                self.assertEqual(f in bitmap, f in fs, (src, f))
+            for i in xrange(0, len(frames), 997):
+                self.assertEqual(bitmap[i], frames[i])
+                self.assertEqual(bitmap.index(frames[i]), i)
+            if frames:
+                self.assertEqual((bitmap.start(), bitmap.end()), (frames[0], frames[-1]))
+                self.assertEqual(bitmap[-1], frames[-1])
+            self.assertEqual(cPickle.loads(cPickle.dumps(bitmap, 2)), bitmap)
+
+    def testFrameRange(self):
+        # ascending ranges keep their string, others are rebuilt sorted
+        self.assertEqual(str(fileseq.BitmapFrameSet('1-300000x7,400000')), '1-300000x7,400000')
+        self.assertEqual(str(fileseq.BitmapFrameSet('10-1,20')), '1-10,20')
+        self.assertEqual(str(fileseq.BitmapFrameSet('1-10,5-20')), '1-20')
+        self.assertEqual(str(fileseq.BitmapFrameSet([3, 1, 2, 3])), '1-3')
+        self.assertEqual(str(fileseq.BitmapFrameSet('#')), '')
+        self.assertRaises(exceptions.MaxSizeException, fileseq.BitmapFrameSet, '1-')
+        self.assertRaises(exceptions.MaxSizeException, fileseq.BitmapFrameSet, '1-100', maxSize=99)
+        self.assertRaises(exceptions.ParseException, fileseq.BitmapFrameSet, '1-10x0')
+
+    def testSetOperations(self):
+        a = FrameSet('1-200000x3,250000-300000')
+        b = FrameSet('100000-270000x2,1-10')
+        bitmapA, bitmapB = fileseq.BitmapFrameSet(a), fileseq.BitmapFrameSet(b)
+        for op in ('__and__', '__or__', '__sub__', '__rsub__', '__xor__'):
+            expected = getattr(a.items, op)(b.items)
+            for result in (getattr(bitmapA, op)(bitmapB), getattr(bitmapA, op)(b),
+                           getattr(a, op)(bitmapB)):
+                self.assertEqual(set(result), expected, op)
+                self.assertEqual(list(result), sorted(expected), op)
+                self.assertEqual(str(result), FrameSet.framesToFrameRange(sorted(expected)), op)
+        self.assertTrue(bitmapA.issuperset(bitmapA & bitmapB))
+        self.assertTrue((bitmapA & bitmapB).issubset(b))
+        self.assertFalse(bitmapA.issubset(bitmapB))
+        self.assertTrue((bitmapA - bitmapB).isdisjoint(bitmapB))
+        self.assertFalse(bitmapA.isdisjoint(b))
+        self.assertEqual(bitmapA.union(b, [0]), a | b | FrameSet('0'))
+        self.assertEqual(bitmapA.intersection(b, '1-10'), FrameSet('1-10x3'))
+        self.assertEqual(bitmapA | FrameSet('300001-'), a | FrameSet('300001-'))
+
+    def testAutomatic(self):
+        # large, dense frame sets in ascending order are bitmaps
+        a = FrameSet('1-100000')
+        b = FrameSet('1-100000x3')
+        self.assertIsInstance(a, fileseq.BitmapFrameSet)
+        self.assertEqual(type(b), FrameSet)
+        self.assertIsInstance(a - b, fileseq.BitmapFrameSet)
+        self.assertEqual(type(a & b), FrameSet)
+        self.assertEqual(type(fileseq.BitmapFrameSet('1-200000') & '1-10'), FrameSet)
+        self.assertEqual(str(a - b), FrameSet.framesToFrameRange(sorted(a.items - b.items)))
+        self.assertEqual(str(FrameSet('1-1000000x7')), '1-1000000x7')
+        self.assertIsInstance(FrameSet('1-1000000x7'), fileseq.BitmapFrameSet)
+        self.assertEqual(repr(FrameSet('1-1000000x7')), 'FrameSet("1-1000000x7")')
+        self.assertEqual(repr(a - b), repr(FrameSet(str(a - b))))
+        self.assertIsInstance(FrameSet(xrange(0, 300000, 2)), fileseq.BitmapFrameSet)
+        self.assertIsInstance(FrameSet(set(xrange(300000, 0, -2))), fileseq.BitmapFrameSet)
+        self.assertEqual(FrameSet(xrange(0, 300000, 2)), FrameSet('0-299998x2'))
+
+        # but not sparse, descending or open-ended ones
+        sparse = FrameSet('1-200000,1000000-100000000x1000')
+        self.assertEqual(type(sparse), FrameSet)
+        self.assertEqual(type(sparse - FrameSet('1-10')), FrameSet)
+        self.assertEqual(type(FrameSet('100000-1')), FrameSet)
+        self.assertEqual(type(FrameSet('1-100000,5')), FrameSet)
+        self.assertEqual(type(FrameSet(range(100000, 0, -1))), FrameSet)
+        self.assertEqual(type(FrameSet('1-100000,200000-')), FrameSet)
+        self.assertEqual(type(FrameSet(a)), FrameSet)
+        self.assertEqual(type(FrameSet('100001-100100')), FrameSet)
+        self.assertEqual(type(FrameSet('1-5,100000-100005')), FrameSet)
+        self.assertIsInstance(FrameSet('1-10,200000-300000'), fileseq.BitmapFrameSet)
+        self.assertRaises(exceptions.ParseException, FrameSet, '1-100000,abc')
+
+        _threshold = constants.BITMAP_MIN_FRAMES
+        try:
+            constants.BITMAP_MIN_FRAMES = None
+            a = FrameSet('1-100000')
+            self.assertEqual(type(a), FrameSet)
+            self.assertEqual(type(a - b), FrameSet)
+            self.assertIsInstance(fileseq.BitmapFrameSet('1-10') & '1-5', fileseq.BitmapFrameSet)
+        finally:
+            constants.BITMAP_MIN_FRAMES = _threshold
+
+    def testDenseChunks(self):
+        bitmap = FrameSet('0-65535x2,65536-200000')
+        self.assertIsInstance(bitmap._chunks[0][1], bytearray)
+        self.assertEqual(len(bitmap._chunks[0][1]), 8192)
+        self.assertEqual(bitmap._chunks[0][1][:2], bytearray('\x55\x55'))
+        self.assertTrue(65534 in bitmap)
+        self.assertFalse(65535 in bitmap)
+        self.assertTrue(65536 in bitmap)
+        self.assertEqual((bitmap.start(), bitmap.end()), (0, 200000))
+        self.assertEqual(bitmap.index(65534), 32767)
+        self.assertEqual(bitmap[32768], 65536)
+
+    def testMemoryUsage(self):
+        _threshold = constants.BITMAP_MIN_FRAMES
+        try:
+            constants.BITMAP_MIN_FRAMES = None
+            frames = FrameSet('1-1000000x3')
+        finally:
+            constants.BITMAP_MIN_FRAMES = _threshold
+        bitmap = fileseq.BitmapFrameSet(frames)
+        self.assertEqual(type(frames), FrameSet)
+        self.assertLess(bitmap.memoryUsage(), frames.memoryUsage() // 100)
+        self.assertEqual(sorted(bitmap.memoryUsage(detailed=True)), ['cache', 'chunks', 'object'])
+
 
 class TestPaddingFunctions(unittest.TestCase):
     """